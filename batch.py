@@ -0,0 +1,286 @@
+import numpy as np
+from bids import COUNT_BITS, bid_count, bid_value, encode_bid
+from npc_player import CALL_THRESHOLD, npc_raise_table
+from odds import survival_table
+
+DICE_PER_PLAYER = 5
+
+
+def _build_call_table(max_dice):
+    """Return a bool array [wild, hidden dice, needed count] marking the bets an NPC calls, as NPCPlayer.make_decision does"""
+    call_table = np.ones((2, max_dice + 1, max_dice + 2), dtype=bool)
+    for wild in (0, 1):
+        for hidden_dice in range(max_dice + 1):
+            table = survival_table(hidden_dice, bool(wild))
+            for needed_count in range(hidden_dice + 1):
+                call_table[wild, hidden_dice, needed_count] = (
+                    round(table[needed_count], 2) < CALL_THRESHOLD
+                )
+    return call_table
+
+
+def _build_raise_table(max_dice):
+    """Return padded arrays [prev value, prev count, total dice, k] of the raises in npc_raise_table
+
+    Holds the count and face of every raise, the cumulative probabilities normalized to 1 (padded with inf)
+    and the number of raises of each entry
+    """
+    max_raises = 7 * 3 + 2
+    shape = (7, max_dice + 1, max_dice + 1)
+    counts = np.zeros(shape + (max_raises,), dtype=np.int64)
+    values = np.zeros(shape + (max_raises,), dtype=np.int64)
+    cum_probs = np.full(shape + (max_raises,), np.inf)
+    sizes = np.zeros(shape, dtype=np.int64)
+    for total_dice in range(1, max_dice + 1):
+        for prev_value in range(7):
+            for prev_count in range(total_dice + 1):
+                bids, cum_weights = npc_raise_table(encode_bid(prev_count, prev_value), total_dice)
+                if not bids:
+                    continue
+                index = (prev_value, prev_count, total_dice)
+                sizes[index] = len(bids)
+                counts[index][: len(bids)] = [bid_count(bid) for bid in bids]
+                values[index][: len(bids)] = [bid_value(bid) for bid in bids]
+                cum_probs[index][: len(bids)] = np.array(cum_weights) / cum_weights[-1]
+    return counts, values, cum_probs, sizes
+
+
+def _is_raise(count, value, prev_count, prev_value, total_dice):
+    """Array version of bids.is_raise, comparing the encoded bids"""
+    in_range = (1 <= value) & (value <= 6) & (1 <= count) & (count <= total_dice)
+    bid = (value << COUNT_BITS) | count
+    prev_bid = (prev_value << COUNT_BITS) | prev_count
+    return in_range & (bid > prev_bid)
+
+
+class BatchResult:
+    """
+    A class to hold the outcome of a batch of games
+
+    Attributes
+    ----------
+    winners
+        The seat of the winner of each table
+    rounds
+        The number of rounds played at each table
+    bets
+        The number of bets made at each table
+    """
+
+    def __init__(self, winners, rounds, bets):
+        self.winners = winners
+        self.rounds = rounds
+        self.bets = bets
+
+
+class TableBatch:
+    """
+    A class to hold the state of many tables of Liar's dice as NumPy arrays, one row per table
+    It deals the games, passes the turn and resolves calls for any set of tables, the classes built on it decide
+    where the actions come from
+
+    Attributes
+    ----------
+    num_tables
+        The number of tables played at once
+    num_players
+        The number of players at each table
+    wild_ones
+        Marks if ones count as the face of the current bet
+    rng
+        The numpy Generator used for all dice rolls
+    hands
+        Array (tables x players x dice) of dice faces, only the first dice_counts dice of a hand are in play
+    dice_counts
+        Array (tables x players) of the number of dice each player holds
+    face_counts
+        Array (tables x players x 7) counting each face 1-6 in the players' hands, index 0 is unused
+    current, previous
+        The seat whose turn it is and the seat that made the last bet, per table
+    bet_count, bet_value
+        The current bet per table, a count of 0 means no bet was made this round
+    done
+        Marks the tables whose game is over
+    winners, rounds, bets
+        The seat of the winner (-1 while the game runs), the rounds played and the bets made per table
+
+    Methods
+    ---------
+    reset
+        Deal new games at every table
+    """
+
+    def __init__(self, num_tables, num_players, wild_ones=False, rng=None):
+        if num_players < 2:
+            raise ValueError("A game needs at least two players")
+        self.num_tables = num_tables
+        self.num_players = num_players
+        self.wild_ones = wild_ones
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._max_dice = num_players * DICE_PER_PLAYER
+        self._dice_slots = np.arange(DICE_PER_PLAYER)
+        self._faces = np.arange(7)
+        self.reset()
+
+    def reset(self):
+        """Give every player at every table a full hand and pick the starting players"""
+        shape = (self.num_tables, self.num_players)
+        self.dice_counts = np.zeros(shape, dtype=np.int64)
+        self.hands = np.zeros(shape + (DICE_PER_PLAYER,), dtype=np.int64)
+        self.face_counts = np.zeros(shape + (7,), dtype=np.int64)
+        self.current = np.zeros(self.num_tables, dtype=np.int64)
+        self.previous = np.zeros(self.num_tables, dtype=np.int64)
+        self.bet_count = np.zeros(self.num_tables, dtype=np.int64)
+        self.bet_value = np.zeros(self.num_tables, dtype=np.int64)
+        self.done = np.zeros(self.num_tables, dtype=bool)
+        self.winners = np.full(self.num_tables, -1)
+        self.rounds = np.zeros(self.num_tables, dtype=np.int64)
+        self.bets = np.zeros(self.num_tables, dtype=np.int64)
+        self._deal(np.arange(self.num_tables))
+
+    def _deal(self, tables):
+        """Start a new game at the given tables - full hands, a random starting player and no bet"""
+        self.dice_counts[tables] = DICE_PER_PLAYER
+        self.hands[tables] = self.rng.integers(
+            1, 7, size=(len(tables), self.num_players, DICE_PER_PLAYER)
+        )
+        self._count_faces(tables)
+        self.current[tables] = self.rng.integers(0, self.num_players, size=len(tables))
+        self.previous[tables] = self.current[tables]
+        self.bet_count[tables] = 0
+        self.bet_value[tables] = 0
+        self.done[tables] = False
+        self.winners[tables] = -1
+        self.rounds[tables] = 0
+        self.bets[tables] = 0
+
+    def _count_faces(self, tables):
+        """Recount the faces in the hands of the given tables, ignoring lost dice"""
+        in_play = self._dice_slots < self.dice_counts[tables][:, :, None]
+        matches = (self.hands[tables][:, :, :, None] == self._faces) & in_play[:, :, :, None]
+        self.face_counts[tables] = matches.sum(axis=2)
+
+    def _next_seats(self, tables, seats):
+        """Return the next seat holding dice after each of the given seats"""
+        offsets = (seats[:, None] + np.arange(1, self.num_players + 1)) % self.num_players
+        has_dice = self.dice_counts[tables[:, None], offsets] > 0
+        return offsets[np.arange(len(tables)), has_dice.argmax(axis=1)]
+
+    def _resolve_calls(self, tables):
+        """Vectorized Engine._resolve_call - count the dice, take a die from the loser and start the next round
+
+        Return the seat of the player who lost a die at each of the tables
+        """
+        if len(tables) == 0:
+            return np.zeros(0, dtype=np.int64)
+        callers = self.current[tables]
+        bidders = self.previous[tables]
+        bet_value = self.bet_value[tables]
+        dice_total = self.face_counts[tables, :, bet_value].sum(axis=1)
+        if self.wild_ones:
+            dice_total += self.face_counts[tables, :, 1].sum(axis=1)
+        losers = np.where(dice_total < self.bet_count[tables], bidders, callers)
+        self.dice_counts[tables, losers] -= 1
+        self.rounds[tables] += 1
+        callers_out = self.dice_counts[tables, callers] == 0
+        self.current[tables] = np.where(
+            callers_out, self._next_seats(tables, callers), callers
+        )
+        players_left = (self.dice_counts[tables] > 0).sum(axis=1)
+        finished = tables[players_left == 1]
+        self.done[finished] = True
+        self.winners[finished] = self.dice_counts[finished].argmax(axis=1)
+        playing = tables[players_left > 1]
+        self.hands[playing] = self.rng.integers(
+            1, 7, size=(len(playing), self.num_players, DICE_PER_PLAYER)
+        )
+        self._count_faces(playing)
+        self.bet_count[playing] = 0
+        self.bet_value[playing] = 0
+        return losers
+
+
+class BatchSimulator(TableBatch):
+    """
+    A class to play many NPC-only games of Liar's dice at once with NumPy
+    Every table is a row of the arrays, all tables play one action per step and finished tables are masked out
+
+    Attributes
+    ----------
+    The attributes for the class are inherited from the TableBatch class, the NPC choices are drawn from rng as well
+
+    Methods
+    ---------
+    step
+        Play one action at every table that is still running
+    run
+        Step until every table has a winner and return a BatchResult
+    """
+
+    def __init__(self, num_tables, num_players, wild_ones=False, rng=None):
+        super().__init__(num_tables, num_players, wild_ones, rng)
+        self._call_table = _build_call_table(self._max_dice)
+        self._raise_table = _build_raise_table(self._max_dice)
+
+    def step(self):
+        """Let the current player of every running table either call or raise the bet"""
+        tables = np.nonzero(~self.done)[0]
+        if len(tables) == 0:
+            return
+        seats = self.current[tables]
+        own = self.face_counts[tables, seats]
+        total_dice = self.dice_counts[tables].sum(axis=1)
+        hidden_dice = total_dice - self.dice_counts[tables, seats]
+        bet_count = self.bet_count[tables]
+        bet_value = self.bet_value[tables]
+        wild = int(self.wild_ones)
+        needed = bet_count - own[np.arange(len(tables)), bet_value] + wild * own[:, 1]
+        needed = np.clip(needed, 0, self._max_dice + 1)
+        calls = (bet_count > 0) & (
+            ((bet_value == 6) & (bet_count >= total_dice))
+            | self._call_table[wild, hidden_dice, needed]
+        )
+        self._resolve_calls(tables[calls])
+        self._make_bets(tables[~calls])
+
+    def run(self):
+        """Play every table until only one player with dice remains and return the BatchResult"""
+        while not self.done.all():
+            self.step()
+        return BatchResult(self.winners.copy(), self.rounds.copy(), self.bets.copy())
+
+    def _make_bets(self, tables):
+        """Vectorized NPCPlayer.choose_bet for the current player of each table, then pass the turn"""
+        if len(tables) == 0:
+            return
+        rows = np.arange(len(tables))
+        seats = self.current[tables]
+        own = self.face_counts[tables, seats][:, 1:]
+        freq = own.copy()
+        if self.wild_ones:
+            freq[:, 1:] += own[:, :1]
+        # the most common face in the hand, ties go to the higher face like in choose_bet
+        score = np.where(own > 0, freq * 6 + self._faces[:6], -1)
+        best = score.argmax(axis=1)
+        count = freq[rows, best]
+        value = best + 1
+        if self.wild_ones:
+            ones = value == 1
+            value[ones] = self.rng.integers(2, 7, size=ones.sum())
+        prev_count = self.bet_count[tables]
+        prev_value = self.bet_value[tables]
+        total_dice = self.dice_counts[tables].sum(axis=1)
+        invalid = np.nonzero(~_is_raise(count, value, prev_count, prev_value, total_dice))[0]
+        if len(invalid) > 0:
+            # draw the fallback raise of every table from its row of the raise table in one go
+            raise_counts, raise_values, cum_probs, sizes = self._raise_table
+            index = (prev_value[invalid], prev_count[invalid], total_dice[invalid])
+            draws = self.rng.random(len(invalid))
+            picks = np.minimum((cum_probs[index] <= draws[:, None]).sum(axis=1), sizes[index] - 1)
+            count[invalid] = raise_counts[index][np.arange(len(invalid)), picks]
+            value[invalid] = raise_values[index][np.arange(len(invalid)), picks]
+        self.bet_count[tables] = count
+        self.bet_value[tables] = value
+        self.bets[tables] += 1
+        self.previous[tables] = seats
+        self.current[tables] = self._next_seats(tables, seats)
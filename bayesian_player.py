@@ -0,0 +1,290 @@
+from functools import lru_cache
+from itertools import islice
+from math import comb, factorial
+from bids import NO_BID, bet_from_bid, bid_count, bid_from_bet, bid_value, encode_bid
+from hand import all_hands
+from npc_player import CALL_THRESHOLD, NPCPlayer
+import numpy as np
+from odds import bet_probability, survival_table
+
+# share of an opponent's bids taken to be on its most common face, the rest are treated as bluffs on any face
+HONEST_BID_CHANCE = 0.6
+# a bid is only raised in count while it stays at least this likely to be true
+RAISE_CONFIDENCE = 0.5
+
+# posteriors kept per (dice in the hand, face, wild ones, bids per face) before the least recently used goes
+POSTERIOR_CACHE_SIZE = 1 << 14
+# an opponent that hasn't bid this round
+NO_BIDS_SEEN = (0,) * 6
+# the distribution of the dice counting for a face in the hands of the opponents that bid, before any of them did
+NO_MATCHING = np.ones(1)
+NO_MATCHING.setflags(write=False)
+
+# tables per (dice in the hand, wild ones, face) built once and shared by every Bayesian NPC
+_PRIORS = {}
+_LIKELIHOODS = {}
+
+
+def _matching(counts, face, is_wild):
+    """Return how many dice of a hand count for a bid on face"""
+    if is_wild and face != 1:
+        return counts[face - 1] + counts[0]
+    return counts[face - 1]
+
+
+def _preferred_face(counts, is_wild):
+    """Return the face NPCPlayer.choose_bet bids on with these face counts, 1 meaning a random face in wild mode"""
+    best_count, best_face = 0, 0
+    for face in range(1, 7):
+        freq = counts[face - 1]
+        if freq == 0:
+            continue
+        freq = _matching(counts, face, is_wild)
+        if freq >= best_count:
+            best_count, best_face = freq, face
+    return best_face
+
+
+def prior(num_of_dice, face, is_wild):
+    """Return the probability of k of num_of_dice unseen dice counting for a bid on face, for k = 0..num_of_dice"""
+    key = (num_of_dice, is_wild, face)
+    table = _PRIORS.get(key)
+    if table is None:
+        matching_faces = 2 if is_wild and face != 1 else 1
+        table = tuple(
+            comb(num_of_dice, k) * matching_faces**k * (6 - matching_faces) ** (num_of_dice - k)
+            / 6**num_of_dice
+            for k in range(num_of_dice + 1)
+        )
+        _PRIORS[key] = table
+    return table
+
+
+def bid_likelihood(num_of_dice, bid_face, face, is_wild):
+    """Return the probability of an opponent bidding on bid_face given k of its dice count for face, k = 0..num_of_dice
+
+    Built once by going through every hand of num_of_dice dice, assuming the opponent bids on its most common face
+    like an NPC does with HONEST_BID_CHANCE and on any face otherwise
+    """
+    key = (num_of_dice, is_wild, bid_face, face)
+    table = _LIKELIHOODS.get(key)
+    if table is None:
+        joint = [0.0] * (num_of_dice + 1)
+        marginal = [0.0] * (num_of_dice + 1)
+        for counts in all_hands(num_of_dice):
+            weight = factorial(num_of_dice)
+            for count in counts:
+                weight //= factorial(count)
+            matching = _matching(counts, face, is_wild)
+            preferred = _preferred_face(counts, is_wild)
+            if preferred == bid_face:
+                chose_face = 1.0
+            elif is_wild and preferred == 1 and bid_face != 1:
+                chose_face = 1 / 5
+            else:
+                chose_face = 0.0
+            marginal[matching] += weight
+            joint[matching] += weight * (
+                HONEST_BID_CHANCE * chose_face + (1 - HONEST_BID_CHANCE) / 6
+            )
+        table = tuple(
+            joint[k] / marginal[k] if marginal[k] else 0.0 for k in range(num_of_dice + 1)
+        )
+        _LIKELIHOODS[key] = table
+    return table
+
+
+@lru_cache(maxsize=POSTERIOR_CACHE_SIZE)
+def posterior(num_of_dice, face, is_wild, bids_per_face):
+    """Return the probability of k of an opponent's num_of_dice dice counting for face, given its bids this round
+
+    bids_per_face holds the number of the opponent's bids on every face. Every bid multiplies the likelihood of its
+    face into the prior, on whichever face it was, and the product is normalized once. The bids are taken as
+    independent evidence, which overweights an opponent repeating its face, and the opponent's hand is re-rolled
+    every round, so the posterior only depends on these counts and can be looked up instead of updated per bid
+    """
+    joint = prior(num_of_dice, face, is_wild)
+    for bid_face, num_bids in enumerate(bids_per_face, 1):
+        if num_bids:
+            likelihood = bid_likelihood(num_of_dice, bid_face, face, is_wild)
+            joint = [p * l**num_bids for p, l in zip(joint, likelihood)]
+    total = sum(joint)
+    return tuple(p / total for p in joint)
+
+
+@lru_cache(maxsize=POSTERIOR_CACHE_SIZE)
+def posterior_array(num_of_dice, face, is_wild, bids_per_face):
+    """Return the posterior as a read-only array, the form the distributions of the bidders are convolved in"""
+    array = np.array(posterior(num_of_dice, face, is_wild, bids_per_face))
+    array.setflags(write=False)
+    return array
+
+
+class BayesianNPCPlayer(NPCPlayer):
+    """
+    A class used to represent an NPC player that reads its opponents' bids
+    It keeps a posterior of how many dice of every face each opponent holds, combining every bid it sees,
+    and uses it instead of the uniform odds for calling and raising
+
+    Attributes
+    ----------
+    bids_seen
+        Dict of opponent -> tuple of the number of its bids on every face this round, only for the opponents that bid,
+        in the order of their first bid, their posteriors are looked up from it
+    face_matching
+        List per face of the distributions of the dice counting for it in the hands of the first 0, 1, 2... opponents
+        of bids_seen as arrays, the last one covers all of them once it is built up to date
+    matching_wild
+        The wild ones mode the distributions of face_matching were built for
+
+    Methods
+    ---------
+    override observe_bid
+        Count the bid of the bidder on its face, dropping the distributions of face_matching it changes
+    override observe_new_round
+        Forget the bids when the hands are re-rolled
+    override save_state
+        Return the bids seen as a tuple
+    override restore_state
+        Rebuild the bids seen from a saved tuple
+    override fork
+        Copy the player with bids seen of its own
+    bid_odds
+        Return the probability of a bet being true given the posteriors
+    override make_decision
+        Call when the posterior odds of the last bet drop below the call threshold
+    override choose_bet
+        Bet the highest bid that is still likely, on the face with the best odds
+    """
+
+    __slots__ = ("bids_seen", "face_matching", "matching_wild")
+
+    def __init__(self, name, table=None, input_provider=None):
+        super().__init__(name, table, input_provider)
+        self.bids_seen = {}
+        self._reset_matching(False)
+
+    def observe_bid(self, bidder, bid, is_wild):
+        """Count the bid on its face, every bid of an opponent adds to its posteriors of all faces
+
+        A first bid leaves every distribution of face_matching as it is, the next one is convolved on top of them
+        when the face is needed. A later bid changes the posteriors of the bidder, so only the distributions up to
+        the bidder are kept - when the opponent that bid first in the round bids again, they are all built again
+        """
+        if bidder is self:
+            return
+        if is_wild != self.matching_wild:
+            self._reset_matching(is_wild)
+        index = bid_value(bid) - 1
+        seen = self.bids_seen.get(bidder)
+        if seen is None:
+            seen = NO_BIDS_SEEN
+        else:
+            position = list(self.bids_seen).index(bidder)
+            for prefixes in self.face_matching:
+                del prefixes[position + 1 :]
+        self.bids_seen[bidder] = seen[:index] + (seen[index] + 1,) + seen[index + 1 :]
+
+    def observe_new_round(self):
+        """Forget the bids, the opponents' hands have been re-rolled"""
+        self.bids_seen = {}
+        self._reset_matching(self.matching_wild)
+
+    def save_state(self, seat_of):
+        """Return the bids seen as a tuple of (opponent seat, bids per face)"""
+        return tuple((seat_of[bidder], seen) for bidder, seen in self.bids_seen.items())
+
+    def restore_state(self, state, seats):
+        """Rebuild the bids seen from a tuple returned by save_state, the distributions are built again on first use"""
+        self.bids_seen = {seats[seat]: seen for seat, seen in state}
+        self._reset_matching(self.matching_wild)
+
+    def fork(self, table):
+        """Return a copy of the player at table, counting the bids of the forked game apart from this one"""
+        player = super().fork(table)
+        player.bids_seen = dict(self.bids_seen)
+        player.face_matching = [list(prefixes) for prefixes in self.face_matching]
+        return player
+
+    def bid_odds(self, bid, is_wild):
+        """Return the probability of at least bid_count dice counting for the face of the encoded bid"""
+        face = bid_value(bid)
+        return self._odds(bid_count(bid), face, self._known_matching(face, is_wild), is_wild)
+
+    def _known_matching(self, face, is_wild):
+        """Return the distribution of the dice counting for face in the hands of the opponents that bid this round as a list"""
+        if is_wild != self.matching_wild:
+            self._reset_matching(is_wild)
+        prefixes = self.face_matching[face - 1]
+        matching = prefixes[-1]
+        # convolve the posteriors of the opponents the kept distributions leave out
+        for bidder, seen in islice(self.bids_seen.items(), len(prefixes) - 1, None):
+            matching = np.convolve(matching, posterior_array(bidder.num_of_dice, face, is_wild, seen))
+            prefixes.append(matching)
+        return matching.tolist()
+
+    def _reset_matching(self, is_wild):
+        """Drop the distributions of face_matching, to be built again for the wild ones mode is_wild"""
+        self.face_matching = [[NO_MATCHING] for _ in range(6)]
+        self.matching_wild = is_wild
+
+    def _odds(self, dice_count, face, known_matching, is_wild):
+        """Return the probability of at least dice_count dice counting for face, given the opponents' posteriors"""
+        needed = dice_count - _matching(self.hand.counts, face, is_wild)
+        hidden_dice = self.table.total_die_count - len(self.hand)
+        if needed <= 0:
+            return 1.0
+        if needed > hidden_dice:
+            return 0.0
+        if len(known_matching) == 1:
+            return bet_probability(needed, hidden_dice, is_wild)
+        # the dice of opponents that didn't bid this round follow the uniform odds
+        rest = hidden_dice - (len(known_matching) - 1)
+        survival = survival_table(rest, is_wild)
+        odds = 0.0
+        for known, probability in enumerate(known_matching):
+            still_needed = needed - known
+            if still_needed <= 0:
+                odds += probability
+            elif still_needed <= rest:
+                odds += probability * survival[still_needed]
+        return odds
+
+    def make_decision(self, **kwargs):
+        """Call the last bet if the posterior odds of it being true are below the call threshold"""
+        prev_bet = kwargs["game_prev_bet"]
+        if prev_bet["dice_value"] == 6 and prev_bet["dice_count"] >= self.table.total_die_count:
+            return "call"
+        if self.bid_odds(bid_from_bet(prev_bet), kwargs["is_wild"]) < CALL_THRESHOLD:
+            return "call"
+        return "bet"
+
+    def choose_bet(self, **kwargs):
+        """Bet the highest count that stays likely to be true, on the face with the best odds for its lowest raise"""
+        is_wild = kwargs["is_wild"]
+        prev_bid = bid_from_bet(kwargs["prev_bet"])
+        prev_count, prev_value = bid_count(prev_bid), bid_value(prev_bid)
+        total_dice = self.table.total_die_count
+        best_bid, best_key = NO_BID, None
+        for face in range(2 if is_wild else 1, 7):
+            if face < prev_value:
+                continue
+            dice_count = prev_count + 1 if face == prev_value else 1
+            if dice_count > total_dice:
+                continue
+            known_matching = self._known_matching(face, is_wild)
+            odds = self._odds(dice_count, face, known_matching, is_wild)
+            if odds >= RAISE_CONFIDENCE:
+                while dice_count < total_dice:
+                    if self._odds(dice_count + 1, face, known_matching, is_wild) < RAISE_CONFIDENCE:
+                        break
+                    dice_count += 1
+                # among likely bids the highest count is the hardest to raise
+                key = (True, dice_count, face)
+            else:
+                key = (False, odds, face)
+            if best_key is None or key > best_key:
+                best_bid, best_key = encode_bid(dice_count, face), key
+        if best_bid == NO_BID:
+            raise ValueError(f"The bet {kwargs['prev_bet']} can't be raised")
+        return bet_from_bid(best_bid)
@@ -0,0 +1,54 @@
+"""
+Compare games/sec of the NumPy BatchSimulator against headless games of the scalar Engine
+
+Also prints the mean rounds and bets per game of both, which should agree since they play by the same rules.
+Run from the root of the repository with: python -m benchmarks.bench_batch
+"""
+import time
+import numpy as np
+from batch import BatchSimulator
+from engine import Engine
+from npc_player import NPCPlayer
+from table import Table
+
+SCALAR_GAMES = 300
+BATCH_TABLES = 20000
+
+
+def scalar_games(num_players, wild_ones):
+    """Play SCALAR_GAMES headless games one by one, return games/sec, mean rounds and mean bets"""
+    rounds = bets = 0
+    start = time.perf_counter()
+    for _ in range(SCALAR_GAMES):
+        table = Table()
+        players = [NPCPlayer(f"Bot {seat}", table) for seat in range(num_players)]
+        result = Engine(players, wild_ones).play()
+        rounds += result.rounds
+        bets += result.bets
+    elapsed = time.perf_counter() - start
+    return SCALAR_GAMES / elapsed, rounds / SCALAR_GAMES, bets / SCALAR_GAMES
+
+
+def batch_games(num_players, wild_ones):
+    """Play BATCH_TABLES games at once, return games/sec, mean rounds and mean bets"""
+    start = time.perf_counter()
+    simulator = BatchSimulator(BATCH_TABLES, num_players, wild_ones, np.random.default_rng())
+    result = simulator.run()
+    elapsed = time.perf_counter() - start
+    return BATCH_TABLES / elapsed, result.rounds.mean(), result.bets.mean()
+
+
+def main():
+    print(f"{'players':>7} {'wild':>5} | {'scalar g/s':>10} {'rounds':>6} {'bets':>6} | {'batch g/s':>10} {'rounds':>6} {'bets':>6} | speedup")
+    for wild_ones in (False, True):
+        for num_players in range(2, 7):
+            scalar_rate, scalar_rounds, scalar_bets = scalar_games(num_players, wild_ones)
+            batch_rate, batch_rounds, batch_bets = batch_games(num_players, wild_ones)
+            print(
+                f"{num_players:>7} {str(wild_ones):>5} | {scalar_rate:>10,.0f} {scalar_rounds:>6.2f} {scalar_bets:>6.2f}"
+                f" | {batch_rate:>10,.0f} {batch_rounds:>6.2f} {batch_bets:>6.2f} | {batch_rate / scalar_rate:6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
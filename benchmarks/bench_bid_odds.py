@@ -0,0 +1,61 @@
+"""
+Compare the odds of every bid from one odds_array.bid_odds call against asking NPCPlayer.calc_odds bid by bid
+
+bid_odds is timed with its cache cleared before every hand, calc_odds for every face and count of the table.
+The NPC reads wild ones its own way, so only the timings are compared, not the odds.
+Run from the root of the repository with: python -m benchmarks.bench_bid_odds
+"""
+import random
+import time
+import odds_array
+from npc_player import NPCPlayer
+from table import Table
+
+TOTAL_DICE = (10, 30)
+NUM_HANDS = 2000
+
+
+def random_hands(rng, total_dice):
+    """Return NUM_HANDS NPCs of five dice sitting at tables of total_dice dice"""
+    hands = []
+    for _ in range(NUM_HANDS):
+        table = Table(rng.random())
+        npc = NPCPlayer("NPC", table)
+        table.total_die_count = total_dice
+        hands.append(npc)
+    return hands
+
+
+def per_bid(npcs, total_dice, is_wild):
+    """Return the seconds to ask calc_odds for every bid of every hand"""
+    start = time.perf_counter()
+    for npc in npcs:
+        for dice_value in range(1, 7):
+            for dice_count in range(total_dice + 1):
+                npc.calc_odds({"dice_count": dice_count, "dice_value": dice_value}, is_wild)
+    return time.perf_counter() - start
+
+
+def all_bids(npcs, total_dice, is_wild):
+    """Return the seconds to get the odds array of every hand, without the cache"""
+    start = time.perf_counter()
+    for npc in npcs:
+        odds_array._bid_odds.cache_clear()
+        odds_array.bid_odds(npc.hand.counts, total_dice, is_wild)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'':<18}{'per bid us/hand':>17}{'all bids us/hand':>18}{'speedup':>9}")
+    for total_dice in TOTAL_DICE:
+        npcs = random_hands(rng, total_dice)
+        for is_wild in (False, True):
+            before = per_bid(npcs, total_dice, is_wild) / NUM_HANDS * 1e6
+            after = all_bids(npcs, total_dice, is_wild) / NUM_HANDS * 1e6
+            name = f"{total_dice} dice{' wild' if is_wild else ''}"
+            print(f"{name:<18}{before:>17.1f}{after:>18.1f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare NPC decisions and bets with and without the LRU decision caches over the situations of a tournament
+
+The situations every NPC decided in are recorded from seeded headless games, then replayed through the plain
+functions and through the caches, which start empty like in a fresh worker process.
+Run from the root of the repository with: python -m benchmarks.bench_decision_cache
+"""
+import time
+import npc_player
+from tournament import play_chunk, seat_bots
+
+NUM_GAMES = 5000
+SEATS = seat_bots(["npc", "npc", "npc", "npc"])
+
+
+def record_situations(wild_ones):
+    """Play the games without the caches and return the arguments of every decision and bet"""
+    decisions, bets = [], []
+    decide, bet = npc_player.npc_decision, npc_player.npc_bet
+
+    def recording_decision(*situation):
+        decisions.append(situation)
+        return decide(*situation)
+
+    def recording_bet(*situation):
+        bets.append(situation)
+        return bet(*situation)
+
+    npc_player.NPCPlayer.use_decision_cache = False
+    npc_player.npc_decision, npc_player.npc_bet = recording_decision, recording_bet
+    try:
+        play_chunk(SEATS, wild_ones, 0, 0, NUM_GAMES)
+    finally:
+        npc_player.npc_decision, npc_player.npc_bet = decide, bet
+        npc_player.NPCPlayer.use_decision_cache = True
+    return decisions, bets
+
+
+def replay(function, situations):
+    """Return the microseconds per call of function over the situations"""
+    start = time.perf_counter()
+    for situation in situations:
+        function(*situation)
+    return (time.perf_counter() - start) / len(situations) * 1e6
+
+
+def main():
+    print(f"{'':<16}{'calls':>9}{'plain us':>10}{'cached us':>11}{'hits':>8}{'evictions':>11}")
+    for wild_ones in (False, True):
+        decisions, bets = record_situations(wild_ones)
+        for name, cache, situations in (
+            ("decision", npc_player.DECISION_CACHE, decisions),
+            ("bet", npc_player.BET_CACHE, bets),
+        ):
+            plain = replay(cache.function, situations)
+            cache.clear()
+            cached = replay(cache.lookup, situations)
+            counters = cache.counters()
+            hits = counters["hits"] / len(situations)
+            label = f"{name}{' wild' if wild_ones else ''}"
+            print(
+                f"{label:<16}{len(situations):>9}{plain:>10.3f}{cached:>11.3f}{hits:>8.1%}"
+                f"{counters['evictions']:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
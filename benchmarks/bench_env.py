@@ -0,0 +1,60 @@
+"""
+Compare environment steps/sec of the VectorEnv against stepping scalar Engines one table at a time
+
+Both play uniformly random legal actions, the scalar loop is what a training loop over single tables would run.
+Run from the root of the repository with: python -m benchmarks.bench_env
+"""
+import random
+import time
+import numpy as np
+from bids import legal_raises
+from engine import Engine
+from npc_player import NPCPlayer
+from table import Table
+from vector_env import VectorEnv
+
+NUM_PLAYERS = 4
+SCALAR_STEPS = 50000
+VECTOR_STEPS = 200
+NUM_TABLES = (256, 4096, 32768)
+
+
+def scalar_steps_per_sec():
+    """Return the steps/sec of Engine.step with random legal actions, starting a new game whenever one ends"""
+    rng = random.Random(0)
+    engine = None
+    start = time.perf_counter()
+    for _ in range(SCALAR_STEPS):
+        if engine is None or engine.is_over():
+            table = Table(rng.random())
+            engine = Engine([NPCPlayer(f"Bot {seat}", table) for seat in range(NUM_PLAYERS)])
+            engine.set_starting_player()
+        raises = legal_raises(engine.bid, engine.table.total_die_count)
+        choice = rng.randrange(len(raises) + engine.can_call())
+        engine.step("call" if choice == len(raises) else raises[choice])
+    return SCALAR_STEPS / (time.perf_counter() - start)
+
+
+def vector_steps_per_sec(num_tables):
+    """Return the steps/sec, counted per table, of a VectorEnv with random legal actions"""
+    rng = np.random.default_rng(0)
+    env = VectorEnv(num_tables, NUM_PLAYERS, rng=np.random.default_rng(1))
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(VECTOR_STEPS):
+        env.step(env.sample_actions(rng))
+    return VECTOR_STEPS * num_tables / (time.perf_counter() - start)
+
+
+def main():
+    scalar = scalar_steps_per_sec()
+    print(f"{'scalar Engine.step':<26}{scalar:>14,.0f} steps/sec")
+    for num_tables in NUM_TABLES:
+        vector = vector_steps_per_sec(num_tables)
+        print(
+            f"{f'VectorEnv {num_tables} tables':<26}{vector:>14,.0f} steps/sec {vector / scalar:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measure the cost of recording games to the binary game log against the same games as JSON lines
+
+Plays a chunk of headless NPC games with and without a log, then compares the size and the read time of the
+binary log with one JSON object per game holding the same events.
+Run from the root of the repository with: python -m benchmarks.bench_game_log
+"""
+import json
+import os
+import tempfile
+import time
+from game_log import read_games, read_records
+from tournament import play_chunk, seat_bots
+
+NUM_GAMES = 2000
+SEATS = seat_bots(["npc", "npc", "npc", "npc"])
+
+
+def timed(function, *args):
+    """Return the result of the call and the seconds it took"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "games.ldgl")
+        json_path = os.path.join(directory, "games.jsonl")
+        _, plain = timed(play_chunk, SEATS, False, 0, 0, NUM_GAMES)
+        _, logged = timed(play_chunk, SEATS, False, 0, 0, NUM_GAMES, False, log_path)
+        print(f"Played {NUM_GAMES} games in {plain:.2f}s, {logged:.2f}s with the log ({logged / plain - 1:+.1%})")
+
+        games, binary_read = timed(lambda: list(read_games(log_path)))
+        records, records_read = timed(lambda: sum(len(chunk) for chunk in read_records(log_path)))
+        with open(json_path, "w") as target:
+            for game in games:
+                target.write(json.dumps(vars(game)) + "\n")
+        _, json_read = timed(lambda: [json.loads(line) for line in open(json_path)])
+
+        binary_size, json_size = os.path.getsize(log_path), os.path.getsize(json_path)
+        print(f"{'':<14}{'bytes/game':>12}{'read games/sec':>18}")
+        print(f"{'binary log':<14}{binary_size / NUM_GAMES:>12,.0f}{NUM_GAMES / binary_read:>18,.0f}")
+        print(f"{'JSON lines':<14}{json_size / NUM_GAMES:>12,.0f}{NUM_GAMES / json_read:>18,.0f}")
+        print(f"Raw records: {records:,} read as arrays in {records_read * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measure the iteration rate and the strength of the ISMCTS NPC per search budget, against three NPC players
+
+The iterations/sec tell how large a time budget has to be for a number of iterations per move on this machine.
+Run from the root of the repository with: python -m benchmarks.bench_ismcts
+"""
+import time
+from engine import Engine
+from ismcts_player import ISMCTSNPCPlayer
+from npc_player import NPCPlayer
+from table import Table
+
+NUM_GAMES = 40
+ITERATION_BUDGETS = (100, 500, 2000)
+TIME_BUDGETS = (0.005, 0.02)
+
+
+def play(num_games, **budget):
+    """Play num_games with the ISMCTS NPC in the first seat, return its wins, iterations/sec and seconds per move"""
+    wins = 0
+    iterations = 0
+    search_time = 0.0
+    moves = 0
+    for game_index in range(num_games):
+        table = Table(game_index)
+        searcher = ISMCTSNPCPlayer("ISMCTS", table, **budget)
+        players = [searcher] + [NPCPlayer(f"NPC {seat}", table) for seat in range(1, 4)]
+        result = Engine(players).play()
+        wins += result.winner is searcher
+        iterations += searcher.iterations_run
+        search_time += searcher.search_time
+        moves += searcher.searches
+    return wins, iterations / search_time, search_time / max(moves, 1)
+
+
+def main():
+    print(f"{'budget':<18}{'win rate':>10}{'iterations/sec':>16}{'ms/move':>10}")
+    start = time.perf_counter()
+    budgets = [(f"{count} iterations", {"iterations": count}) for count in ITERATION_BUDGETS]
+    budgets += [(f"{seconds * 1000:g} ms", {"time_budget": seconds}) for seconds in TIME_BUDGETS]
+    for name, budget in budgets:
+        wins, rate, move_time = play(NUM_GAMES, **budget)
+        print(f"{name:<18}{wins / NUM_GAMES:>10.1%}{rate:>16,.0f}{move_time * 1000:>10.2f}")
+    print(f"{NUM_GAMES} games per budget against three NPCs, 25% is an even share, {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare the precomputed survival tables in odds.py against calling scipy's binom.cdf for every decision
+
+Run from the root of the repository with: python -m benchmarks.bench_odds
+"""
+import timeit
+from scipy.stats import binom
+from odds import bet_probability
+
+MAX_HIDDEN_DICE = 30
+REPEATS = 5
+
+
+def scipy_probability(needed_count, hidden_dice, is_wild):
+    """The probability of a bet as NPCPlayer.calc_odds computed it before the tables were introduced"""
+    face_possibility = 2 / 6 if is_wild else 1 / 6
+    if needed_count > hidden_dice:
+        return 0
+    return 1 - binom.cdf(needed_count - 1, hidden_dice, face_possibility)
+
+
+def all_cases():
+    """Every (needed count, hidden dice, wild ones) combination a game with up to 30 hidden dice can ask for"""
+    return [
+        (needed_count, hidden_dice, is_wild)
+        for is_wild in (False, True)
+        for hidden_dice in range(MAX_HIDDEN_DICE + 1)
+        for needed_count in range(-5, hidden_dice + 2)
+    ]
+
+
+def check_results(cases):
+    """Return the largest difference between the table and the scipy results"""
+    return max(abs(bet_probability(*case) - scipy_probability(*case)) for case in cases)
+
+
+def calls_per_second(function, cases):
+    """Return how many calls of function per second are made going through all cases"""
+    best = min(
+        timeit.repeat(lambda: [function(*case) for case in cases], number=1, repeat=REPEATS)
+    )
+    return len(cases) / best
+
+
+def main():
+    cases = all_cases()
+    max_error = check_results(cases)
+    scipy_rate = calls_per_second(scipy_probability, cases)
+    table_rate = calls_per_second(bet_probability, cases)
+    print(f"cases checked:      {len(cases)}")
+    print(f"max difference:     {max_error:.3e}")
+    print(f"scipy binom.cdf:    {scipy_rate:,.0f} calls/sec ({1e6 / scipy_rate:.2f} us/call)")
+    print(f"survival tables:    {table_rate:,.0f} calls/sec ({1e6 / table_rate:.2f} us/call)")
+    print(f"speedup:            {table_rate / scipy_rate:.1f}x")
+    if max_error > 1e-12:
+        raise SystemExit("The survival tables do not match scipy to 1e-12")
+
+
+if __name__ == "__main__":
+    main()
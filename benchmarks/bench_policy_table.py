@@ -0,0 +1,66 @@
+"""
+Compare the time to load a CFR strategy file with numpy.load against opening the same table with numpy.memmap
+
+Synthetic strategies of the solver's shapes are written for growing dice counts, the memory-mapped table should
+open in about the same time whatever its size.
+Run from the root of the repository with: python -m benchmarks.bench_policy_table
+"""
+import os
+import tempfile
+import time
+import numpy as np
+from bids import encode_bid
+from hand import all_hands
+from policy_table import MappedPolicyTable, write_policy_table
+from strategy_player import StrategyTable
+
+MAX_DICE = (2, 3, 4, 5)
+RUNS = 5
+
+
+def synthetic_strategies(max_dice, rng):
+    """Return random strategies shaped like the solver's for every pair of dice counts up to max_dice"""
+    strategies = {}
+    for own_dice in range(1, max_dice + 1):
+        for opponent_dice in range(1, max_dice + 1):
+            num_states = 6 * (own_dice + opponent_dice) + 1
+            shape = (len(all_hands(own_dice)), num_states, num_states)
+            strategies[own_dice, opponent_dice] = rng.random(shape, dtype=np.float32)
+    return strategies
+
+
+def best_time(function):
+    """Return the best wall clock time of RUNS calls of function"""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    counts = (1, 0, 0, 0, 0, 1)
+    bid = encode_bid(2, 6)
+    print(f"{'max dice':>8}{'size MB':>10}{'np.load ms':>12}{'memmap ms':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for max_dice in MAX_DICE:
+            strategies = synthetic_strategies(max_dice, rng)
+            npz_path = os.path.join(directory, f"strategy_{max_dice}.npz")
+            bin_path = os.path.join(directory, f"policy_{max_dice}.bin")
+            np.savez(
+                npz_path,
+                max_dice=max_dice,
+                wild_ones=False,
+                **{f"strategy_{own}_{opponent}": array for (own, opponent), array in strategies.items()},
+            )
+            write_policy_table(bin_path, strategies, max_dice, False)
+            loaded = best_time(lambda: StrategyTable(npz_path).policy(counts, 2, bid, False))
+            mapped = best_time(lambda: MappedPolicyTable(bin_path).policy(counts, 2, bid, False))
+            size = os.path.getsize(bin_path) / 2**20
+            print(f"{max_dice:>8}{size:>10.1f}{loaded * 1000:>12.2f}{mapped * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
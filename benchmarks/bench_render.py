@@ -0,0 +1,76 @@
+"""
+Compare the cached, single-write dice rendering with the row by row printing it replaced
+
+Counts the time and the write calls reaching the output stream for revealing the hands of many tables.
+Run from the root of the repository with: python -m benchmarks.bench_render
+"""
+import contextlib
+import sys
+import time
+from npc_player import NPCPlayer
+from table import Table
+from utils.dice_graphics import DICE_FACES, DICE_HEIGHT
+from utils.dice_renderer import render_reveal
+
+TABLES = 2000
+PLAYERS = 6
+
+
+class CountingStream:
+    """An output stream that drops the text and counts the write calls"""
+
+    def __init__(self):
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def print_hand_by_rows(player):
+    """The reveal of one hand as Player.gen_dice_faces printed it before the renderer"""
+    print(f"{player.get_name()}'s hand is:")
+    dice_faces = [DICE_FACES[val] for val in player.hand.faces()]
+    for row_idx in range(DICE_HEIGHT):
+        row_string = ""
+        for die in dice_faces:
+            row_string = row_string + " " + die[row_idx]
+        print(f"{row_string}")
+
+
+def measure(reveal, tables):
+    """Return the seconds and write calls taken to reveal every table"""
+    stream = CountingStream()
+    with contextlib.redirect_stdout(stream):
+        start = time.perf_counter()
+        for players in tables:
+            reveal(players)
+        elapsed = time.perf_counter() - start
+    return elapsed, stream.writes
+
+
+def main():
+    tables = []
+    for seed in range(TABLES):
+        table = Table(seed)
+        tables.append([NPCPlayer(f"Bot {seat}", table) for seat in range(PLAYERS)])
+
+    def by_rows(players):
+        for player in players:
+            print_hand_by_rows(player)
+
+    def cached(players):
+        sys.stdout.write(render_reveal(players))
+
+    for name, reveal in (("row by row", by_rows), ("cached frames", cached)):
+        elapsed, writes = measure(reveal, tables)
+        print(
+            f"{name:<14}{elapsed / TABLES * 1e6:9.1f} us/reveal {writes / TABLES:7.1f} writes/reveal"
+        )
+
+
+if __name__ == "__main__":
+    main()
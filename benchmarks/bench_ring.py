@@ -0,0 +1,62 @@
+"""
+Compare turn passing and elimination on the PlayerRing against the list the Engine used before
+
+Both walk a table of seats passing the turn and knocking out the current player every few turns until one is
+left, which is the work the Engine does between the players' decisions.
+Run from the root of the repository with: python -m benchmarks.bench_ring
+"""
+import time
+from engine import PlayerRing
+
+NUM_SEATS = (6, 60, 600, 6000)
+TURNS_PER_ELIMINATION = 20
+
+
+def list_game(num_seats):
+    """Play the turns with list.index and a rebuilt list, as Engine._get_next_player and _resolve_call did"""
+    players = list(range(num_seats))
+    out = set()
+    current = players[0]
+    turns = 0
+    while len(players) > 1:
+        current = players[(players.index(current) + 1) % len(players)]
+        turns += 1
+        if turns % TURNS_PER_ELIMINATION == 0:
+            out.add(current)
+            while current in out:
+                current = players[(players.index(current) + 1) % len(players)]
+            players = [player for player in players if player not in out]
+    return turns
+
+
+def ring_game(num_seats):
+    """Play the same turns on a PlayerRing"""
+    ring = PlayerRing(range(num_seats))
+    seat = 0
+    turns = 0
+    while ring.size > 1:
+        seat = ring.next_seat[seat]
+        turns += 1
+        if turns % TURNS_PER_ELIMINATION == 0:
+            ring.remove(seat)
+            seat = ring.next_seat[seat]
+    return turns
+
+
+def turns_per_sec(function, num_seats):
+    """Return the turns per second of one game played by function"""
+    start = time.perf_counter()
+    turns = function(num_seats)
+    return turns / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'seats':>6}{'list turns/sec':>18}{'ring turns/sec':>18}{'speedup':>10}")
+    for num_seats in NUM_SEATS:
+        before = turns_per_sec(list_game, num_seats)
+        after = turns_per_sec(ring_game, num_seats)
+        print(f"{num_seats:>6}{before:>18,.0f}{after:>18,.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare Engine snapshots, restores and forks against copy.deepcopy of the engine, the clone a search bot needed before
+
+The engine is taken mid-game at a table of six NPC and Bayesian NPC players with wild ones.
+Run from the root of the repository with: python -m benchmarks.bench_snapshot
+"""
+import copy
+import timeit
+from bayesian_player import BayesianNPCPlayer
+from engine import Engine
+from npc_player import NPCPlayer
+from table import Table
+
+NUM_PLAYERS = 6
+WARMUP_STEPS = 30
+REPEATS = 5
+NUMBER = 2000
+
+
+def mid_game_engine():
+    """Return an engine after a few bets and calls, with Bayesian players holding posteriors"""
+    table = Table(1)
+    players = [
+        (BayesianNPCPlayer if seat % 2 else NPCPlayer)(f"Bot {seat}", table)
+        for seat in range(NUM_PLAYERS)
+    ]
+    engine = Engine(players, wild_ones=True)
+    engine.set_starting_player()
+    for _ in range(WARMUP_STEPS):
+        player = engine.current_player
+        if engine.can_call() and player.make_decision(game_prev_bet=engine.bet, is_wild=True) == "call":
+            engine.step("call")
+        else:
+            engine.step(player.choose_bet(prev_bet=engine.bet, is_wild=True))
+    return engine
+
+
+def microseconds(function):
+    """Return the best time of one call of function in microseconds"""
+    return min(timeit.repeat(function, number=NUMBER, repeat=REPEATS)) / NUMBER * 1e6
+
+
+def main():
+    engine = mid_game_engine()
+    state = engine.snapshot()
+    lean_state = engine.snapshot(with_rng=False)
+    results = [
+        ("snapshot", microseconds(engine.snapshot)),
+        ("snapshot without rng", microseconds(lambda: engine.snapshot(with_rng=False))),
+        ("restore", microseconds(lambda: engine.restore(state))),
+        ("restore without rng", microseconds(lambda: engine.restore(lean_state))),
+        ("fork", microseconds(lambda: engine.fork(state))),
+        ("copy.deepcopy", microseconds(lambda: copy.deepcopy(engine))),
+    ]
+    deepcopy_time = results[-1][1]
+    print(f"{'':<24}{'us/call':>10}{'vs deepcopy':>14}")
+    for name, time_us in results:
+        print(f"{name:<24}{time_us:>10.2f}{deepcopy_time / time_us:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
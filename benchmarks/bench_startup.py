@@ -0,0 +1,42 @@
+"""
+Measure the start-up time of a fresh interpreter importing npc_player
+
+The "scipy import" case pre-imports scipy.stats the way npc_player did before odds.py
+dropped the dependency, so both numbers come from the same machine and run.
+Run from the root of the repository with: python -m benchmarks.bench_startup
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 10
+CASES = {
+    "bare interpreter": "pass",
+    "import npc_player (scipy import)": "import scipy.stats; import npc_player",
+    "import npc_player": "import npc_player",
+    "import main": "import main",
+}
+
+
+def startup_time(code):
+    """Return the median wall clock time of running python -c code in a new process"""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    for name, code in CASES.items():
+        print(f"{name:<34}{startup_time(code) * 1000:8.1f} ms")
+    subprocess.run(
+        [sys.executable, "-c", "import sys, npc_player; assert 'scipy' not in sys.modules"],
+        check=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare Engine.step telling only the players that override observe_bid against telling every seat, as it did before
+
+A table of NPC players, one of them Bayesian, bids its way up from the lowest bid to the highest and calls, round
+after round, so only the engine's own work is timed - the players' decisions are fixed.
+Run from the root of the repository with: python -m benchmarks.bench_step
+"""
+import time
+from bayesian_player import BayesianNPCPlayer
+from bids import COUNT_BITS, COUNT_MASK, NO_BID, encode_bid
+from engine import Engine
+from npc_player import NPCPlayer
+from table import Table
+
+NUM_SEATS = (6, 60, 250)
+NUM_STEPS = 20000
+
+
+def seat_table(num_seats):
+    """Return a started engine with num_seats NPC players, the first one Bayesian"""
+    table = Table(1)
+    players = [BayesianNPCPlayer("Bayes", table)]
+    players += [NPCPlayer(f"Bot {seat}", table) for seat in range(1, num_seats)]
+    engine = Engine(players)
+    engine.set_starting_player(players[0])
+    return engine
+
+
+def next_bid(bid, total_dice):
+    """Return the smallest raise of bid, None if it can't be raised"""
+    if bid == NO_BID:
+        return encode_bid(1, 1)
+    if bid & COUNT_MASK < total_dice:
+        return bid + 1
+    face = bid >> COUNT_BITS
+    return encode_bid(1, face + 1) if face < 6 else None
+
+
+def bids_per_sec(num_seats, notify_every_seat):
+    """Return the bids per second Engine.step applies, notifying every seat as before if notify_every_seat is set"""
+    engine = seat_table(num_seats)
+    if notify_every_seat:
+        engine._bid_observers = list(engine.ring.seats)
+    elapsed = 0.0
+    steps = 0
+    while steps < NUM_STEPS and not engine.is_over():
+        bid = next_bid(engine.bid, engine.table.total_die_count)
+        if bid is None:
+            engine.step("call")
+            continue
+        start = time.perf_counter()
+        engine.step(bid)
+        elapsed += time.perf_counter() - start
+        steps += 1
+    return steps / elapsed
+
+
+def main():
+    print(f"{'seats':>6}{'every seat bids/sec':>22}{'observers bids/sec':>22}{'speedup':>10}")
+    for num_seats in NUM_SEATS:
+        before = bids_per_sec(num_seats, True)
+        after = bids_per_sec(num_seats, False)
+        print(f"{num_seats:>6}{before:>22,.0f}{after:>22,.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
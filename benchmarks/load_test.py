@@ -0,0 +1,153 @@
+"""
+Load test of the game server - spawn fake players against localhost and measure games/sec and turn latency
+
+Every fake player answers the prompts of its game at once: it calls a third of the time and otherwise raises to
+one die of the next face, opening with one die of a random face. The turn latency is the time from sending an
+answer to receiving the next prompt, which covers the bots' moves and the server's scheduling of every table.
+Run from the root of the repository with: python -m benchmarks.load_test --tables 500 --start-server
+"""
+import argparse
+import asyncio
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from server import DEFAULT_PORT
+
+CALL_CHANCE = 1 / 3
+# the prompts of the console game a fake player answers, the rest of the text is read past
+DECISION_PROMPT = "Enter [b] to bet, or [c] to call: "
+VALUE_PROMPT = "Enter Value of die: "
+COUNT_PROMPT = "Enter Number of die: "
+NEXT_ROUND_PROMPT = "[Press enter to continue to next round]"
+ANOTHER_GAME_PROMPT = "Would you like to player another game (y/n): "
+LAST_BET = re.compile(r"Last bet was (\d+) dice of the value (\d+)")
+
+
+def answer_prompt(text, rng, state):
+    """Return the answer to the prompt text ends with, None if it doesn't end with one
+
+    state holds the face of the last bet the player was shown, None when it opens the round
+    """
+    if text.endswith(DECISION_PROMPT):
+        bets = LAST_BET.findall(text)
+        face = int(bets[-1][1])
+        if face == 6 or rng.random() < CALL_CHANCE:
+            return "c"
+        state["face"] = face
+        return "b"
+    if text.endswith(VALUE_PROMPT):
+        face = state["face"]
+        return str(rng.randint(1, 6) if face is None else face + 1)
+    if text.endswith(COUNT_PROMPT):
+        state["face"] = None
+        return "1"
+    if text.endswith(NEXT_ROUND_PROMPT):
+        return ""
+    if text.endswith(ANOTHER_GAME_PROMPT):
+        return "n"
+    return None
+
+
+async def fake_player(host, port, name, rng, latencies):
+    """Play one game as a fake human, return True if it ran until the winner was announced"""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"JOIN {name}\n".encode())
+    answered_at = None
+    state = {"face": None}
+    text = ""
+    finished = False
+    try:
+        while True:
+            chunk = await reader.read(1 << 16)
+            if not chunk:
+                return finished
+            text += chunk.decode(errors="replace")
+            finished = finished or " is the winner!" in text
+            answer = answer_prompt(text, rng, state)
+            if answer is None:
+                continue
+            if answered_at is not None:
+                latencies.append(time.perf_counter() - answered_at)
+            writer.write(answer.encode() + b"\n")
+            answered_at = time.perf_counter()
+            text = ""
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, num_players, seed):
+    """Connect num_players fake players at once and return (finished games, elapsed seconds, turn latencies)"""
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            fake_player(host, port, f"Load {index}", random.Random(rng.random()), latencies)
+            for index in range(num_players)
+        ),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        print(f"{len(errors)} players failed, first error: {errors[0]!r}", file=sys.stderr)
+    return sum(result is True for result in results), elapsed, latencies
+
+
+def start_server(args):
+    """Start the server in its own process and wait until it listens"""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "server.py",
+            "--port",
+            str(args.port),
+            "--bots",
+            str(args.bots),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    process.stdout.readline()
+    return process
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Liar's dice game server")
+    parser.add_argument("--host", default="127.0.0.1", help="address of the server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port of the server")
+    parser.add_argument("--tables", type=int, default=200, help="tables to fill at once")
+    parser.add_argument("--bots", type=int, default=3, help="bots per table for --start-server")
+    parser.add_argument(
+        "--start-server", action="store_true", help="start a server process for the test"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="seed of the fake players")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    process = start_server(args) if args.start_server else None
+    try:
+        finished, elapsed, latencies = asyncio.run(run_load(args.host, args.port, args.tables, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    print(f"{args.tables} fake players at their own tables, {finished} finished their game")
+    print(f"Elapsed {elapsed:.2f}s, {args.tables / elapsed:,.0f} games/sec")
+    if latencies:
+        latencies.sort()
+        print(
+            f"Turn latency over {len(latencies)} turns: "
+            f"median {statistics.median(latencies) * 1000:.2f} ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms, "
+            f"max {latencies[-1] * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark suite covering the NPC decisions, bet validation, Bayesian NPC updates, headless games and dice rendering
+
+Every benchmark reports operations per second, the results are written as JSON so runs of different
+releases can be compared.
+Run from the root of the repository with: python -m benchmarks.suite [--output results.json] [--quick]
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from bayesian_player import BayesianNPCPlayer
+from bids import encode_bid
+from engine import Engine
+from npc_player import NPCPlayer
+from pacing import Pacing
+from table import Table
+
+REPEATS = 5
+
+
+def rate(function, number):
+    """Return the best calls per second of function over REPEATS runs of number calls"""
+    best = min(timeit.repeat(function, number=number, repeat=REPEATS))
+    return number / best
+
+
+def seated_npcs(seed, num_players=4, pacing="none"):
+    """Return NPC players seated at a new seeded table"""
+    table = Table(seed, Pacing(pacing))
+    return [NPCPlayer(f"Bot {seat}", table) for seat in range(num_players)]
+
+
+def bench_calc_odds(scale):
+    """NPCPlayer.calc_odds calls/sec over a spread of bets"""
+    npc = seated_npcs(1)[0]
+    bets = [
+        {"dice_count": dice_count, "dice_value": dice_value}
+        for dice_count in range(1, 21)
+        for dice_value in range(1, 7)
+    ]
+    results = {}
+    for is_wild in (False, True):
+
+        def run():
+            for bet in bets:
+                npc.calc_odds(bet, is_wild)
+
+        results[f"wild={is_wild}"] = rate(run, 20 * scale) * len(bets)
+    return results
+
+
+def bench_make_bet(scale):
+    """NPCPlayer.choose_bet and make_bet (announcing the bet, no pauses) calls/sec"""
+    npc = seated_npcs(2)[0]
+    prev_bets = [
+        {"dice_count": dice_count, "dice_value": dice_value}
+        for dice_count in range(0, 10)
+        for dice_value in range(1, 6)
+    ]
+    results = {}
+
+    def choose():
+        for prev_bet in prev_bets:
+            npc.choose_bet(prev_bet=prev_bet, is_wild=False)
+
+    def make():
+        for prev_bet in prev_bets:
+            npc.make_bet(prev_bet=prev_bet, is_wild=False)
+
+    results["choose_bet"] = rate(choose, 20 * scale) * len(prev_bets)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results["make_bet"] = rate(make, 20 * scale) * len(prev_bets)
+    return results
+
+
+def bench_bet_is_valid(scale):
+    """Player._bet_is_valid calls/sec over every pair of bets on a 20 dice table"""
+    npc = seated_npcs(3)[0]
+    bets = [
+        {"dice_count": dice_count, "dice_value": dice_value}
+        for dice_count in range(1, 21)
+        for dice_value in range(1, 7)
+    ]
+    pairs = [(new_bet, prev_bet) for new_bet in bets[::4] for prev_bet in bets[::3]]
+
+    def run():
+        for new_bet, prev_bet in pairs:
+            npc._bet_is_valid(new_bet, prev_bet)
+
+    return {"bet_is_valid": rate(run, 5 * scale) * len(pairs)}
+
+
+def bench_bayes_update(scale):
+    """BayesianNPCPlayer updates/sec - observing a bid and reading its posterior odds, each run a round of bids on every face"""
+    table = Table(5, Pacing("none"))
+    bayes = BayesianNPCPlayer("Bayes", table)
+    opponents = [NPCPlayer(f"Bot {seat}", table) for seat in range(5)]
+    bids = [(opponent, encode_bid(2, face)) for opponent in opponents for face in range(1, 7)]
+    results = {}
+    for is_wild in (False, True):
+
+        def run():
+            bayes.observe_new_round()
+            for bidder, bid in bids:
+                bayes.observe_bid(bidder, bid, is_wild)
+                bayes.bid_odds(bid, is_wild)
+
+        results[f"wild={is_wild}"] = rate(run, 200 * scale) * len(bids)
+    return results
+
+
+def bench_games(scale):
+    """Headless Engine games/sec for 2 to 6 NPC players, with and without wild ones"""
+    results = {}
+    games = 20 * scale
+    for is_wild in (False, True):
+        for num_players in range(2, 7):
+            start = time.perf_counter()
+            for seed in range(games):
+                Engine(seated_npcs(seed, num_players), is_wild).play()
+            elapsed = time.perf_counter() - start
+            results[f"players={num_players},wild={is_wild}"] = games / elapsed
+    return results
+
+
+def bench_render(scale):
+    """Player.gen_dice_faces renders/sec for full hands"""
+    players = seated_npcs(4, 6)
+
+    def run():
+        for player in players:
+            player.gen_dice_faces()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return {"gen_dice_faces": rate(run, 200 * scale) * len(players)}
+
+
+BENCHMARKS = {
+    "calc_odds": bench_calc_odds,
+    "make_bet": bench_make_bet,
+    "bet_is_valid": bench_bet_is_valid,
+    "bayes_update": bench_bayes_update,
+    "headless_games": bench_games,
+    "gen_dice_faces": bench_render,
+}
+
+
+def git_revision():
+    """Return the current git commit, None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names, scale):
+    """Run the selected benchmarks and return the JSON-ready report"""
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "revision": git_revision(),
+        "unit": "ops/sec",
+        "results": {},
+    }
+    for name in names:
+        print(f"running {name}...", file=sys.stderr)
+        report["results"][name] = BENCHMARKS[name](scale)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Liar's dice benchmark suite")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks"
+    )
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for a smoke test")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_suite(args.only or list(BENCHMARKS), 1 if args.quick else 10)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
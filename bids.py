@@ -0,0 +1,63 @@
+from bisect import bisect_right
+from functools import lru_cache
+
+# a bid is encoded as (dice_value << COUNT_BITS) | dice_count, so comparing two codes orders them like
+# the raise rule does - any count of a higher face, or a higher count of the same face, for up to 65535 dice
+COUNT_BITS = 16
+COUNT_MASK = (1 << COUNT_BITS) - 1
+NO_BID = 0
+# every bid on a face from 1 to 6 lies in [LOWEST_BID, BID_LIMIT)
+LOWEST_BID = 1 << COUNT_BITS
+BID_LIMIT = 7 << COUNT_BITS
+
+# tuples of legal bids kept for this many dice totals before the least recently used one goes
+LEGAL_BIDS_CACHE_SIZE = 64
+
+
+def encode_bid(dice_count, dice_value):
+    """Return the integer code of a bid"""
+    if not 0 <= dice_count <= COUNT_MASK:
+        raise ValueError(f"A bid can't have a dice count of {dice_count}")
+    return (dice_value << COUNT_BITS) | dice_count
+
+
+def bid_count(bid):
+    """Return the dice count of an encoded bid"""
+    return bid & COUNT_MASK
+
+
+def bid_value(bid):
+    """Return the dice face of an encoded bid"""
+    return bid >> COUNT_BITS
+
+
+def bid_from_bet(bet):
+    """Encode a bet dict holding dice_count and dice_value"""
+    return encode_bid(bet["dice_count"], bet["dice_value"])
+
+
+def bet_from_bid(bid):
+    """Decode a bid into a bet dict holding dice_count and dice_value"""
+    return {"dice_count": bid & COUNT_MASK, "dice_value": bid >> COUNT_BITS}
+
+
+@lru_cache(maxsize=LEGAL_BIDS_CACHE_SIZE)
+def legal_bids(total_dice):
+    """Return the ascending tuple of every bid that can be made with total_dice dice on the table"""
+    return tuple(
+        encode_bid(dice_count, dice_value)
+        for dice_value in range(1, 7)
+        for dice_count in range(1, total_dice + 1)
+    )
+
+
+def is_raise(bid, prev_bid, total_dice):
+    """Return True if bid is a legal raise of prev_bid with total_dice dice on the table"""
+    return bid > prev_bid and LOWEST_BID <= bid < BID_LIMIT and 1 <= bid & COUNT_MASK <= total_dice
+
+
+def legal_raises(prev_bid, total_dice):
+    """Return the ascending tuple of every bid that legally raises prev_bid"""
+    bids = legal_bids(total_dice)
+    return bids[bisect_right(bids, prev_bid) :]
+
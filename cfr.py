@@ -0,0 +1,314 @@
+import argparse
+import os
+import time
+from math import factorial
+import numpy as np
+from bids import NO_BID, bid_count, bid_value, legal_bids
+from hand import all_hands
+
+# the solver covers every two player round where each player holds at most this many dice
+DEFAULT_MAX_DICE = 2
+DEFAULT_CHECKPOINT = "cfr_checkpoint.npz"
+DEFAULT_STRATEGY = "cfr_strategy.npz"
+# action 0 calls the last bid, action a > 0 raises to the bid in state a
+CALL = 0
+
+
+def bid_state(bid, total_dice):
+    """Return the state of a round after bid, 0 for NO_BID and the position of the bid in legal_bids plus one otherwise"""
+    if bid == NO_BID:
+        return 0
+    return (bid_value(bid) - 1) * total_dice + bid_count(bid)
+
+
+def info_set_index(hand_index, state, num_states):
+    """Return the integer index of an information set - the own hand and the last bid of the round"""
+    return hand_index * num_states + state
+
+
+def hand_probabilities(num_of_dice):
+    """Return an array of the probability of rolling each hand of all_hands(num_of_dice)"""
+    weights = []
+    for counts in all_hands(num_of_dice):
+        weight = factorial(num_of_dice)
+        for count in counts:
+            weight //= factorial(count)
+        weights.append(weight)
+    return np.array(weights, dtype=float) / 6**num_of_dice
+
+
+def legal_actions(num_states):
+    """Return a bool array [state, action] of the legal actions, raises to a later state and calls of any bid"""
+    states = np.arange(num_states)
+    legal = states[None, :] > states[:, None]
+    legal[1:, CALL] = True
+    return legal
+
+
+def _along(values, player):
+    """Reshape an array [action, hand of player] to broadcast against arrays [action, first hand, second hand]"""
+    if player == 0:
+        return values[:, :, None]
+    return values[:, None, :]
+
+
+class RoundGame:
+    """
+    A class to hold the arrays of one round between two players, the first one opening the bidding
+    The round ends with a call, the player who was wrong loses
+
+    Attributes
+    ----------
+    dice
+        Tuple of the number of dice of the first and the second player
+    num_states
+        The number of states of the round, NO_BID and every legal bid
+    chance
+        Array [first hand, second hand] of the probability of the players rolling those hands
+    truth
+        Bool array [state, first hand, second hand] marking the bids that are true for those hands
+    """
+
+    def __init__(self, dice, wild_ones):
+        self.dice = dice
+        total_dice = sum(dice)
+        bids = legal_bids(total_dice)
+        self.num_states = len(bids) + 1
+        self.chance = np.outer(hand_probabilities(dice[0]), hand_probabilities(dice[1]))
+        faces = np.array([bid_value(bid) for bid in bids]) - 1
+        counts = np.array([bid_count(bid) for bid in bids])
+        matching = []
+        for num_of_dice in dice:
+            hands = np.array(all_hands(num_of_dice))
+            if wild_ones:
+                # counted like Engine.count_dice, a one counts for every face, so twice for a bid on ones
+                hands += hands[:, :1]
+            # [bid, hand] number of dice in the hand counting for the bid
+            matching.append(hands[:, faces].T)
+        self.truth = np.zeros((self.num_states,) + self.chance.shape, dtype=bool)
+        self.truth[1:] = (matching[0][:, :, None] + matching[1][:, None, :]) >= counts[:, None, None]
+
+
+class CFRSolver:
+    """
+    A class to solve two player rounds of Liar's dice with counterfactual regret minimization
+    Information sets hold the own hand and the last bid of the round, which is all the legal actions and
+    the outcome of a call depend on, so the rounds form a DAG of states instead of a tree of bid histories.
+    Every iteration runs a forward pass summing the reach of each state over all paths and a backward pass
+    updating the regrets, both vectorized over all pairs of hands (fixed-strategy iteration CFR with CFR+)
+
+    Attributes
+    ----------
+    max_dice
+        The largest number of dice of either player covered by the solver
+    wild_ones
+        Marks if ones count as the face of every bid
+    iteration
+        The number of iterations run so far
+    regrets
+        Dict of (own dice, opponent dice) -> array [hand, state, action] of cumulative regrets
+    strategy_sums
+        Dict of (own dice, opponent dice) -> array [hand, state, action] of the weighted sum of past strategies
+    games
+        The RoundGames of every ordered pair of dice counts
+
+    Methods
+    ---------
+    from_checkpoint
+        Build a solver from a checkpoint file
+    current_strategy
+        Return the regret matching strategy of a pair of dice counts
+    average_strategy
+        Return the average strategy of a pair of dice counts, the one that converges to an equilibrium
+    iterate
+        Run one iteration over every round and return the value of the opening player
+    train
+        Run iterations, reporting iterations/sec and saving checkpoints
+    save_checkpoint
+        Write the regrets and strategy sums to a file
+    export
+        Write the average strategies to the file read by the StrategyNPCPlayer
+    """
+
+    def __init__(self, max_dice=DEFAULT_MAX_DICE, wild_ones=False):
+        self.max_dice = max_dice
+        self.wild_ones = wild_ones
+        self.iteration = 0
+        self.regrets = {}
+        self.strategy_sums = {}
+        self.games = []
+        self._legal = {}
+        for own_dice in range(1, max_dice + 1):
+            for opponent_dice in range(1, max_dice + 1):
+                game = RoundGame((own_dice, opponent_dice), wild_ones)
+                shape = (len(all_hands(own_dice)), game.num_states, game.num_states)
+                self.regrets[own_dice, opponent_dice] = np.zeros(shape)
+                self.strategy_sums[own_dice, opponent_dice] = np.zeros(shape)
+                self._legal[game.num_states] = legal_actions(game.num_states)
+                self.games.append(game)
+
+    @classmethod
+    def from_checkpoint(cls, path):
+        """Return a solver holding the regrets and strategy sums saved in a checkpoint"""
+        with np.load(path) as checkpoint:
+            solver = cls(int(checkpoint["max_dice"]), bool(checkpoint["wild_ones"]))
+            solver.iteration = int(checkpoint["iteration"])
+            for own_dice, opponent_dice in solver.regrets:
+                key = f"{own_dice}_{opponent_dice}"
+                solver.regrets[own_dice, opponent_dice] = checkpoint[f"regrets_{key}"]
+                solver.strategy_sums[own_dice, opponent_dice] = checkpoint[f"strategy_sums_{key}"]
+        return solver
+
+    def current_strategy(self, key):
+        """Return the strategy [hand, state, action] playing the legal actions in proportion to their positive regret"""
+        return self._normalize(np.maximum(self.regrets[key], 0))
+
+    def average_strategy(self, key):
+        """Return the average strategy [hand, state, action] over all iterations"""
+        return self._normalize(self.strategy_sums[key])
+
+    def _normalize(self, weights):
+        """Normalize weights over the actions, playing the legal actions uniformly where all weights are 0"""
+        legal = self._legal[weights.shape[1]]
+        totals = weights.sum(axis=2, keepdims=True)
+        uniform = legal / legal.sum(axis=1, keepdims=True)
+        return np.where(totals > 0, weights / np.where(totals > 0, totals, 1), uniform)
+
+    def iterate(self):
+        """Run one iteration of every round, update the regrets and return the mean value of the opening player"""
+        self.iteration += 1
+        strategies = {key: self.current_strategy(key) for key in self.regrets}
+        deltas = {key: np.zeros_like(regrets) for key, regrets in self.regrets.items()}
+        value = 0.0
+        for game in self.games:
+            value += self._traverse(game, strategies, deltas)
+        for key, delta in deltas.items():
+            # CFR+ keeps the cumulative regrets from going negative
+            np.maximum(self.regrets[key] + delta, 0, out=self.regrets[key])
+        return value / len(self.games)
+
+    def _traverse(self, game, strategies, deltas):
+        """Run the forward and backward pass of one round and return the value of the opening player"""
+        first, second = game.dice
+        keys = ((first, second), (second, first))
+        num_states = game.num_states
+        legal = self._legal[num_states]
+        # reach[q, state, player to act] - chance and the actions of everyone but q summed over all paths to the state
+        reach = np.zeros((2, num_states, 2) + game.chance.shape)
+        reach[:, 0, 0] = game.chance
+        for state in range(num_states - 1):
+            for player in (0, 1):
+                if state == 0 and player == 1:
+                    continue
+                strategy = strategies[keys[player]][:, state, state + 1 :]
+                # the player's own raises don't count towards its counterfactual reach
+                reach[player, state + 1 :, 1 - player] += reach[player, state, player]
+                reach[1 - player, state + 1 :, 1 - player] += reach[1 - player, state, player] * _along(
+                    strategy.T, player
+                )
+        # values[state, player to act] - the value of the first player for every pair of hands
+        values = np.zeros((num_states, 2) + game.chance.shape)
+        weight = self.iteration
+        for state in range(num_states - 1, -1, -1):
+            for player in (0, 1):
+                if state == 0 and player == 1:
+                    continue
+                action_values = np.zeros((num_states,) + game.chance.shape)
+                if state > 0:
+                    # a call wins for the bidder when the bid is true
+                    bidder_wins = np.where(game.truth[state], 1.0, -1.0)
+                    action_values[CALL] = bidder_wins if player == 1 else -bidder_wins
+                action_values[state + 1 :] = values[state + 1 :, 1 - player]
+                strategy = strategies[keys[player]][:, state, :]
+                values[state, player] = (_along(strategy.T, player) * action_values).sum(axis=0)
+                opponent_axis = 2 - player
+                sign = 1.0 if player == 0 else -1.0
+                counterfactual = sign * (reach[player, state, player] * action_values).sum(axis=opponent_axis).T
+                node_value = (strategy * counterfactual).sum(axis=1, keepdims=True)
+                deltas[keys[player]][:, state, :] += (counterfactual - node_value) * legal[state]
+                own_reach = reach[1 - player, state, player].sum(axis=opponent_axis - 1)
+                self.strategy_sums[keys[player]][:, state, :] += weight * own_reach[:, None] * strategy
+        return float((game.chance * values[0, 0]).sum())
+
+    def train(self, iterations, checkpoint=None, checkpoint_every=100, report_every=10):
+        """Run iterations, printing iterations/sec every report_every and saving a checkpoint every checkpoint_every"""
+        start = time.perf_counter()
+        last_report, last_iteration = start, self.iteration
+        for done in range(1, iterations + 1):
+            value = self.iterate()
+            if done % report_every == 0 or done == iterations:
+                now = time.perf_counter()
+                rate = (self.iteration - last_iteration) / (now - last_report)
+                print(
+                    f"iteration {self.iteration:>8}  {rate:8.1f} it/s  opening player value {value:+.4f}"
+                )
+                last_report, last_iteration = now, self.iteration
+            if checkpoint is not None and (done % checkpoint_every == 0 or done == iterations):
+                self.save_checkpoint(checkpoint)
+        elapsed = time.perf_counter() - start
+        print(f"{iterations} iterations in {elapsed:.2f}s ({iterations / elapsed:.1f} it/s)")
+
+    def save_checkpoint(self, path):
+        """Write the regrets and strategy sums to path, replacing the previous checkpoint only once written"""
+        arrays = {}
+        for (own_dice, opponent_dice), regrets in self.regrets.items():
+            key = f"{own_dice}_{opponent_dice}"
+            arrays[f"regrets_{key}"] = regrets
+            arrays[f"strategy_sums_{key}"] = self.strategy_sums[own_dice, opponent_dice]
+        temporary = path + ".tmp.npz"
+        np.savez(
+            temporary,
+            iteration=self.iteration,
+            max_dice=self.max_dice,
+            wild_ones=self.wild_ones,
+            **arrays,
+        )
+        os.replace(temporary, path)
+
+    def export(self, path=DEFAULT_STRATEGY):
+        """Write the average strategy of every pair of dice counts to path as float32 arrays [hand, state, action]"""
+        arrays = {
+            f"strategy_{own_dice}_{opponent_dice}": self.average_strategy(
+                (own_dice, opponent_dice)
+            ).astype(np.float32)
+            for own_dice, opponent_dice in self.regrets
+        }
+        np.savez(path, max_dice=self.max_dice, wild_ones=self.wild_ones, **arrays)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Solve two player rounds of Liar's dice with CFR and export the strategy table"
+    )
+    parser.add_argument(
+        "--max-dice", type=int, default=DEFAULT_MAX_DICE, help="most dice held by either player"
+    )
+    parser.add_argument("--iterations", type=int, default=1000, help="iterations to run")
+    parser.add_argument("--wild", action="store_true", help="solve the rounds with wild ones")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="checkpoint file")
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=100, help="iterations between checkpoints"
+    )
+    parser.add_argument("--report-every", type=int, default=10, help="iterations between reports")
+    parser.add_argument(
+        "--resume", action="store_true", help="continue from the checkpoint instead of starting over"
+    )
+    parser.add_argument("--output", default=DEFAULT_STRATEGY, help="file to export the strategy to")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.resume and os.path.exists(args.checkpoint):
+        solver = CFRSolver.from_checkpoint(args.checkpoint)
+        print(f"Resuming from iteration {solver.iteration} of {args.checkpoint}")
+    else:
+        solver = CFRSolver(args.max_dice, args.wild)
+    solver.train(args.iterations, args.checkpoint, args.checkpoint_every, args.report_every)
+    solver.export(args.output)
+    print(f"Strategy written to {args.output}")
+    return solver
+
+
+if __name__ == "__main__":
+    main()
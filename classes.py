@@ -2,7 +2,7 @@ import random
 import time
 from dice_graphics import DICE_FACES, DICE_HEIGHT, START_SCREEN, START_TEXT
 
-from scipy.stats import binom
+from odds import bet_probability
 
 
 class Player:
@@ -179,14 +179,7 @@ class NPCPlayer(Player):
         dice_val_count = bet["dice_count"] - self.hand.count(bet["dice_value"])
         if is_wild:
             dice_val_count += self.hand.count(1)
-            face_possibility = 2 / 6
-        else:
-            face_possibility = 1 / 6
-        if dice_val_count > total_hidden_dice:
-            return 0
-        return round(
-            1 - binom.cdf(dice_val_count - 1, total_hidden_dice, face_possibility), 2
-        )
+        return round(bet_probability(dice_val_count, total_hidden_dice, is_wild), 2)
 
     def make_bet(self, **kwargs):
         """NPC player to make a bet based on dice in his hand, if best bet not a valid bet randomize to a valid one"""
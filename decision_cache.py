@@ -0,0 +1,46 @@
+from functools import lru_cache
+
+# situations each NPC decision cache holds before evicting the least recently used one
+DEFAULT_CACHE_SIZE = 1 << 16
+
+
+class DecisionCache:
+    """
+    A class to wrap a function of a situation in a bounded least recently used cache with hit, miss and eviction counters
+    The cache is a functools.lru_cache, so a lookup costs about a call of a built-in function, hit or miss.
+    Only functions whose result follows from the situation alone may be cached, choices drawn from a generator
+    have to be made outside of it.
+
+    Attributes
+    ----------
+    function
+        The function of the situation, called directly when the cache is bypassed
+    lookup
+        The cached function, called with the situation like function
+    maxsize
+        The number of situations kept before the least recently used one is evicted
+
+    Methods
+    ---------
+    counters
+        Return the hits, misses and evictions since the cache was created or cleared
+    clear
+        Drop every cached situation and reset the counters
+    """
+
+    def __init__(self, function, maxsize=DEFAULT_CACHE_SIZE):
+        self.function = function
+        self.maxsize = maxsize
+        self.lookup = lru_cache(maxsize=maxsize)(function)
+
+    def __len__(self):
+        return self.lookup.cache_info().currsize
+
+    def counters(self):
+        """Return the hits, misses and evictions as a dict, every miss adds a situation so the evictions are the rest"""
+        info = self.lookup.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "evictions": info.misses - info.currsize}
+
+    def clear(self):
+        """Drop every cached situation and reset the counters"""
+        self.lookup.cache_clear()
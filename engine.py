@@ -0,0 +1,451 @@
+from collections import namedtuple
+from time import perf_counter
+from bids import COUNT_MASK, NO_BID, bet_from_bid, bid_from_bet, is_raise
+from hand import Hand
+from player import Player
+from table import Table
+
+# players seated at most at one table, their seats fit a byte of the game log and their dice the count of a bid
+MAX_PLAYERS = 255
+
+# the complete state of a game as an immutable value - the face counts of every seat's hand, the seats of the
+# current and previous player (-1 for none), the bid, the wild ones mode, the game counters, the seats knocked
+# out in order, the state of the table's generator (None if left out) and what every player learnt this round
+EngineState = namedtuple(
+    "EngineState",
+    "hands seat previous_seat bid wild_ones rounds bets correct_calls eliminated rng_state player_states",
+)
+
+
+class RoundResult:
+    """
+    A class to hold the outcome of a round that ended with a call
+
+    Attributes
+    ----------
+    caller
+        The player who called the last bet
+    bidder
+        The player who made the bet that was called
+    bet
+        The bet that was called
+    dice_total
+        The number of dice on the table matching the called bet
+    call_correct
+        Marks if the caller was right and the bet was a bluff
+    loser
+        The player who lost a die
+    eliminated
+        The players knocked out of the game at the end of the round
+    """
+
+    def __init__(self, caller, bidder, bet, dice_total, loser, eliminated):
+        self.caller = caller
+        self.bidder = bidder
+        self.bet = bet
+        self.dice_total = dice_total
+        self.call_correct = loser is bidder
+        self.loser = loser
+        self.eliminated = eliminated
+
+
+class GameResult:
+    """
+    A class to hold the outcome of a finished game
+
+    Attributes
+    ----------
+    winner
+        The only player left with dice at the end of the game
+    rounds
+        The number of rounds played, one round ends with every call
+    bets
+        The number of bets made during the game
+    correct_calls
+        The number of calls that caught a bluff, costing the bidder a die - the other rounds cost the caller a die
+    eliminated
+        The players in the order they were knocked out of the game
+    """
+
+    def __init__(self, winner, rounds, bets, correct_calls, eliminated):
+        self.winner = winner
+        self.rounds = rounds
+        self.bets = bets
+        self.correct_calls = correct_calls
+        self.eliminated = eliminated
+
+
+class PlayerRing:
+    """
+    A class to hold the seats of a game in a circular doubly linked list over seat indices
+    Passing the turn and removing a player are constant time, however many seats the table has
+
+    Attributes
+    ----------
+    seats
+        List of every player of the game by seat, eliminated players keep their seat
+    seat_of
+        Dict of the seat of every player
+    next_seat
+        List of the seat playing after each seat, a removed seat still points into the ring
+    previous_seat
+        List of the seat playing before each seat
+    size
+        The number of players left in the ring
+    players
+        The players left in the ring in seat order, rebuilt only after a removal
+
+    Methods
+    ---------
+    remove
+        Unlink the seat of a player who is out of the game
+    relink
+        Link exactly the marked seats into the ring
+    """
+
+    def __init__(self, players):
+        self.seats = list(players)
+        self.seat_of = {player: seat for seat, player in enumerate(self.seats)}
+        self.size = len(self.seats)
+        self.next_seat = [(seat + 1) % self.size for seat in range(self.size)]
+        self.previous_seat = [(seat - 1) % self.size for seat in range(self.size)]
+        self._in_ring = [True] * self.size
+        self._players = list(self.seats)
+
+    @property
+    def players(self):
+        """The players left in the ring in seat order"""
+        if self._players is None:
+            self._players = [
+                player for player, in_ring in zip(self.seats, self._in_ring) if in_ring
+            ]
+        return self._players
+
+    def remove(self, seat):
+        """Unlink a seat from the ring, keeping its own links so the turn can still move on from it"""
+        following, preceding = self.next_seat[seat], self.previous_seat[seat]
+        self.next_seat[preceding] = following
+        self.previous_seat[following] = preceding
+        self._in_ring[seat] = False
+        self.size -= 1
+        self._players = None
+
+    def relink(self, in_ring):
+        """Link the seats marked in in_ring, a removed seat points to the seats around it in the ring"""
+        if in_ring == self._in_ring:
+            return
+        ring_seats = [seat for seat, linked in enumerate(in_ring) if linked]
+        self.size = len(ring_seats)
+        following = ring_seats[0]
+        for seat in range(len(in_ring) - 1, -1, -1):
+            self.next_seat[seat] = following
+            if in_ring[seat]:
+                following = seat
+        preceding = ring_seats[-1]
+        for seat in range(len(in_ring)):
+            self.previous_seat[seat] = preceding
+            if in_ring[seat]:
+                preceding = seat
+        self._in_ring = list(in_ring)
+        self._players = None
+
+
+def _overriding(players, hook):
+    """Return the players, in seat order, whose class overrides the Player method named hook"""
+    base = getattr(Player, hook)
+    return [player for player in players if getattr(type(player), hook) is not base]
+
+
+class Engine:
+    """
+    A class to represent the state of a table of Liar's dice and apply the players' actions to it
+    The engine does no console I/O and never sleeps, so bot-only games can be run headless
+
+    Attributes
+    ----------
+    players
+        The players still holding dice, in turn order
+    ring
+        The PlayerRing of the seats, passing the turn and eliminating players in constant time
+    table
+        The Table the players sit at, its generator makes every random choice of the game
+    wild_ones
+        Marks if ones count as the face of the current bet
+    bid
+        The integer encoded last bet of the round, NO_BID at the start of a round
+    bet
+        Dict to hold the number of dice (dice_count) and the dice face (dice_value) of the last made bet
+    current_player
+        The player whose turn it currently is
+    previous_player
+        The player who made the last bet, None at the start of a round
+    result
+        The GameResult once only one player remains, None while the game is running
+
+    Methods
+    ---------
+    set_starting_player
+        Set the player starting the game, a random one if none is given, and record it in the table's game log
+    is_over
+        Check if only one player remains in the game
+    can_call
+        Check if there is a bet on the table that can be called
+    count_dice
+        Count the dice on the table matching a face, including ones in wild ones mode
+    step
+        Apply the action of the current player, either a bet dict, an encoded bid or "call"
+    play
+        Play a headless game with NPC players until only one remains and return the result
+    snapshot
+        Return the complete state of the game as an immutable EngineState
+    restore
+        Put the game, its table and its players back into the state of a snapshot
+    fork
+        Return an independent Engine with copies of the players, in the current state or a snapshot
+    """
+
+    def __init__(self, players, wild_ones=False):
+        self.ring = PlayerRing(players)
+        if self.ring.size > MAX_PLAYERS:
+            raise ValueError(f"A table seats at most {MAX_PLAYERS} players, not {self.ring.size}")
+        total_dice = sum(player.num_of_dice for player in self.ring.seats)
+        if total_dice > COUNT_MASK:
+            raise ValueError(f"A bid counts at most {COUNT_MASK} dice, the table has {total_dice}")
+        self.table = self.ring.seats[0].table
+        self.table.engine = self
+        self.wild_ones = wild_ones
+        self.bid = NO_BID
+        self.current_player = None
+        self.previous_player = None
+        self.result = None
+        self._seat = None
+        self._rounds = 0
+        self._bets = 0
+        self._correct_calls = 0
+        self._eliminated = []
+        self._instrumentation = self.table.instrumentation
+        self._log = self.table.game_log
+        # only the players that override the hooks are told about bets and new rounds, a turn at a table of
+        # plain NPCs then costs the same however many seats it has
+        self._bid_observers = _overriding(self.ring.seats, "observe_bid")
+        self._round_observers = _overriding(self.ring.seats, "observe_new_round")
+
+    def set_starting_player(self, player=None):
+        """Set the player starting the game, picked at random if none is given, and start the game in the table's log"""
+        if player is None:
+            player = self.table.rng.choice(self.players)
+        self._seat = self.ring.seat_of[player]
+        self.current_player = player
+        if self._log is not None:
+            self._log.start_game(self.players, self.table.seed, self.wild_ones, player)
+
+    @property
+    def players(self):
+        """The players still holding dice, in turn order"""
+        return self.ring.players
+
+    @property
+    def bet(self):
+        """The last bet as a dict of dice_count and dice_value, the form the players work with"""
+        return bet_from_bid(self.bid)
+
+    def is_over(self):
+        """Return True once only one player remains in the game"""
+        return self.ring.size == 1
+
+    def can_call(self):
+        """Return True if a bet was made this round and can be called"""
+        return self.bid != NO_BID
+
+    def count_dice(self, dice_value):
+        """Count the dice on the table showing a face, ones are added in wild ones mode"""
+        total_dice_count = 0
+        for player in self.players:
+            total_dice_count += player.hand.count(dice_value)
+            if self.wild_ones:
+                total_dice_count += player.hand.count(1)
+        return total_dice_count
+
+    def step(self, action):
+        """Apply the current player's action - a bet dict, a bid or "call" - and return a RoundResult when a bet is called"""
+        if self.is_over():
+            raise RuntimeError("The game is already over")
+        if action == "call":
+            if not self.can_call():
+                raise ValueError("There is no bet to call at the start of a round")
+            return self._resolve_call()
+        bid = action if isinstance(action, int) else bid_from_bet(action)
+        if not is_raise(bid, self.bid, self.table.total_die_count):
+            raise ValueError(f"Invalid bet {bet_from_bid(bid)} after {self.bet}")
+        self.bid = bid
+        self._bets += 1
+        if self._log is not None:
+            self._log.bid(self.current_player, bid)
+        for player in self._bid_observers:
+            if player.num_of_dice:
+                player.observe_bid(self.current_player, bid, self.wild_ones)
+        self._get_next_player()
+        return None
+
+    def play(self):
+        """Play a headless game until only one player remains and return the GameResult"""
+        if any(player.is_human for player in self.players):
+            raise ValueError("Only NPC players can play a headless game")
+        if self.current_player is None:
+            self.set_starting_player()
+        instrumentation = self._instrumentation
+        while not self.is_over():
+            player = self.current_player
+            if instrumentation is not None:
+                start = perf_counter()
+            if self.can_call():
+                decision = player.make_decision(game_prev_bet=self.bet, is_wild=self.wild_ones)
+            else:
+                decision = "bet"
+            if instrumentation is not None:
+                instrumentation.record("decision", perf_counter() - start)
+            if decision == "call":
+                self.step("call")
+            else:
+                if instrumentation is not None:
+                    start = perf_counter()
+                self.step(player.choose_bet(prev_bet=self.bet, is_wild=self.wild_ones))
+                if instrumentation is not None:
+                    instrumentation.record("bet", perf_counter() - start)
+        return self.result
+
+    def snapshot(self, with_rng=True):
+        """Return the complete state of the game as an EngineState, cheap enough to take for every search node
+
+        Copying the generator's state is most of the cost, searches that roll their own dice can leave it out
+        with with_rng=False, restoring such a snapshot leaves the generator as it is
+        """
+        seat_of = self.ring.seat_of
+        seats = self.ring.seats
+        return EngineState(
+            tuple(player.hand.counts for player in seats),
+            -1 if self._seat is None else self._seat,
+            -1 if self.previous_player is None else seat_of[self.previous_player],
+            self.bid,
+            self.wild_ones,
+            self._rounds,
+            self._bets,
+            self._correct_calls,
+            tuple(seat_of[player] for player in self._eliminated),
+            self.table.rng.getstate() if with_rng else None,
+            tuple(player.save_state(seat_of) for player in seats),
+        )
+
+    def restore(self, state):
+        """Put the game, the table and the players back into the state of a snapshot of this engine or a fork of it"""
+        seats = self.ring.seats
+        in_ring = []
+        total_die_count = 0
+        for player, counts, player_state in zip(seats, state.hands, state.player_states):
+            hand = Hand(counts)
+            player.hand = hand
+            player.num_of_dice = hand.size
+            player.restore_state(player_state, seats)
+            total_die_count += hand.size
+            in_ring.append(hand.size > 0)
+        self.ring.relink(in_ring)
+        self.table.total_die_count = total_die_count
+        self.table.num_players = self.ring.size
+        if state.rng_state is not None:
+            self.table.rng.setstate(state.rng_state)
+        self._seat = None if state.seat < 0 else state.seat
+        self.current_player = None if state.seat < 0 else seats[state.seat]
+        self.previous_player = None if state.previous_seat < 0 else seats[state.previous_seat]
+        self.bid = state.bid
+        self.wild_ones = state.wild_ones
+        self._rounds = state.rounds
+        self._bets = state.bets
+        self._correct_calls = state.correct_calls
+        self._eliminated = [seats[seat] for seat in state.eliminated]
+        self.result = None
+        if self.is_over():
+            self.result = GameResult(
+                self.players[0], self._rounds, self._bets, self._correct_calls, self._eliminated
+            )
+
+    def fork(self, state=None):
+        """Return an Engine with copies of the players at a new table, in the given state or the current one
+
+        The new table keeps the seed and the pacing, but neither the instrumentation nor the game log
+        """
+        if state is None:
+            state = self.snapshot()
+        table = Table(self.table.seed, self.table.pacing)
+        engine = Engine([player.fork(table) for player in self.ring.seats], state.wild_ones)
+        engine.restore(state)
+        return engine
+
+    def _get_next_player(self):
+        """Pass the turn to the next player in the game"""
+        self.previous_player = self.current_player
+        self._seat = self.ring.next_seat[self._seat]
+        self.current_player = self.ring.seats[self._seat]
+
+    def _reroll_hands(self):
+        """Roll the dice of every player for the next round in one draw from the table's generator"""
+        faces = self.table.roll(self.table.total_die_count)
+        start = 0
+        for player in self.players:
+            player.set_hand(faces[start : start + player.num_of_dice])
+            start += player.num_of_dice
+
+    def _resolve_call(self):
+        """Check the called bet against all dice on the table, remove a die from the loser and start the next round"""
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            start = perf_counter()
+        caller, bidder = self.current_player, self.previous_player
+        bet = self.bet
+        dice_total = self.count_dice(bet["dice_value"])
+        loser = bidder if dice_total < bet["dice_count"] else caller
+        if instrumentation is not None:
+            now = perf_counter()
+            instrumentation.record("check_winner", now - start)
+            start = now
+        loser.lose_die()
+        if self._log is not None:
+            self._log.call(caller, dice_total, loser)
+        # only the loser can run out of dice, the caller starts the next round unless they are out
+        eliminated = []
+        if len(loser.hand) == 0:
+            eliminated.append(loser)
+            self.ring.remove(self.ring.seat_of[loser])
+            if loser is caller:
+                self._seat = self.ring.next_seat[self._seat]
+                self.current_player = self.ring.seats[self._seat]
+        self.previous_player = None
+        self._eliminated.extend(eliminated)
+        self._rounds += 1
+        round_result = RoundResult(caller, bidder, bet, dice_total, loser, eliminated)
+        if round_result.call_correct:
+            self._correct_calls += 1
+        if instrumentation is not None:
+            now = perf_counter()
+            instrumentation.record("resolve_round", now - start)
+            start = now
+        if self.is_over():
+            self.result = GameResult(
+                self.players[0], self._rounds, self._bets, self._correct_calls, self._eliminated
+            )
+            if self._log is not None:
+                self._log.end_game(self.players[0], self._rounds)
+            if instrumentation is not None:
+                instrumentation.count("games")
+                instrumentation.count("rounds", self._rounds)
+                instrumentation.count("bets", self._bets)
+        else:
+            self._reroll_hands()
+            self.bid = NO_BID
+            if self._log is not None:
+                self._log.hands(self.players)
+            for player in self._round_observers:
+                if player.num_of_dice:
+                    player.observe_new_round()
+            if instrumentation is not None:
+                instrumentation.record("reroll", perf_counter() - start)
+        return round_result
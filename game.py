@@ -1,8 +1,12 @@
-import random
-import time
+from time import perf_counter
+from pacing import Pacing
 from player import Player
 from npc_player import NPCPlayer
+from engine import Engine
+from input_provider import ConsoleInput
+from table import Table
 from utils.dice_graphics import START_SCREEN, START_TEXT
+from utils.dice_renderer import render_reveal
 
 class Game:
     """
@@ -10,236 +14,257 @@ class Game:
 
     Attributes
     ----------
-    bet
-        Dict to hold the number of dice (dice_count) and the dice face (dice_value) of the last made bet
-    starting_player
-        Set to the player starting the round
-    current_player
-        The player whose turn it currently is
+    table
+        The Table shared by the players of the current game
+    engine
+        The Engine holding the state of the table - players, current bet and whose turn it is
     bot_names_list
         List of names to be used for the NPC players
+    seed
+        Seed of the first game's table, every following game uses the next seed, None for unseeded games
+    games_played
+        The number of games started, used to pick the seed of the next table
+    pacing
+        The Pacing of the console output, shared with the players through the table
+    instrumentation
+        The Instrumentation recording timings and counters of the games, None when turned off
+    input
+        The input provider answering the prompts of the game and of the human player, and showing them the game
+    game_log
+        The GameLogWriter recording every game played, None when turned off
 
     Methods
     ---------
     start_game
         Set the initial state of the game - print start screen, add players
+    play
+        Coroutine running the games, awaiting the answers of the input provider and the pauses
     print_start_graphic
-        Print the starting screen
+        Write the starting screen
     set_wild_mode
         Enable the wild ones mode where 1's count as the face of the current bet
     add_players
         Add the human controlled and a selected number of NPC players
     set_starting_player
         Set the starting player for the game
-    get_next_player
-        Get the next player who's turn it is
     check_winner
-        Check who is the winner of the game an prints his name
-    reroll_players_dice
-        Reroll the dice in all players' hands
+        Print the result of a call - the matching dice on the table and who loses a die
     resolve_round
-        After a player calls a bet, check if call is correct or not, and remove dice and players accordingly, set player that wil start next round
+        Print the players that were knocked out of the game by the last call
     restart_for_new_round
-        Resets the settings for the next round - call reroll_players_dice, reset the bet
+        Announce the next round and show the re-rolled hand of a human player
     get_winner
-        Check when only one player remains in the game, declare him the winner
+        Declare the only remaining player the winner and return the result of the game
     reveal_hands
         Print the hands of all players in the game
     play_game
-        Play a game going through rounds until only one player remains
+        Play a game going through rounds until only one player remains, driving the Engine
     """
 
-    def __init__(self, bot_names_list):
-        self.bet = {"dice_count": 0, "dice_value": 0}
-        self.starting_player = ""
-        self.current_player = ""
+    def __init__(
+        self,
+        bot_names_list,
+        seed=None,
+        pacing=None,
+        instrumentation=None,
+        input_provider=None,
+        game_log=None,
+    ):
+        self.table = None
+        self.engine = None
         self.bot_names_list = bot_names_list
+        self.seed = seed
+        self.games_played = 0
+        self.pacing = pacing if pacing is not None else Pacing()
+        self.instrumentation = instrumentation
+        self.input = input_provider if input_provider is not None else ConsoleInput()
+        self.game_log = game_log
 
     def start_game(self):
-        """Setup the game - print starting graphics, add players, set wild ones mode"""
-        self._print_start_graphic()
-        self._add_players(self.bot_names_list)
-        self._set_wild_mode()
-        self._play_game()
-        while continue_game != "n" or continue_game != "y":
-            continue_game = input("Would you like to player another game (y/n): ")
-        if continue_game == "y":
-            self.init_game()
-        else:
-            print("Quitting game.")
+        """Setup the game - print starting graphics, add players, set wild ones mode
+
+        Runs play on a new event loop, for the console and scripted input providers
+        """
+        import asyncio
+
+        return asyncio.run(self.play())
 
-    def _print_with_delay(self, text, delay=0.001):
-        for char in text:
-            print(char, end="", flush=True)
-            time.sleep(delay)
-        print("\n\n")
+    async def play(self):
+        """Play games until the player quits and return the result of the last one, awaiting every answer"""
+        await self._print_start_graphic()
+        while True:
+            await self._add_players(self.bot_names_list)
+            await self._set_wild_mode()
+            result = await self._play_game()
+            continue_game = ""
+            while continue_game != "n" and continue_game != "y":
+                continue_game = await self.input.read_line(
+                    "Would you like to player another game (y/n): "
+                )
+            if continue_game == "n":
+                self.input.write("Quitting game.")
+                return result
 
-    def _print_start_graphic(self):
-        """Print the graphics for the game, defined in dice_graphics.py"""
+    async def _print_start_graphic(self):
+        """Write the graphics for the game, defined in dice_graphics.py"""
         for text in [START_TEXT, START_SCREEN]:
-            self._print_with_delay(text)
+            await self.pacing.write_slowly(self.input, text)
 
-    def _set_wild_mode(self):
+    async def _set_wild_mode(self):
         """Activate wild ones mode where 1's count as the face of the current bet"""
         while True:
-            is_wild = input(
+            is_wild = await self.input.read_line(
                 "Would you like to enable wild ones mode and count ones as the face of the current bid (y/n): "
             )
             if is_wild == "y" or is_wild == "n":
                 break
             else:
-                print("Please enter either 'y'(yes) or 'n'(no)!")
+                self.input.write("Please enter either 'y'(yes) or 'n'(no)!")
         if is_wild == "y":
             self.wild_ones = True
-            print("Wild mode activated!\n")
+            self.input.write("Wild mode activated!\n")
         else:
-            print("Wild mode NOT active!\n")
+            self.input.write("Wild mode NOT active!\n")
             self.wild_ones = False
 
-    def _add_players(self, bot_names_list):
+    async def _add_players(self, bot_names_list):
         """Add the human player, prompt him regarding how many NPC players he wants in the game"""
         self.list_of_players = []
+        self.table = Table(
+            None if self.seed is None else self.seed + self.games_played,
+            self.pacing,
+            self.instrumentation,
+            self.game_log,
+        )
+        self.games_played += 1
         number_of_bots = 0
         #self.list_of_players.append(Player(input("Enter your name: ")))
-        self._add_human_player()
+        await self._add_human_player()
         while True:
             try:
                 number_of_bots = int(
-                    input(
+                    await self.input.read_line(
                         "Please enter a number between 1 and 5 for how many AI players you would like to have: "
                     )
                 )
                 if 1 <= number_of_bots <= 5:
                     break
                 else:
-                    print("The number is not between 1 and 5.")
+                    self.input.write("The number is not between 1 and 5.")
             except ValueError:
-                print("The input is not a valid integer.")
+                self.input.write("The input is not a valid integer.")
+        available_names = list(bot_names_list)
         for _ in range(number_of_bots):
-            name = random.choice(bot_names_list)
-            print(f"{name} joins the game!")
-            bot_names_list.remove(name)
-            self.list_of_players.append(NPCPlayer(name))
+            name = self.table.rng.choice(available_names)
+            self.input.write(f"{name} joins the game!")
+            available_names.remove(name)
+            self.list_of_players.append(NPCPlayer(name, self.table, self.input))
     
-    def _add_human_player(self):
+    async def _add_human_player(self):
         name = ""
         while(name == "" or name in self.bot_names_list):
-            name=input("Enter your name: ")
+            name=await self.input.read_line("Enter your name: ")
             if not name:
-                print("You cannot play with an empty name")
+                self.input.write("You cannot play with an empty name")
             if name in self.bot_names_list:
-                print(f"The name {name} is already a reserved name for a bot player, choose a name that is a non-empty string and not one of the following names {self.bot_names_list}")
+                self.input.write(f"The name {name} is already a reserved name for a bot player, choose a name that is a non-empty string and not one of the following names {self.bot_names_list}")
 
-        self.list_of_players.append(Player(name))
+        self.list_of_players.append(Player(name, self.table, self.input))
 
     def _set_starting_player(self):
         """Set who will be the starting player for the game, if he is not an NPC, show his hand on the screen"""
-        if self.current_player == "":
-            self.current_player = random.choice(self.list_of_players)
-            print("START GAME!!!")
-            print(f"{self.current_player.get_name()} starts first!")
-            if self.current_player.is_human:
-                print("Your hand is:")
-                self.current_player.gen_dice_faces()
-
-    def _get_next_player(self):
-        """Return the next player object from the ones in the game"""
-        self.previous_player = self.current_player
-        self.current_player = self.list_of_players[
-            (self.list_of_players.index(self.current_player) + 1)
-            % len(self.list_of_players)
-        ]
-
-    def _check_winner(self):
-        """Check who is the winner depending on all dice on the table and last bet made"""
-        total_dice_count = 0
-        for player in self.list_of_players:
-            total_dice_count += player.hand.count(self.bet["dice_value"])
-            if self.wild_ones:
-                total_dice_count += player.hand.count(1)
+        self.engine.set_starting_player()
+        self.input.write("START GAME!!!")
+        self.input.write(f"{self.engine.current_player.get_name()} starts first!")
+        if self.engine.current_player.is_human:
+            self.input.write("Your hand is:")
+            self.engine.current_player.gen_dice_faces()
+
+    def _check_winner(self, round_result):
+        """Print the dice on the table matching the called bet and who loses a die"""
+        bet_value = round_result.bet["dice_value"]
         if self.wild_ones:
-            print(
-                f"There is a total of {total_dice_count} {self.bet['dice_value']}'s when counting ones as well."
+            self.input.write(
+                f"There is a total of {round_result.dice_total} {bet_value}'s when counting ones as well."
             )
         else:
-            print(f"There is a total of {total_dice_count} {self.bet['dice_value']}'s.")
-        if total_dice_count < self.bet["dice_count"]:
-            print(
-                f"{self.current_player.get_name()}'s call was correct, "
-                f"{self.previous_player.get_name()} loses a die"
+            self.input.write(f"There is a total of {round_result.dice_total} {bet_value}'s.")
+        if round_result.call_correct:
+            self.input.write(
+                f"{round_result.caller.get_name()}'s call was correct, "
+                f"{round_result.bidder.get_name()} loses a die"
             )
-            self.previous_player.lose_die()
         else:
-            print(
-                f"{self.current_player.get_name()}'s call was wrong, {self.current_player.get_name()} loses a die"
+            self.input.write(
+                f"{round_result.caller.get_name()}'s call was wrong, {round_result.caller.get_name()} loses a die"
             )
-            self.current_player.lose_die()
-
-    def _reroll_player_dice(self):
-        """Re-roll the dice for each player in the game"""
-        for player in self.list_of_players:
-            player.dice_roll()
-
-    def _resolve_round(self):
-        """Remove all players which have no dice left, if the player who should be next in turn has 0 dice, set the next player"""
-        while len(self.current_player.hand) == 0:
-            self._get_next_player()
-        for player in self.list_of_players:
-            if len(player.hand) == 0:
-                print(f"{player.get_name()} is out of the game")
-        self.list_of_players = [
-            player for player in self.list_of_players if not len(player.hand) == 0
-        ]
-        if len(self.list_of_players) == 1:
-            self._get_winner()
-
-    def _restart_for_new_round(self):
-        """Resets the table for a new round - the dice in each players hands will be re-rolled, bet value will be reset"""
-        input("\n[Press enter to continue to next round]")
-        print("\n\nStarting new round!")
-        print(f"{self.current_player.get_name()} starts the round!")
-        time.sleep(1)
-        self._reroll_player_dice()
-        self.bet = {"dice_count": 0, "dice_value": 0}
-        if self.current_player.is_human:
-            print("Your hand is: ")
-            self.current_player.gen_dice_faces()
+
+    def _resolve_round(self, round_result):
+        """Print the players that have no dice left and are out of the game"""
+        for player in round_result.eliminated:
+            self.input.write(f"{player.get_name()} is out of the game")
+
+    async def _restart_for_new_round(self):
+        """Announce the new round - the engine has already re-rolled the dice and reset the bet"""
+        await self.input.read_line("\n[Press enter to continue to next round]")
+        self.input.write("\n\nStarting new round!")
+        self.input.write(f"{self.engine.current_player.get_name()} starts the round!")
+        await self.pacing.pause_async(1)
+        if self.engine.current_player.is_human:
+            self.input.write("Your hand is: ")
+            self.engine.current_player.gen_dice_faces()
 
     def _get_winner(self):
-        """Print the name of the winner, who will be the only remaining player in the game"""
-        print(f"{self.list_of_players[0].get_name()} is the winner!")
-        exit()
+        """Print the name of the winner, who will be the only remaining player in the game, and return the result"""
+        self.input.write(f"{self.engine.result.winner.get_name()} is the winner!")
+        return self.engine.result
 
-    def _reveal_hands(self):
+    async def _reveal_hands(self):
         """Display the hands of all participating players in the game"""
-        for player in self.list_of_players:
-            print(f"{player.get_name()}'s hand is:")
-            player.gen_dice_faces()
-            time.sleep(1)
+        if self.pacing.scale == 0:
+            # no pauses between the hands, so write the whole reveal at once
+            self.input.write(render_reveal(self.engine.players), end="")
+            return
+        for player in self.engine.players:
+            self.input.write(render_reveal([player]), end="")
+            await self.pacing.pause_async(1)
 
-    def _play_game(self):
+    async def _play_game(self):
         """Play rounds looping through each player until only one remains"""
+        self.engine = Engine(self.list_of_players, self.wild_ones)
         self._set_starting_player()
-        self.bet.update(
-            self.current_player.make_bet(prev_bet=self.bet, is_wild=self.wild_ones)
-        )
-        self._get_next_player()
-        while True:
-            player_decision = self.current_player.make_decision(
-                game_prev_bet=self.bet, is_wild=self.wild_ones
-            )
-            if player_decision == "call":
-                print(f"{self.current_player.get_name()} calls that last bet was BS!")
-                print("Revealing all players hands!!!")
-                self._reveal_hands()
-                self._check_winner()
-                self._resolve_round()
-                self._restart_for_new_round()
+        instrumentation = self.instrumentation
+        while not self.engine.is_over():
+            player = self.engine.current_player
+            if instrumentation is not None:
+                start = perf_counter()
+            if self.engine.can_call():
+                player_decision = await player.make_decision_async(
+                    game_prev_bet=self.engine.bet, is_wild=self.wild_ones
+                )
+            else:
                 player_decision = "bet"
+            if instrumentation is not None:
+                instrumentation.record("decision", perf_counter() - start)
+            if player_decision == "call":
+                self.input.write(f"{player.get_name()} calls that last bet was BS!")
+                self.input.write("Revealing all players hands!!!")
+                if instrumentation is not None:
+                    start = perf_counter()
+                await self._reveal_hands()
+                if instrumentation is not None:
+                    instrumentation.record("reveal", perf_counter() - start)
+                round_result = self.engine.step("call")
+                self._check_winner(round_result)
+                self._resolve_round(round_result)
+                if not self.engine.is_over():
+                    await self._restart_for_new_round()
             if player_decision == "bet":
-                self.bet.update(
-                    self.current_player.make_bet(
-                        prev_bet=self.bet, is_wild=self.wild_ones
-                    )
+                if instrumentation is not None:
+                    start = perf_counter()
+                self.engine.step(
+                    await player.make_bet_async(prev_bet=self.engine.bet, is_wild=self.wild_ones)
                 )
-                self._get_next_player()
+                if instrumentation is not None:
+                    instrumentation.record("bet", perf_counter() - start)
+        return self._get_winner()
@@ -0,0 +1,327 @@
+import os
+import struct
+from bids import COUNT_BITS, COUNT_MASK
+
+MAGIC = b"LDGL"
+VERSION = 2
+# magic, version, reserved - the header takes the size of one record
+HEADER = struct.Struct("<4sHH")
+# kind, seat, count, value, data - every record of the log has this fixed size
+RECORD = struct.Struct("<BBBBI")
+# the same record as the fields of a NumPy dtype, built by the reader so writing a log doesn't import NumPy
+RECORD_FIELDS = [("kind", "u1"), ("seat", "u1"), ("count", "u1"), ("value", "u1"), ("data", "<u4")]
+
+# record kinds
+# GAME: seat = number of players, count = starting seat, value = flags, data = 0 (reserved)
+GAME = 1
+# SEED: count = part (0 low word, 1 high word of the seed, 2 game index of a "<seed>-<index>" seed), data = the word
+SEED = 2
+# PLAYER: seat, count = length of the UTF-8 name, value = chunk number, data = 4 bytes of the name
+PLAYER = 3
+# HANDS: seat, count = dice in the hand, data = number of dice showing each face, 4 bits per face from ones up
+HANDS = 4
+# BID: seat of the bidder, value = face of the bid, data = count of the bid
+BID = 5
+# CALL: seat of the caller, value = seat of the player losing a die, data = dice matching the called bid
+CALL = 6
+# END: seat of the winner, data = number of rounds
+END = 7
+
+# GAME flags
+WILD_ONES = 1
+SEEDED = 2
+INDEXED_SEED = 4
+
+# packed HANDS data of every tuple of face counts seen so far, and the other way round for the reader
+_PACKED_HANDS = {}
+_UNPACKED_HANDS = {}
+
+# the writer only writes whole games, in buffers of at least this many bytes
+FLUSH_BYTES = 1 << 16
+
+
+class GameLogWriter:
+    """
+    A class to append games to a binary log of fixed-size records
+    Records are buffered and written only at the end of a game, so every write holds whole games and several
+    processes can append to the same file. Only the process creating the file writes the header.
+
+    Attributes
+    ----------
+    path
+        The path of the log file
+
+    Methods
+    ---------
+    start_game
+        Record the seed, the wild ones mode, the players, the starting player and the first hands of a game
+    hands
+        Record the hands of the players still in the game at the start of a round
+    bid
+        Record a bid
+    call
+        Record a call - the dice matching the called bid and the player who lost a die
+    end_game
+        Record the winner and the number of rounds, writing the buffer once it is large enough
+    flush
+        Write the buffered games to the file
+    close
+        Flush and close the file, leaving out a game that didn't end
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            # the header is written unbuffered by whoever creates the file, before anyone can append a game
+            descriptor = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        except FileExistsError:
+            pass
+        else:
+            try:
+                os.write(descriptor, HEADER.pack(MAGIC, VERSION, 0))
+            finally:
+                os.close(descriptor)
+        self._file = open(path, "ab")
+        self._buffer = bytearray()
+        self._seats = {}
+        # where the game being recorded starts in the buffer, None between games
+        self._game_start = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _add(self, kind, seat=0, count=0, value=0, data=0):
+        """Append one record to the buffer"""
+        self._buffer += RECORD.pack(kind, seat, count, value, data)
+
+    def start_game(self, players, seed, wild_ones, starting_player):
+        """Record the start of a game, the seats are the positions of the players in the list"""
+        self._seats = {player: seat for seat, player in enumerate(players)}
+        self._game_start = len(self._buffer)
+        flags = WILD_ONES if wild_ones else 0
+        seed_parts = _seed_parts(seed)
+        if seed_parts:
+            flags |= SEEDED | (INDEXED_SEED if len(seed_parts) == 3 else 0)
+        self._add(GAME, len(players), self._seats[starting_player], flags)
+        for part, word in enumerate(seed_parts):
+            self._add(SEED, count=part, data=word)
+        for seat, player in enumerate(players):
+            name = player.get_name().encode()[:255]
+            for chunk in range(0, max(len(name), 1), 4):
+                self._add(
+                    PLAYER,
+                    seat,
+                    len(name),
+                    chunk // 4,
+                    int.from_bytes(name[chunk : chunk + 4].ljust(4, b"\0"), "little"),
+                )
+        self.hands(players)
+
+    def hands(self, players):
+        """Record the hands of the players at the start of a round"""
+        for player in players:
+            hand = player.hand
+            packed = _PACKED_HANDS.get(hand.counts)
+            if packed is None:
+                packed = _PACKED_HANDS[hand.counts] = sum(
+                    count << (4 * face) for face, count in enumerate(hand.counts)
+                )
+            self._buffer += RECORD.pack(HANDS, self._seats[player], hand.size, 0, packed)
+
+    def bid(self, player, bid):
+        """Record the encoded bid of player"""
+        self._buffer += RECORD.pack(BID, self._seats[player], 0, bid >> COUNT_BITS, bid & COUNT_MASK)
+
+    def call(self, caller, dice_total, loser):
+        """Record a call of caller, the dice on the table matching the bid and the player who lost a die"""
+        self._add(CALL, self._seats[caller], value=self._seats[loser], data=dice_total)
+
+    def end_game(self, winner, rounds):
+        """Record the end of a game and write the buffer once it holds FLUSH_BYTES"""
+        self._add(END, self._seats[winner], data=rounds)
+        self._game_start = None
+        if len(self._buffer) >= FLUSH_BYTES:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered games in one write, the records of a game that hasn't ended stay in the buffer"""
+        end = len(self._buffer) if self._game_start is None else self._game_start
+        if end:
+            self._file.write(self._buffer[:end])
+            self._file.flush()
+            del self._buffer[:end]
+            if self._game_start is not None:
+                self._game_start = 0
+
+    def close(self):
+        """Write the buffered games and close the file, dropping the records of a game that didn't end"""
+        if not self._file.closed:
+            if self._game_start is not None:
+                del self._buffer[self._game_start :]
+                self._game_start = None
+            self.flush()
+            self._file.close()
+
+
+def _seed_parts(seed):
+    """Return the 32-bit words recording a seed, empty if it can't be recorded
+
+    Integer seeds from 0 to 2**64 - 1 take two words, the "<seed>-<index>" seeds of tournaments a third
+    word with the index
+    """
+    index = None
+    if isinstance(seed, str):
+        seed, _, index = seed.partition("-")
+        if not (seed.isdigit() and index.isdigit()):
+            return ()
+        seed, index = int(seed), int(index)
+        if index >= 1 << 32:
+            return ()
+    if not isinstance(seed, int) or isinstance(seed, bool) or not 0 <= seed < 1 << 64:
+        return ()
+    parts = (seed & 0xFFFFFFFF, seed >> 32)
+    if index is not None:
+        parts += (index,)
+    return parts
+
+
+class LoggedGame:
+    """
+    A class to hold one game read back from a game log
+
+    Attributes
+    ----------
+    number
+        The position of the game in the log, counting from 0
+    seed
+        The seed of the game's table - an int, a "<seed>-<index>" string or None if it wasn't recorded
+    wild_ones
+        Marks if the game was played with wild ones
+    players
+        List of the names of the players by seat
+    starting_seat
+        The seat of the player who made the first bid
+    events
+        List of the events in order - ("hands", list of face count tuples by seat, None once out),
+        ("bid", seat, count, value) and ("call", caller seat, matching dice, loser seat)
+    winner
+        The seat of the winner
+    rounds
+        The number of rounds played
+    """
+
+    def __init__(self, number, seed, wild_ones, num_players, starting_seat):
+        self.number = number
+        self.seed = seed
+        self.wild_ones = wild_ones
+        self.players = [""] * num_players
+        self.starting_seat = starting_seat
+        self.events = []
+        self.winner = None
+        self.rounds = 0
+
+
+def read_records(path, chunk_records=1 << 16):
+    """Yield the records of a game log as NumPy structured arrays of up to chunk_records records"""
+    import numpy as np
+
+    record_dtype = np.dtype(RECORD_FIELDS)
+    with open(path, "rb") as source:
+        header = source.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return
+        magic, version, _ = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} game log")
+        while True:
+            chunk = source.read(chunk_records * RECORD.size)
+            if not chunk:
+                return
+            yield np.frombuffer(chunk[: len(chunk) - len(chunk) % RECORD.size], dtype=record_dtype)
+
+
+def read_games(path, chunk_records=1 << 16):
+    """Yield the LoggedGames of a game log one by one, reading the file in chunks of chunk_records records
+
+    Every chunk is split into games on its END records with NumPy, the records after the last END wait for the
+    next chunk, and the fields of all games of a chunk are gathered at once
+    """
+    import numpy as np
+
+    number = 0
+    tail = None
+    for records in read_records(path, chunk_records):
+        if tail is not None:
+            records = np.concatenate((tail, records))
+        ends = np.flatnonzero(records["kind"] == END)
+        tail = records[ends[-1] + 1 :] if len(ends) else records
+        if len(ends):
+            yield from _split_games(records[: ends[-1] + 1], ends, number)
+            number += len(ends)
+
+
+def _split_games(records, ends, first_number):
+    """Return the LoggedGames of records holding whole games, ends being the rows of their END records"""
+    import numpy as np
+
+    kinds = records["kind"]
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    games = [
+        LoggedGame(first_number + index, None, bool(flags & WILD_ONES), num_players, starting_seat)
+        for index, (_, num_players, starting_seat, flags, _) in enumerate(records[starts].tolist())
+    ]
+    for game, (_, winner, _, _, rounds) in zip(games, records[ends].tolist()):
+        game.winner = winner
+        game.rounds = rounds
+
+    # the words of every seed, by game and part
+    seed_rows = np.flatnonzero(kinds == SEED)
+    words = np.zeros((len(games), 3), dtype=np.uint64)
+    words[np.searchsorted(ends, seed_rows), records["count"][seed_rows]] = records["data"][seed_rows]
+    seeds = (words[:, 0] | words[:, 1] << np.uint64(32)).tolist()
+    flags = records["value"][starts].tolist()
+    for game, game_flags, seed, index in zip(games, flags, seeds, words[:, 2].tolist()):
+        if game_flags & SEEDED:
+            game.seed = f"{seed}-{index}" if game_flags & INDEXED_SEED else seed
+
+    # the names are the 4-byte chunks of the PLAYER records of a seat, cut to the length of the name
+    player_rows = np.flatnonzero(kinds == PLAYER)
+    name_bytes = records["data"][player_rows].tobytes()
+    first_chunks = np.flatnonzero(records["value"][player_rows] == 0)
+    name_games = np.searchsorted(ends, player_rows[first_chunks]).tolist()
+    name_seats = records["seat"][player_rows[first_chunks]].tolist()
+    name_lengths = records["count"][player_rows[first_chunks]].tolist()
+    for chunk, game, seat, length in zip(first_chunks.tolist(), name_games, name_seats, name_lengths):
+        games[game].players[seat] = name_bytes[4 * chunk : 4 * chunk + length].decode(errors="replace")
+
+    # a run of HANDS records is one event, the bids and calls are one event each
+    is_hands = kinds == HANDS
+    run_starts = is_hands & ~np.concatenate(([False], is_hands[:-1]))
+    event_rows = np.flatnonzero(run_starts | (kinds == BID) | (kinds == CALL))
+    run_games = np.searchsorted(ends, np.flatnonzero(run_starts)).tolist()
+    runs = [[None] * len(games[game].players) for game in run_games]
+    run_numbers = np.cumsum(run_starts) - 1
+    hand_rows = np.flatnonzero(is_hands)
+    hand_seats = records["seat"][hand_rows].tolist()
+    for run, seat, packed in zip(run_numbers[hand_rows].tolist(), hand_seats, records["data"][hand_rows].tolist()):
+        counts = _UNPACKED_HANDS.get(packed)
+        if counts is None:
+            counts = _UNPACKED_HANDS[packed] = tuple((packed >> (4 * face)) & 0xF for face in range(6))
+        runs[run][seat] = counts
+    events = [
+        ("hands", runs[run]) if kind == HANDS else ("bid" if kind == BID else "call", seat, data, value)
+        for kind, seat, data, value, run in zip(
+            kinds[event_rows].tolist(),
+            records["seat"][event_rows].tolist(),
+            records["data"][event_rows].tolist(),
+            records["value"][event_rows].tolist(),
+            run_numbers[event_rows].tolist(),
+        )
+    ]
+    bounds = np.searchsorted(event_rows, ends).tolist()
+    for game, first, last in zip(games, [0] + bounds[:-1], bounds):
+        game.events = events[first:last]
+    return games
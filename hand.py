@@ -0,0 +1,102 @@
+from table import FACES
+
+# every hand of a number of dice as count tuples, with the index of each in that order
+_ALL_HANDS = {}
+
+
+def all_hands(num_of_dice):
+    """Return every distinct hand of num_of_dice dice as a tuple of count tuples, in a fixed order"""
+    return _hand_table(num_of_dice)[0]
+
+
+def hand_index(counts):
+    """Return the position of a hand's count tuple in all_hands of its number of dice"""
+    return _hand_table(sum(counts))[1][tuple(counts)]
+
+
+def _hand_table(num_of_dice):
+    """Build the hands of num_of_dice dice once, with a dict of counts -> index"""
+    table = _ALL_HANDS.get(num_of_dice)
+    if table is None:
+        hands = tuple(_compositions(num_of_dice, len(FACES)))
+        table = (hands, {counts: index for index, counts in enumerate(hands)})
+        _ALL_HANDS[num_of_dice] = table
+    return table
+
+
+def _compositions(num_of_dice, faces):
+    """Yield every tuple of face counts of num_of_dice dice over a number of faces"""
+    if faces == 1:
+        yield (num_of_dice,)
+        return
+    for count in range(num_of_dice + 1):
+        for rest in _compositions(num_of_dice - count, faces - 1):
+            yield (count,) + rest
+
+
+class Hand:
+    """
+    A class used to represent the dice in a players hand as the number of dice showing each face
+    The order of the dice is not kept, the list of faces is only built when the hand is rendered
+
+    Attributes
+    ----------
+    counts
+        Tuple with the number of dice showing each face, counts[0] is the number of ones
+    size
+        The number of dice in the hand
+
+    Methods
+    ---------
+    from_faces
+        Build a hand from a list of rolled faces
+    count
+        Return the number of dice showing a face
+    faces
+        Return the faces of the dice in the hand in ascending order
+    lose_die
+        Remove one die from the hand
+    """
+
+    __slots__ = ("counts", "size")
+
+    def __init__(self, counts=(0, 0, 0, 0, 0, 0)):
+        self.counts = tuple(counts)
+        self.size = sum(self.counts)
+
+    @classmethod
+    def from_faces(cls, faces):
+        """Return a hand holding the rolled faces"""
+        counts = [0, 0, 0, 0, 0, 0]
+        for face in faces:
+            counts[face - 1] += 1
+        return cls(counts)
+
+    def count(self, face):
+        """Return the number of dice showing a face"""
+        if 1 <= face <= 6:
+            return self.counts[face - 1]
+        return 0
+
+    def faces(self):
+        """Return the list of faces in the hand in ascending order, for rendering"""
+        return [face for face in FACES for _ in range(self.counts[face - 1])]
+
+    def lose_die(self):
+        """Remove one die from the hand, the hand is re-rolled before the next bet so any die will do"""
+        counts = list(self.counts)
+        for face in reversed(FACES):
+            if counts[face - 1] > 0:
+                counts[face - 1] -= 1
+                break
+        self.counts = tuple(counts)
+        self.size = sum(counts)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.faces())
+
+    def __repr__(self):
+        return f"Hand({self.faces()})"
@@ -0,0 +1,150 @@
+from collections import deque
+
+
+def run_now(coroutine):
+    """Run a coroutine that finishes without waiting on the event loop and return its result
+
+    The console and scripted providers answer without suspending, so the same async code serves the
+    blocking console game without an event loop
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as finished:
+        return finished.value
+    coroutine.close()
+    raise RuntimeError("The input provider needs an event loop, await the coroutine instead")
+
+
+class ConsoleInput:
+    """
+    A class to read the answers of a human player typing at the console and show them the game
+    input() blocks, so the console provider only suits a single game in the foreground
+
+    Methods
+    ---------
+    read_line
+        Print the prompt and return the line typed by the player
+    write
+        Print text to the console
+    """
+
+    async def read_line(self, prompt):
+        """Print the prompt and return the line typed at the console"""
+        return input(prompt)
+
+    def write(self, text, end="\n"):
+        """Print text followed by end, flushed so text written a character at a time shows at once"""
+        print(text, end=end, flush=True)
+
+
+class ScriptedInput:
+    """
+    A class to answer the prompts of a game from a queue of lines, for scripted games running at full speed
+
+    Attributes
+    ----------
+    answers
+        Deque of the lines still to be answered, in order
+    fallback
+        Function of the prompt returning the answer once the queue is empty, None to raise EOFError instead
+    echo
+        Marks if prompts, answers and the text written by the game are printed, like they would show at the console
+    prompts
+        List of every prompt asked so far
+    output
+        List of every text written by the game, each with its end
+
+    Methods
+    ---------
+    push
+        Add lines to the end of the queue
+    read_line
+        Return the next queued line
+    write
+        Keep the text written by the game, printing it as well when echo is on
+    """
+
+    def __init__(self, answers=(), fallback=None, echo=False):
+        self.answers = deque(answers)
+        self.fallback = fallback
+        self.echo = echo
+        self.prompts = []
+        self.output = []
+
+    def push(self, *answers):
+        """Add lines to the end of the queue"""
+        self.answers.extend(answers)
+
+    async def read_line(self, prompt):
+        """Return the next queued line, or the fallback's answer once the queue is empty"""
+        self.prompts.append(prompt)
+        if self.answers:
+            answer = self.answers.popleft()
+        elif self.fallback is not None:
+            answer = self.fallback(prompt)
+        else:
+            raise EOFError(f"No scripted answer left for the prompt {prompt!r}")
+        if self.echo:
+            print(f"{prompt}{answer}")
+        return answer
+
+    def write(self, text, end="\n"):
+        """Append text followed by end to the output, and print it if echo is on"""
+        self.output.append(text + end)
+        if self.echo:
+            print(text, end=end)
+
+
+class StreamInput:
+    """
+    A class to read the answers of a remote player from asyncio streams and send them the game
+    Waiting for a line suspends only the game asking, so one event loop can run many tables without threads
+
+    Attributes
+    ----------
+    reader, writer
+        The asyncio StreamReader and StreamWriter of the player's connection
+    answers
+        Deque of the lines answered for the player before reading the stream, sent along with their prompts
+    timeout
+        Seconds the player has to answer a prompt, None to wait as long as it takes
+
+    Methods
+    ---------
+    read_line
+        Send the prompt and wait for the next line from the stream
+    write
+        Send text to the stream
+    """
+
+    def __init__(self, reader, writer, answers=(), timeout=None):
+        self.reader = reader
+        self.writer = writer
+        self.answers = deque(answers)
+        self.timeout = timeout
+
+    async def read_line(self, prompt):
+        """Send the prompt and return the next queued answer, else the next line of the stream without its line break
+
+        Raises EOFError once the stream is closed and TimeoutError when no line comes within timeout seconds
+        """
+        if self.answers:
+            answer = self.answers.popleft()
+            self.writer.write(f"{prompt}{answer}\n".encode())
+            return answer
+        if prompt:
+            self.writer.write(prompt.encode())
+        await self.writer.drain()
+        if self.timeout is None:
+            line = await self.reader.readline()
+        else:
+            import asyncio
+
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+        if not line:
+            raise EOFError("The player's stream was closed")
+        return line.decode(errors="replace").rstrip("\r\n")
+
+    def write(self, text, end="\n"):
+        """Send text followed by end, the stream's buffer is drained before the next line is read"""
+        self.writer.write((text + end).encode())
@@ -0,0 +1,88 @@
+import cProfile
+import pstats
+import sys
+
+# the phases of a turn timed by the engine and the game, in the order they happen
+PHASES = ("decision", "bet", "reveal", "check_winner", "resolve_round", "reroll")
+
+
+class Instrumentation:
+    """
+    A class used to record where the time of a game goes, per phase of a turn, and how often things happen
+    Tables hold None instead of an Instrumentation when it is turned off, so the hot paths only pay a None check
+
+    Attributes
+    ----------
+    timings
+        Dict of the total seconds spent in each phase
+    calls
+        Dict of the number of times each phase ran
+    counters
+        Dict of named counters - games, rounds (one per call), bets and fallback_raises
+        (NPC bets that were not valid and were replaced by a raise from the NPC raise table)
+
+    Methods
+    ---------
+    record
+        Add the duration of one run of a phase
+    count
+        Increase a counter
+    merge
+        Add the numbers of another Instrumentation, e.g. one sent back from a worker process
+    report
+        Return a printable summary of the timings and counters
+    """
+
+    def __init__(self):
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.counters = {"games": 0, "rounds": 0, "bets": 0, "fallback_raises": 0}
+
+    def record(self, phase, seconds):
+        """Add the duration of one run of a phase"""
+        self.timings[phase] += seconds
+        self.calls[phase] += 1
+
+    def count(self, name, amount=1):
+        """Increase a counter by amount"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other):
+        """Add the timings and counters of another Instrumentation to this one"""
+        for phase in PHASES:
+            self.timings[phase] += other.timings[phase]
+            self.calls[phase] += other.calls[phase]
+        for name, value in other.counters.items():
+            self.count(name, value)
+
+    def report(self):
+        """Return the time spent per phase and the counters, with bets per round and calls per game"""
+        total = sum(self.timings.values()) or 1
+        lines = [f"{'phase':<16}{'calls':>10}{'total s':>10}{'mean us':>10}{'share':>8}"]
+        for phase in PHASES:
+            calls = self.calls[phase]
+            mean = self.timings[phase] / calls * 1e6 if calls else 0
+            lines.append(
+                f"{phase:<16}{calls:>10}{self.timings[phase]:>10.3f}{mean:>10.2f}"
+                f"{self.timings[phase] / total:>8.1%}"
+            )
+        width = max(16, *(len(name) + 1 for name in self.counters))
+        for name, value in self.counters.items():
+            lines.append(f"{name:<{width}}{value:>10}")
+        rounds = self.counters["rounds"]
+        games = self.counters["games"]
+        if rounds:
+            lines.append(f"bets per round  {self.counters['bets'] / rounds:>10.2f}")
+        if games:
+            lines.append(f"calls per game  {rounds / games:>10.2f}")
+        return "\n".join(lines)
+
+
+def run_profiled(function, *args, limit=30):
+    """Run function under cProfile, print the stats sorted by cumulative time to stderr and return its result"""
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function, *args)
+    finally:
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats("cumulative").print_stats(limit)
@@ -0,0 +1,311 @@
+import math
+import time
+import numpy as np
+from bids import COUNT_BITS, COUNT_MASK, NO_BID, bet_from_bid, bid_from_bet, encode_bid
+from npc_player import NPCPlayer
+
+# iterations of the search per move when no time budget is given
+DEFAULT_ITERATIONS = 2000
+# exploration constant of the UCB1 selection, the rewards are 0 or 1
+EXPLORATION = 0.7
+# counts per face offered as raises at every node, from the smallest sensible count of the face up
+RAISE_SPAN = 3
+# a rollout player calls once the bid is this many dice above what they expect on the table
+CALL_MARGIN = 0.5
+# opponent hands sampled at once, the search cycles through them and draws new ones when they run out
+DETERMINIZATIONS = 512
+# iterations between two looks at the clock when searching against a time budget
+CLOCK_EVERY = 32
+CALL = 0
+
+# candidate actions per (bid, dice on the table, wild ones): CALL first unless there is no bid, then the raises
+_ACTIONS = {}
+
+
+def candidate_actions(bid, total_dice, is_wild):
+    """Return the actions the search tries after bid - CALL and RAISE_SPAN raises of every face that can be bid"""
+    key = (bid, total_dice, is_wild)
+    actions = _ACTIONS.get(key)
+    if actions is None:
+        dice_count, dice_value = bid & COUNT_MASK, bid >> COUNT_BITS
+        actions = [] if bid == NO_BID else [CALL]
+        for face in range(max(dice_value, 1), 7):
+            if bid == NO_BID:
+                # in wild ones mode a one counts for every face, and twice for a bid on ones
+                chance = 1 / 3 if is_wild else 1 / 6
+                lowest = max(1, int(total_dice * chance) - 1)
+            elif face == dice_value:
+                lowest = dice_count + 1
+            else:
+                lowest = max(1, dice_count - 1)
+            for raised_count in range(lowest, min(lowest + RAISE_SPAN, total_dice + 1)):
+                actions.append(encode_bid(raised_count, face))
+        actions = _ACTIONS[key] = tuple(actions)
+    return actions
+
+
+def determinize(rng, hand_counts, dice, is_wild, num_worlds=DETERMINIZATIONS):
+    """Sample num_worlds deals of the opponents' dice around a known hand
+
+    Returns a list of worlds, each a pair of the dice matching every face on the whole table (indexed by face)
+    and, per player in turn order, the dice they expect to match every face from their own hand. The dice are
+    counted like Engine.count_dice does - in wild ones mode a one counts for every face, so twice for a bid on ones.
+    """
+    num_players = len(dice)
+    counts = np.empty((num_worlds, num_players, 6), dtype=np.int64)
+    counts[:, 0] = hand_counts
+    for position in range(1, num_players):
+        counts[:, position] = rng.multinomial(dice[position], [1 / 6] * 6, size=num_worlds)
+    matching = np.zeros((num_worlds, num_players, 7), dtype=np.int64)
+    matching[:, :, 1:] = counts
+    chances = np.full(7, 1 / 6)
+    if is_wild:
+        matching[:, :, 1:] += counts[:, :, :1]
+        chances[1:] = 1 / 3
+    hidden = (sum(dice) - np.asarray(dice))[:, None] * chances
+    expected = matching + hidden
+    return list(zip(matching.sum(axis=1).tolist(), expected.tolist()))
+
+
+class ISMCTSNPCPlayer(NPCPlayer):
+    """
+    A class used to represent an NPC player searching its moves with information set Monte Carlo tree search
+    Every iteration deals the unseen opponent dice at random, walks the tree of public states (bid, player to act)
+    with UCB1 and plays the round out with a quick heuristic, so one tree serves every possible deal.
+    The tree is kept between the turns of a round and its nodes are shared by every order of bids reaching them.
+
+    Attributes
+    ----------
+    iterations
+        The number of iterations per move, used when there is no time budget
+    time_budget
+        The seconds of search per move, None to search a fixed number of iterations
+    tree
+        Dict of integer state (bid * players + position of the player to act) -> [visits, actions, action visits,
+        action wins], positions count in turn order from this player
+    tree_shape
+        The (players, dice on the table, wild ones) the tree was built for
+    planned
+        The (bid, action) found by the last search, so a bet decided by make_decision isn't searched again
+    searches
+        The number of searches run
+    iterations_run
+        The number of iterations run over all searches
+    search_time
+        The seconds spent searching over all searches
+
+    Methods
+    ---------
+    override make_decision
+        Search the current bid and call if that is the most visited action
+    override choose_bet
+        Bet the raise the search visited most
+    override observe_new_round
+        Drop the tree, the hands were re-rolled
+    override restore_state
+        Drop the tree, it was searched in a state the game has left
+    override fork
+        Copy the player with a tree of its own
+    search
+        Search from a bid and return the most visited action
+    iterations_per_sec
+        Return the iteration rate over all searches
+    """
+
+    __slots__ = (
+        "iterations",
+        "time_budget",
+        "tree",
+        "tree_shape",
+        "planned",
+        "searches",
+        "iterations_run",
+        "search_time",
+    )
+
+    def __init__(self, name, table=None, input_provider=None, iterations=DEFAULT_ITERATIONS, time_budget=None):
+        super().__init__(name, table, input_provider)
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.tree = {}
+        self.tree_shape = None
+        self.planned = None
+        self.searches = 0
+        self.iterations_run = 0
+        self.search_time = 0.0
+
+    def make_decision(self, **kwargs):
+        """Search from the last bet and call if calling is the most visited action"""
+        if self.table.engine is None:
+            return super().make_decision(**kwargs)
+        bid = bid_from_bet(kwargs["game_prev_bet"])
+        action = self.search(bid, kwargs["is_wild"])
+        self.planned = (bid, action)
+        return "call" if action == CALL else "bet"
+
+    def choose_bet(self, **kwargs):
+        """Return the raise the search visited most, reusing the search of make_decision for the same bet"""
+        if self.table.engine is None:
+            return super().choose_bet(**kwargs)
+        bid = bid_from_bet(kwargs["prev_bet"])
+        if self.planned is not None and self.planned[0] == bid and self.planned[1] != CALL:
+            action = self.planned[1]
+        else:
+            action = self.search(bid, kwargs["is_wild"], allow_call=False)
+        self.planned = None
+        return bet_from_bid(action)
+
+    def observe_new_round(self):
+        """Drop the tree of the last round, the hands were re-rolled"""
+        self._drop_tree()
+
+    def restore_state(self, state, seats):
+        """Drop the tree and the planned action, both belong to the game the player searched before the restore"""
+        self._drop_tree()
+
+    def fork(self, table):
+        """Return a copy of the player at table that starts a tree of its own, a shared one would mix both games"""
+        player = super().fork(table)
+        player._drop_tree()
+        return player
+
+    def _drop_tree(self):
+        """Forget the search tree and the action planned from it"""
+        self.tree = {}
+        self.tree_shape = None
+        self.planned = None
+
+    def iterations_per_sec(self):
+        """Return the iterations per second over all searches so far"""
+        return self.iterations_run / self.search_time if self.search_time else 0.0
+
+    def _seating(self):
+        """Return the dice of every player in the game in turn order, starting with this player"""
+        ring = self.table.engine.ring
+        seat = ring.seat_of[self]
+        dice = [self.num_of_dice]
+        following = ring.next_seat[seat]
+        while following != seat:
+            dice.append(ring.seats[following].num_of_dice)
+            following = ring.next_seat[following]
+        return dice
+
+    def search(self, bid, is_wild, allow_call=True):
+        """Search from an encoded bid with this player to act and return the most visited action"""
+        start = time.perf_counter()
+        dice = self._seating()
+        num_players = len(dice)
+        total_dice = self.table.total_die_count
+        shape = (num_players, total_dice, is_wild)
+        if shape != self.tree_shape:
+            self.tree = {}
+            self.tree_shape = shape
+        rng = np.random.default_rng(self.table.rng.getrandbits(64))
+        worlds = []
+        if self.time_budget is None:
+            deadline = None
+            iterations = self.iterations
+        else:
+            deadline = start + self.time_budget
+            iterations = None
+        done = 0
+        while True:
+            if iterations is not None:
+                if done >= iterations:
+                    break
+            elif done % CLOCK_EVERY == 0 and time.perf_counter() >= deadline:
+                break
+            if not worlds:
+                num_worlds = DETERMINIZATIONS if iterations is None else min(DETERMINIZATIONS, iterations - done)
+                worlds = determinize(rng, self.hand.counts, dice, is_wild, num_worlds)
+            self._iterate(worlds.pop(), bid, num_players, total_dice, is_wild)
+            done += 1
+        root = self.tree.get(bid * num_players)
+        self.searches += 1
+        self.iterations_run += done
+        self.search_time += time.perf_counter() - start
+        actions = candidate_actions(bid, total_dice, is_wild)
+        visits = root[2] if root is not None else [0] * len(actions)
+        best = None
+        for action, action_visits in zip(actions, visits):
+            if action == CALL and not allow_call:
+                continue
+            if best is None or action_visits > best[0]:
+                best = (action_visits, action)
+        if best is None:
+            raise ValueError(f"The bet {bet_from_bid(bid)} can't be raised")
+        return best[1]
+
+    def _iterate(self, world, bid, num_players, total_dice, is_wild):
+        """Run one iteration in a dealt world - select and expand in the tree, play out and update the path"""
+        table_matching, expected = world
+        tree = self.tree
+        position = 0
+        path = []
+        expanded = False
+        loser = None
+        while True:
+            key = bid * num_players + position
+            node = tree.get(key)
+            if node is None:
+                if expanded:
+                    break
+                actions = candidate_actions(bid, total_dice, is_wild)
+                node = tree[key] = [0, actions, [0] * len(actions), [0] * len(actions)]
+                expanded = True
+            node_visits, actions, visits, wins = node
+            if 0 in visits:
+                index = visits.index(0)
+            else:
+                scale = EXPLORATION * math.sqrt(math.log(node_visits))
+                best_score = -1.0
+                for action_index in range(len(actions)):
+                    action_visits = visits[action_index]
+                    score = wins[action_index] / action_visits + scale / math.sqrt(action_visits)
+                    if score > best_score:
+                        best_score = score
+                        index = action_index
+            path.append((node, index, position))
+            action = actions[index]
+            if action == CALL:
+                loser = self._loser(table_matching, bid, position, num_players)
+                break
+            bid = action
+            position = (position + 1) % num_players
+        if loser is None:
+            loser = self._play_out(table_matching, expected, bid, position, num_players, total_dice)
+        for node, index, actor in path:
+            node[0] += 1
+            node[2][index] += 1
+            if actor != loser:
+                node[3][index] += 1
+
+    @staticmethod
+    def _loser(table_matching, bid, caller, num_players):
+        """Return the position losing a die when the player at caller calls bid"""
+        if table_matching[bid >> COUNT_BITS] < bid & COUNT_MASK:
+            return (caller - 1) % num_players
+        return caller
+
+    @classmethod
+    def _play_out(cls, table_matching, expected, bid, position, num_players, total_dice):
+        """Play the round out with every player betting on their best face and calling unlikely bids"""
+        while True:
+            own = expected[position]
+            dice_count, dice_value = bid & COUNT_MASK, bid >> COUNT_BITS
+            if bid != NO_BID and dice_count > own[dice_value] + CALL_MARGIN:
+                return cls._loser(table_matching, bid, position, num_players)
+            best_face = 0
+            best_margin = -total_dice
+            for face in range(max(dice_value, 1), 7):
+                lowest = dice_count + 1 if face == dice_value else 1
+                margin = own[face] - lowest
+                if margin > best_margin:
+                    best_margin = margin
+                    best_face = face
+            lowest = dice_count + 1 if best_face == dice_value else 1
+            raised_count = max(lowest, int(own[best_face]))
+            if raised_count > total_dice:
+                return cls._loser(table_matching, bid, position, num_players)
+            bid = encode_bid(raised_count, best_face)
+            position = (position + 1) % num_players
@@ -1,6 +1,10 @@
+import argparse
 from player import Player
 from npc_player import NPCPlayer
 from game import Game
+from game_log import GameLogWriter
+from instrumentation import Instrumentation, run_profiled
+from pacing import PACING_POLICIES, Pacing
 #from classes import *
 
 BOT_NAMES = [
@@ -17,6 +21,41 @@ BOT_NAMES = [
 ]
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play a game of Liar's dice against NPC players")
+    parser.add_argument(
+        "--seed", type=int, default=None, help="seed of the dice and NPC choices, to replay a game"
+    )
+    parser.add_argument(
+        "--pacing",
+        choices=sorted(PACING_POLICIES),
+        default="realtime",
+        help="realtime pauses like a table game, fast shortens the pauses, none turns them off",
+    )
+    parser.add_argument(
+        "--instrument", action="store_true", help="print the time spent per phase of the game at the end"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="run under cProfile and print the sorted stats at the end"
+    )
+    parser.add_argument(
+        "--log", default=None, help="append every game played to this binary game log"
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    game = Game(BOT_NAMES)
-    game.start_game()
+    args = parse_args()
+    instrumentation = Instrumentation() if args.instrument else None
+    game_log = GameLogWriter(args.log) if args.log is not None else None
+    game = Game(BOT_NAMES, args.seed, Pacing(args.pacing), instrumentation, game_log=game_log)
+    try:
+        if args.profile:
+            run_profiled(game.start_game)
+        else:
+            game.start_game()
+    finally:
+        if game_log is not None:
+            game_log.close()
+    if instrumentation is not None:
+        print(instrumentation.report())
@@ -1,7 +1,115 @@
-import random
-import time
-from scipy.stats import binom
+from functools import lru_cache
 from player import Player
+from bids import bet_from_bid, bid_count, bid_from_bet, bid_value, encode_bid, is_raise
+from decision_cache import DecisionCache
+from odds import bet_probability
+
+# an NPC calls a bet once its odds of being correct drop below this threshold
+CALL_THRESHOLD = 0.3
+# chance of an NPC bluffing with a random face when its preferred bet is not valid
+BLUFF_CHANCE = 0.3
+
+def npc_odds(counts, dice_count, dice_value, total_dice, is_wild):
+    """Return the odds an NPC holding counts gives a bet, rounded to two decimals"""
+    dice_val_count = dice_count - counts[dice_value - 1]
+    if is_wild:
+        dice_val_count += counts[0]
+    return round(bet_probability(dice_val_count, total_dice - sum(counts), is_wild), 2)
+
+
+def npc_decision(counts, dice_count, dice_value, total_dice, is_wild):
+    """Return "call" or "bet" for an NPC holding counts after a bet, from the odds of the bet"""
+    # the highest possible bet can't be raised, so it has to be called
+    if dice_value == 6 and dice_count >= total_dice:
+        return "call"
+    if npc_odds(counts, dice_count, dice_value, total_dice, is_wild) < CALL_THRESHOLD:
+        return "call"
+    return "bet"
+
+
+def npc_preferred_bet(counts, is_wild):
+    """Return the (dice count, face) an NPC holding counts wants to bet, the face it holds most of"""
+    dice_count = dice_value = 0
+    ones = counts[0] if is_wild else 0
+    for face in range(1, 7):
+        freq = counts[face - 1]
+        if freq == 0:
+            continue
+        if face != 1:
+            freq += ones
+        # ties go to the higher face
+        if freq >= dice_count:
+            dice_count = freq
+            dice_value = face
+    return dice_count, dice_value
+
+
+def npc_bet(counts, prev_bid, total_dice, is_wild):
+    """Return the encoded bet an NPC holding counts makes after prev_bid, None when the NPC has to draw one
+
+    An NPC draws a face for a bet on ones in wild ones mode and a random raise when its bet isn't one
+    """
+    dice_count, dice_value = npc_preferred_bet(counts, is_wild)
+    if is_wild and dice_value == 1:
+        return None
+    bid = encode_bid(dice_count, dice_value)
+    return bid if is_raise(bid, prev_bid, total_dice) else None
+
+
+# the NPC's bet or call and its bet per situation - (hand counts, last bet, dice on the table, wild ones) -
+# shared by every NPC of the process; a cached None bet means the NPC draws its bet from the generator
+DECISION_CACHE = DecisionCache(npc_decision)
+BET_CACHE = DecisionCache(npc_bet)
+
+
+def decision_cache_counters():
+    """Return the hits, misses and evictions of the NPC decision and bet caches, named as Instrumentation counters"""
+    return {
+        f"{name}_{counter}": value
+        for name, cache in (("decision_cache", DECISION_CACHE), ("bet_cache", BET_CACHE))
+        for counter, value in cache.counters().items()
+    }
+
+
+# (previous bid, dice on table) situations whose fallback raises are kept before the least recently used one goes
+RAISE_TABLE_CACHE_SIZE = 1 << 12
+
+
+@lru_cache(maxsize=RAISE_TABLE_CACHE_SIZE)
+def npc_raise_table(prev_bid, total_dice):
+    """Return the bids an NPC raises prev_bid to when its preferred bet is not valid, with cumulative probabilities
+
+    The NPC used to draw a bluff or a small raise again and again until it was valid, the table holds the
+    same distribution restricted to the valid bids, so one draw is enough
+    """
+    prev_count, prev_value = bid_count(prev_bid), bid_value(prev_bid)
+    weights = {}
+    # bluff on random - any face from the current one up, with about the same count
+    for dice_value in range(prev_value, 7):
+        for dice_count in range(prev_count - 1, prev_count + 2):
+            weight = BLUFF_CHANCE / (7 - prev_value) / 3
+            _add_raise(weights, dice_count, dice_value, prev_bid, total_dice, weight)
+    # otherwise raise the count of the current face by one or two
+    for dice_count in range(prev_count + 1, prev_count + 3):
+        weight = (1 - BLUFF_CHANCE) / 2
+        _add_raise(weights, dice_count, prev_value, prev_bid, total_dice, weight)
+    bids = tuple(sorted(weights))
+    cum_weights = []
+    total_weight = 0
+    for bid in bids:
+        total_weight += weights[bid]
+        cum_weights.append(total_weight)
+    return bids, tuple(cum_weights)
+
+
+def _add_raise(weights, dice_count, dice_value, prev_bid, total_dice, weight):
+    """Add the weight of a proposed bid if it legally raises prev_bid"""
+    if dice_count < 1 or dice_count > total_dice or dice_value < 1:
+        return
+    bid = encode_bid(dice_count, dice_value)
+    if is_raise(bid, prev_bid, total_dice):
+        weights[bid] = weights.get(bid, 0) + weight
+
 
 class NPCPlayer(Player):
     """
@@ -11,6 +119,9 @@ class NPCPlayer(Player):
     Attributes
     ----------
     The attributes for the class is inherited from the Player class
+    use_decision_cache
+        Class attribute marking if the NPC looks its choices up in DECISION_CACHE and BET_CACHE,
+        subclasses whose choices depend on more than the situation turn it off
 
     Methods
     ---------
@@ -18,65 +129,91 @@ class NPCPlayer(Player):
         Calculates the probability for for a bet to be correct
         based on a NPCs own hand and the number of other dice on the table
     override make_decision
-        The NPC player makes a decision based on odds of the previous bet in the game
+        The NPC player makes a decision based on odds of the previous bet in the game, cached per situation
+    override make_decision_async
+        The NPC decides right away, without waiting on an input provider
+    choose_bet
+        The NPC chooses a bet according to the most common dice in his hand, cached per situation
+        If it is not a valid bet, a random valid one is drawn
     override make_bet
-        The NPC makes a bet according to the most common dice in his hand
-        If it is not a valid bet, it will be increased or randomized until it is valid
+        The NPC announces the bet returned by choose_bet
+    override make_bet_async
+        The NPC bets right away and announces it, pausing without blocking the event loop
     """
 
-    def __init__(self, name):
-        super().__init__(name)
+    __slots__ = ()
+
+    use_decision_cache = True
+
+    def __init__(self, name, table=None, input_provider=None):
+        super().__init__(name, table, input_provider)
         self.is_human = False
 
     def make_decision(self, **kwargs):
         """NPC player chooses when to bet or call based on odds"""
-        odds = self.calc_odds(kwargs["game_prev_bet"], kwargs["is_wild"])
-        # TODO fix magic number 0.3
-        if odds < 0.3:
-            return "call"
-        return "bet"
+        prev_bet = kwargs["game_prev_bet"]
+        decide = DECISION_CACHE.lookup if self.use_decision_cache else npc_decision
+        return decide(
+            self.hand.counts,
+            prev_bet["dice_count"],
+            prev_bet["dice_value"],
+            self.table.total_die_count,
+            kwargs["is_wild"],
+        )
+
+    async def make_decision_async(self, **kwargs):
+        """NPC player decides without waiting on input, see make_decision"""
+        return self.make_decision(**kwargs)
 
     def calc_odds(self, bet, is_wild):
         """Calculate the odds based on the previous bet made"""
-        total_hidden_dice = Player.total_die_count - len(self.hand)
-        dice_val_count = bet["dice_count"] - self.hand.count(bet["dice_value"])
-        if is_wild:
-            dice_val_count += self.hand.count(1)
-            face_possibility = 2 / 6
-        else:
-            face_possibility = 1 / 6
-        if dice_val_count > total_hidden_dice:
-            return 0
-        return round(
-            1 - binom.cdf(dice_val_count - 1, total_hidden_dice, face_possibility), 2
+        return npc_odds(
+            self.hand.counts, bet["dice_count"], bet["dice_value"], self.table.total_die_count, is_wild
         )
 
+    def choose_bet(self, **kwargs):
+        """NPC player to choose a bet based on dice in his hand, if best bet not a valid bet pick a random valid one"""
+        is_wild = kwargs["is_wild"]
+        prev_bid = bid_from_bet(kwargs["prev_bet"])
+        total_dice = self.table.total_die_count
+        choose = BET_CACHE.lookup if self.use_decision_cache else npc_bet
+        bid = choose(self.hand.counts, prev_bid, total_dice, is_wild)
+        if bid is None:
+            bid = self._draw_bet(prev_bid, total_dice, is_wild)
+        return bet_from_bid(bid)
+
+    def _draw_bet(self, prev_bid, total_dice, is_wild):
+        """Draw the face of a bet on ones in wild ones mode, and a random raise if the bet isn't valid"""
+        dice_count, dice_value = npc_preferred_bet(self.hand.counts, is_wild)
+        if is_wild and dice_value == 1:
+            dice_value = self.table.rng.randint(2, 6)
+        bid = encode_bid(dice_count, dice_value)
+        if not is_raise(bid, prev_bid, total_dice):
+            bids, cum_weights = npc_raise_table(prev_bid, total_dice)
+            if not bids:
+                raise ValueError(f"The bet {bet_from_bid(prev_bid)} can't be raised")
+            bid = self.table.rng.choices(bids, cum_weights=cum_weights)[0]
+            if self.table.instrumentation is not None:
+                self.table.instrumentation.count("fallback_raises")
+        return bid
+
     def make_bet(self, **kwargs):
-        """NPC player to make a bet based on dice in his hand, if best bet not a valid bet randomize to a valid one"""
-        new_bet = {"dice_count": 0, "dice_value": 0}
-        freq = 0
-        for i in self.hand:
-            freq = self.hand.count(i)
-            if kwargs["is_wild"] and i != 1:
-                freq += self.hand.count(1)
-            if freq > new_bet["dice_count"]:
-                new_bet["dice_count"] = freq
-                new_bet["dice_value"] = i
-        if kwargs["is_wild"] and new_bet["dice_value"] == 1:
-            new_bet["dice_value"] = random.randint(2, 6)
-        while not self._bet_is_valid(new_bet, kwargs["prev_bet"]):
-            # bluff on random
-            if random.random() < 0.3:
-                new_bet["dice_value"], new_bet["dice_count"] = random.randint(
-                    kwargs["prev_bet"].get("dice_value"), 6
-                ), kwargs["prev_bet"].get("dice_count") + random.randint(-1, 1)
-            else:
-                new_bet["dice_value"], new_bet["dice_count"] = kwargs["prev_bet"].get(
-                    "dice_value"
-                ), kwargs["prev_bet"].get("dice_count") + random.randint(1, 2)
-        print(
+        """NPC player to make a bet and announce it to the table"""
+        new_bet = self.choose_bet(**kwargs)
+        self._announce_bet(new_bet)
+        self.table.pacing.pause(1)
+        return new_bet
+
+    async def make_bet_async(self, **kwargs):
+        """NPC player bets without waiting on input and announces it, the pause lets other games run"""
+        new_bet = self.choose_bet(**kwargs)
+        self._announce_bet(new_bet)
+        await self.table.pacing.pause_async(1)
+        return new_bet
+
+    def _announce_bet(self, new_bet):
+        """Write the bet to the NPC's input provider, the one the game shows the human player the table with"""
+        self.input.write(
             f'{self.name} bets that there is {new_bet["dice_count"]} die with value of'
             f' {new_bet["dice_value"]} on the table'
         )
-        time.sleep(1)
-        return new_bet
@@ -0,0 +1,76 @@
+from math import comb
+
+# survival tables are built once per (hidden dice, wild ones) and reused for every decision
+_SURVIVAL_TABLES = {}
+_BACKENDS = ("exact", "scipy")
+_backend = "exact"
+
+
+def set_backend(name):
+    """Select how the survival tables are built - "exact" integer combinatorics (default) or "scipy" """
+    global _backend
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown odds backend {name!r}, choose one of {_BACKENDS}")
+    _backend = name
+    _SURVIVAL_TABLES.clear()
+
+
+def get_backend():
+    """Return the name of the backend used to build the survival tables"""
+    return _backend
+
+
+def face_probability(is_wild):
+    """Return the probability of a single hidden die matching the bet face"""
+    if is_wild:
+        return 2 / 6
+    return 1 / 6
+
+
+def _exact_survival_table(hidden_dice, is_wild):
+    """Build the survival table from exact integer sums, dividing only once per entry"""
+    matching_faces = 2 if is_wild else 1
+    other_faces = 6 - matching_faces
+    outcomes = 6**hidden_dice
+    # ways[k] is the number of rolls of the hidden dice with exactly k matching dice
+    ways = [
+        comb(hidden_dice, k) * matching_faces**k * other_faces ** (hidden_dice - k)
+        for k in range(hidden_dice + 1)
+    ]
+    table = [0.0] * (hidden_dice + 1)
+    at_least = 0
+    for needed_count in range(hidden_dice, -1, -1):
+        at_least += ways[needed_count]
+        table[needed_count] = at_least / outcomes
+    return tuple(table)
+
+
+def _scipy_survival_table(hidden_dice, is_wild):
+    """Build the survival table with scipy, which is only imported when this backend is selected"""
+    from scipy.stats import binom
+
+    face_possibility = face_probability(is_wild)
+    return tuple(
+        float(1 - binom.cdf(needed_count - 1, hidden_dice, face_possibility))
+        for needed_count in range(hidden_dice + 1)
+    )
+
+
+def survival_table(hidden_dice, is_wild):
+    """Return a tuple holding the probability of at least k matching dice among the hidden dice, for k = 0..hidden_dice"""
+    key = (hidden_dice, is_wild)
+    table = _SURVIVAL_TABLES.get(key)
+    if table is None:
+        if _backend == "scipy":
+            table = _scipy_survival_table(hidden_dice, is_wild)
+        else:
+            table = _exact_survival_table(hidden_dice, is_wild)
+        _SURVIVAL_TABLES[key] = table
+    return table
+
+
+def bet_probability(needed_count, hidden_dice, is_wild):
+    """Return the probability of at least needed_count of the hidden dice matching the bet face"""
+    if needed_count > hidden_dice:
+        return 0
+    return survival_table(hidden_dice, is_wild)[max(needed_count, 0)]
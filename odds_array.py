@@ -0,0 +1,73 @@
+from functools import lru_cache
+import numpy as np
+from bids import COUNT_BITS
+from odds import survival_table
+
+# situations (hand counts, dice on the table, wild ones) whose odds arrays are kept before the least recently used goes
+BID_ODDS_CACHE_SIZE = 1 << 12
+
+# the survival tables of the six faces as one padded array per (hidden dice, wild ones)
+_FACE_SURVIVAL = {}
+
+
+def _face_survival(hidden_dice, is_wild):
+    """Return the survival table of every face as an array [face - 1, needed count], padded with a zero column"""
+    key = (hidden_dice, is_wild)
+    survival = _FACE_SURVIVAL.get(key)
+    if survival is None:
+        survival = np.zeros((6, hidden_dice + 2))
+        survival[:, :-1] = survival_table(hidden_dice, False)
+        if is_wild:
+            # a one counts for the other faces, a bid on ones still needs hidden ones
+            survival[1:, :-1] = survival_table(hidden_dice, True)
+        _FACE_SURVIVAL[key] = survival
+    return survival
+
+
+def bid_odds(counts, total_dice, is_wild):
+    """Return a read-only array [face - 1, count] of the probability of every bid being true, for count = 0..total_dice
+
+    counts holds the dice of the own hand per face, the other dice on the table are hidden. The dice are counted
+    like Engine.count_dice does - in wild ones mode a one counts for every face, so twice for a bid on ones.
+    All faces and counts are looked up in one pass from the survival tables.
+    """
+    return _bid_odds(tuple(counts), total_dice, is_wild)
+
+
+@lru_cache(maxsize=BID_ODDS_CACHE_SIZE)
+def _bid_odds(own, total_dice, is_wild):
+    """Build the odds array of bid_odds for a hand given as a tuple"""
+    hidden_dice = total_dice - sum(own)
+    if hidden_dice < 0:
+        raise ValueError(f"A hand of {sum(own)} dice doesn't fit {total_dice} dice on the table")
+    known = np.array(own)
+    bid_counts = np.arange(total_dice + 1)
+    if is_wild:
+        known[1:] += own[0]
+    needed = bid_counts - known[:, None]
+    if is_wild:
+        # each one counts twice, so a bid on ones needs half its count in ones
+        needed[0] = (bid_counts + 1) // 2 - own[0]
+    np.clip(needed, 0, hidden_dice + 1, out=needed)
+    odds = np.take_along_axis(_face_survival(hidden_dice, is_wild), needed, axis=1)
+    odds.setflags(write=False)
+    return odds
+
+
+def best_raise(odds, prev_bid, min_odds=0.0):
+    """Return the legal raise of prev_bid most likely to be true in a bid_odds array, None if none reaches min_odds
+
+    Ties go to the lower bid, which commits to the least
+    """
+    total_dice = odds.shape[1] - 1
+    faces = np.arange(1, 7)[:, None]
+    bid_counts = np.arange(total_dice + 1)[None, :]
+    bids = (faces << COUNT_BITS) | bid_counts
+    legal = (bids > prev_bid) & (bid_counts >= 1)
+    scores = np.where(legal, odds, -1.0)
+    # rows are faces and columns counts, so the encoded bids ascend in row-major order
+    best = int(scores.argmax())
+    if scores.flat[best] < max(min_odds, 0.0):
+        return None
+    face, count = divmod(best, total_dice + 1)
+    return ((face + 1) << COUNT_BITS) | count
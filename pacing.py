@@ -0,0 +1,64 @@
+import time
+
+# policy name: (scale applied to every delay, print text one character at a time)
+PACING_POLICIES = {
+    "realtime": (1.0, True),
+    "fast": (0.1, False),
+    "none": (0.0, False),
+}
+
+
+class Pacing:
+    """
+    A class used to slow the game down to a human pace, shared by the game and the players at a table
+
+    Attributes
+    ----------
+    policy
+        The name of the pacing policy - "realtime", "fast" or "none"
+    scale
+        The factor every delay is multiplied by, 0 turns delays off
+    typewriter
+        Marks if text written with write_slowly appears one character at a time
+
+    Methods
+    ---------
+    pause
+        Sleep for a delay scaled by the policy
+    pause_async
+        Wait for a delay scaled by the policy without blocking the event loop
+    write_slowly
+        Write a text to an input provider, one character at a time when the typewriter effect is on
+    """
+
+    def __init__(self, policy="realtime"):
+        if policy not in PACING_POLICIES:
+            raise ValueError(f"Unknown pacing policy {policy!r}, choose one of {sorted(PACING_POLICIES)}")
+        self.policy = policy
+        self.scale, self.typewriter = PACING_POLICIES[policy]
+
+    def pause(self, seconds):
+        """Sleep for the given seconds scaled by the policy, return at once when pacing is off"""
+        if self.scale > 0:
+            time.sleep(seconds * self.scale)
+
+    async def pause_async(self, seconds):
+        """Wait for the given seconds scaled by the policy, letting other games run, return at once when pacing is off
+
+        asyncio is only imported once there is a delay, it would add to the start-up time of every game
+        """
+        if self.scale > 0:
+            import asyncio
+
+            await asyncio.sleep(seconds * self.scale)
+
+    async def write_slowly(self, output, text, delay=0.001):
+        """Write text to the input provider output with a delay after each character if the typewriter effect is on,
+        else all at once, awaiting the delays"""
+        if self.typewriter:
+            for char in text:
+                output.write(char, end="")
+                await self.pause_async(delay)
+            output.write("\n\n")
+        else:
+            output.write(text, end="\n\n\n")
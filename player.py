@@ -1,5 +1,8 @@
-import random
-from utils.dice_graphics import DICE_FACES, DICE_HEIGHT
+from bids import bid_from_bet, is_raise
+from hand import Hand
+from input_provider import ConsoleInput, run_now
+from table import Table
+from utils.dice_renderer import render_hand
 
 class Player:
     """
@@ -11,8 +14,14 @@ class Player:
         The name of the player
     num_of_dice
         The number of dice in a players hand
+    hand
+        The Hand holding how many of the players dice show each face
     is_human
         Marks if it is a human controlled player or an NPC
+    table
+        The Table the player sits at, shared with the other players of the same game
+    input
+        The input provider answering the player's prompts and showing them the game - the console, a script or a stream
 
     Methods
     ---------
@@ -20,27 +29,45 @@ class Player:
         Return the name of the player
     dice_roll
         Rolls the dice in a players hand to generate a random hand
+    set_hand
+        Set the hand to dice rolled for the player
     gen_dice_face
-        Print the faces of the dice in a players hand
+        Write the faces of the dice in a players hand to the input provider
     make_decision
         Prompts the player to make a decision to bet or call
+    make_decision_async
+        Prompts the player to bet or call, awaiting the answer from the input provider
     make_bet
         Prompts the player for a dice count and face to make a bet, if bet is valid it is returned
+    make_bet_async
+        Prompts the player for a bet, awaiting the answers from the input provider
     lose_die
         Remove one die from a players hand
+    observe_bid
+        Called after every bet made at the table, players that model their opponents override it
+    observe_new_round
+        Called when the hands are re-rolled for a new round
+    save_state
+        Return what the player learnt during the round, for snapshots of the game
+    restore_state
+        Go back to what save_state returned
+    fork
+        Return a copy of the player sitting at another table
     bet_is_valid
         Check if a bet is valid according to the previous bet in the game
     """
 
-    total_die_count = 0
+    __slots__ = ("name", "num_of_dice", "hand", "is_human", "table", "input")
 
-    def __init__(self, name):
+    def __init__(self, name, table=None, input_provider=None):
         self.name = name
         self.num_of_dice = 5
-        self.hand = []
-        self.dice_roll()
+        self.hand = Hand()
         self.is_human = True
-        Player.total_die_count += self.num_of_dice
+        self.table = table if table is not None else Table()
+        self.input = input_provider if input_provider is not None else ConsoleInput()
+        self.table.add_dice(self.num_of_dice)
+        self.dice_roll()
 
     def get_name(self):
         """Return a players name"""
@@ -48,39 +75,32 @@ class Player:
 
     def dice_roll(self):
         """Roll the dice in a players hand"""
-        roll_results = []
-        for _ in range(self.num_of_dice):
-            roll = random.randint(1, 6)
-            roll_results.append(roll)
-        self.hand = roll_results
+        self.hand = Hand.from_faces(self.table.roll(self.num_of_dice))
+
+    def set_hand(self, faces):
+        """Set the hand to dice rolled for the player, used when the whole table is rolled at once"""
+        self.hand = Hand.from_faces(faces)
 
     def gen_dice_faces(self):
-        """Generate graphics for the dice in a players hand"""
-        dice_faces = []
+        """Generate graphics for the dice in a players hand, written to the input provider in one go"""
         if len(self.hand) < 1:
-            print(f"Player {self.name} has no die left")
+            self.input.write(f"Player {self.name} has no die left")
         else:
-            for val in self.hand:
-                dice_faces.append(DICE_FACES[val])
-            dice_faces_rows = []
-            for row_idx in range(DICE_HEIGHT):
-                row_string = ""
-                for die in dice_faces:
-                    row_string = row_string + " " + die[row_idx]
-                dice_faces_rows.append(row_string)
-
-            for row in dice_faces_rows:
-                print(f"{row}")
+            self.input.write(render_hand(self.hand), end="")
 
     def make_decision(self, **kwargs):
         """Prompt the player to make a decision whether to bet or call"""
-        print(
+        return run_now(self.make_decision_async(**kwargs))
+
+    async def make_decision_async(self, **kwargs):
+        """Prompt the player to make a decision whether to bet or call, awaiting the answer"""
+        self.input.write(
             f'Last bet was {kwargs["game_prev_bet"].get("dice_count")} dice of the value'
             f' {kwargs["game_prev_bet"].get("dice_value")}'
         )
-        print("Your hand is:")
+        self.input.write("Your hand is:")
         self.gen_dice_faces()
-        action = input("Enter [b] to bet, or [c] to call: ")
+        action = await self.input.read_line("Enter [b] to bet, or [c] to call: ")
         if action == "b":
             return "bet"
         if action == "c":
@@ -89,20 +109,52 @@ class Player:
     def lose_die(self):
         """Remove one die from a players hand, to be used when he make a wrong call or his bluff is called"""
         if len(self.hand) > 0:
-            self.hand.pop()
+            self.hand.lose_die()
             self.num_of_dice -= 1
-            Player.total_die_count -= 1
+            self.table.remove_die()
+            if self.num_of_dice == 0:
+                self.table.remove_player()
+
+    def observe_bid(self, bidder, bid, is_wild):
+        """See the encoded bid made by bidder, the base player ignores it"""
+
+    def observe_new_round(self):
+        """Learn that all hands were re-rolled, the base player ignores it"""
+
+    def save_state(self, seat_of):
+        """Return an immutable value of what the player learnt this round, referring to players by their seat in seat_of
+
+        None as the base player learns nothing
+        """
+        return None
+
+    def restore_state(self, state, seats):
+        """Go back to a value returned by save_state, seats lists the players by seat"""
+
+    def fork(self, table):
+        """Return a shallow copy of the player sitting at table, the table is not told about its dice"""
+        player = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(self, slot):
+                    setattr(player, slot, getattr(self, slot))
+        player.table = table
+        return player
 
     def make_bet(self, **kwargs):
         """Prompt player to make a bet, and return it once a valid one is made"""
+        return run_now(self.make_bet_async(**kwargs))
+
+    async def make_bet_async(self, **kwargs):
+        """Prompt player to make a bet, awaiting the answers, and return it once a valid one is made"""
         new_bet = {"dice_count": 0, "dice_value": 0}
-        print("Place your bet.")
+        self.input.write("Place your bet.")
         while True:
             try:
-                new_bet["dice_value"] = int(input("Enter Value of die: "))
-                new_bet["dice_count"] = int(input("Enter Number of die: "))
+                new_bet["dice_value"] = int(await self.input.read_line("Enter Value of die: "))
+                new_bet["dice_count"] = int(await self.input.read_line("Enter Number of die: "))
             except ValueError:
-                print("The entered value is a not an integer. Try again")
+                self.input.write("The entered value is a not an integer. Try again")
                 continue
             else:
                 if self._bet_is_valid(new_bet, kwargs["prev_bet"]):
@@ -113,21 +165,20 @@ class Player:
         new = "\n"
         if (
             not 1 <= new_bet["dice_value"] <= 6
-            or not 1 <= new_bet["dice_count"] <= Player.total_die_count
+            or not 1 <= new_bet["dice_count"] <= self.table.total_die_count
         ):
             if self.__class__.__name__ == "Player":
-                print(
+                self.input.write(
                     f"You can't bet using a die value higher than 6 {new}"
-                    f"or a die count larger than the number of die on the table {Player.total_die_count} {new}"
+                    f"or a die count larger than the number of die on the table {self.table.total_die_count} {new}"
                     f'Your bet was: {new_bet["dice_count"]} die with the value of {new_bet["dice_value"]} {new}'
                 )
             return False
-        if (
-            new_bet["dice_count"] <= prev_bet["dice_count"]
-            and not new_bet["dice_value"] > prev_bet["dice_value"]
-        ) or (new_bet["dice_value"] < prev_bet["dice_value"]):
+        if not is_raise(
+            bid_from_bet(new_bet), bid_from_bet(prev_bet), self.table.total_die_count
+        ):
             if self.__class__.__name__ == "Player":
-                print(
+                self.input.write(
                     f"You must place a bet with either a higher count of the current face or any count of a higher face {new}"
                     f'Your current bet was {new_bet["dice_count"]} die with the value of {new_bet["dice_value"]} {new}'
                     f'while the previous bet is {prev_bet["dice_count"]} of die with value of {prev_bet["dice_value"]} {new}'
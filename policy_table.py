@@ -0,0 +1,147 @@
+import argparse
+import struct
+import numpy as np
+from cfr import DEFAULT_STRATEGY, bid_state, info_set_index
+from hand import hand_index
+
+DEFAULT_POLICY_TABLE = "cfr_policy.bin"
+MAGIC = b"LDPT"
+VERSION = 1
+# magic, version, flags (bit 0 marks wild ones), max dice, number of sections
+HEADER = struct.Struct("<4sHHHH")
+# own dice, opponent dice, hands, states (also the number of actions), offset of the first record
+SECTION = struct.Struct("<HHIIQ")
+# every section starts on a cache line, so records never share one with the directory
+ALIGNMENT = 64
+RECORD_DTYPE = np.dtype("<f4")
+
+# policy tables opened per file, shared by every MappedStrategyNPCPlayer of the process
+_POLICY_TABLES = {}
+
+
+def write_policy_table(path, strategies, max_dice, wild_ones):
+    """Write strategies - dict of (own dice, opponent dice) -> array [hand, state, action] - as a policy table file
+
+    The file holds a header, a directory of sections and, per pair of dice counts, one fixed-width record
+    of float32 action probabilities per information set, in info_set_index order
+    """
+    sections = sorted(strategies)
+    offset = HEADER.size + SECTION.size * len(sections)
+    directory = []
+    for key in sections:
+        num_hands, num_states, _ = strategies[key].shape
+        offset += -offset % ALIGNMENT
+        directory.append((key, num_hands, num_states, offset))
+        offset += num_hands * num_states * num_states * RECORD_DTYPE.itemsize
+    with open(path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, int(wild_ones), max_dice, len(sections)))
+        for (own_dice, opponent_dice), num_hands, num_states, offset in directory:
+            output.write(SECTION.pack(own_dice, opponent_dice, num_hands, num_states, offset))
+        for key, num_hands, num_states, offset in directory:
+            output.write(b"\0" * (offset - output.tell()))
+            records = strategies[key].reshape(num_hands * num_states, num_states)
+            output.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+
+
+class MappedPolicyTable:
+    """
+    A class to read a policy table file through numpy.memmap
+    Only the header and the directory are read when the file is opened, records are paged in by the OS on
+    first use and the pages are shared by every process mapping the same file
+
+    Attributes
+    ----------
+    path
+        The path of the policy table file
+    wild_ones
+        Marks if the policies were solved with wild ones
+    max_dice
+        The largest number of dice of either player covered by the policies
+    sections
+        Dict of (own dice, opponent dice) -> (view of the mapped records [info set, action], number of states)
+
+    Methods
+    ---------
+    policy
+        Return the action probabilities of an information set, None if it is not covered
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as source:
+            magic, version, flags, self.max_dice, num_sections = HEADER.unpack(
+                source.read(HEADER.size)
+            )
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} policy table")
+            directory = [
+                SECTION.unpack(source.read(SECTION.size)) for _ in range(num_sections)
+            ]
+        self.wild_ones = bool(flags & 1)
+        # the whole file is mapped once, every section is a view of the mapping
+        mapping = np.memmap(path, dtype=np.uint8, mode="r")
+        self.sections = {}
+        for own_dice, opponent_dice, num_hands, num_states, offset in directory:
+            records = np.ndarray(
+                (num_hands * num_states, num_states),
+                dtype=RECORD_DTYPE,
+                buffer=mapping,
+                offset=offset,
+            )
+            self.sections[own_dice, opponent_dice] = (records, num_states)
+
+    def policy(self, counts, opponent_dice, bid, is_wild):
+        """Return the action probabilities for a hand facing bid against opponent_dice dice, None if not covered"""
+        if is_wild != self.wild_ones:
+            return None
+        own_dice = sum(counts)
+        section = self.sections.get((own_dice, opponent_dice))
+        if section is None:
+            return None
+        records, num_states = section
+        state = bid_state(bid, own_dice + opponent_dice)
+        return records[info_set_index(hand_index(counts), state, num_states)]
+
+
+def open_policy_table(path=DEFAULT_POLICY_TABLE):
+    """Return the MappedPolicyTable of a file, opened once per process"""
+    table = _POLICY_TABLES.get(path)
+    if table is None:
+        try:
+            table = MappedPolicyTable(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"No policy table at {path}, build one with: python policy_table.py --output {path}"
+            ) from None
+        _POLICY_TABLES[path] = table
+    return table
+
+
+def convert(strategy_path, policy_path):
+    """Convert a strategy file exported by the CFR solver into a policy table file"""
+    with np.load(strategy_path) as data:
+        strategies = {}
+        for name in data.files:
+            if name.startswith("strategy_"):
+                own_dice, opponent_dice = name[len("strategy_") :].split("_")
+                strategies[int(own_dice), int(opponent_dice)] = data[name]
+        write_policy_table(policy_path, strategies, int(data["max_dice"]), bool(data["wild_ones"]))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert a CFR strategy file into a memory-mapped policy table"
+    )
+    parser.add_argument("--strategy", default=DEFAULT_STRATEGY, help="strategy file to convert")
+    parser.add_argument("--output", default=DEFAULT_POLICY_TABLE, help="policy table to write")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    convert(args.strategy, args.output)
+    print(f"Policy table written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+from game import Game
+from input_provider import StreamInput
+from main import BOT_NAMES
+from pacing import PACING_POLICIES, Pacing
+
+DEFAULT_PORT = 7777
+# seconds a player has to answer a prompt of the game before the server closes their table
+DEFAULT_TURN_TIMEOUT = 30.0
+# seconds a new connection has to send its JOIN line
+JOIN_TIMEOUT = 10.0
+# seeds between the first games of two tables of a seeded server, a table's later games take the seeds in between
+SEEDS_PER_TABLE = 1000
+
+
+def join_error(name):
+    """Return why a JOIN name can't be seated, None for a valid name
+
+    The Game would ask again for an empty name or one of the bot names, and names are kept free of commas so a
+    table's players can be listed comma separated
+    """
+    if not name:
+        return "a name can't be empty"
+    if "," in name:
+        return "a name can't hold a comma"
+    if name in BOT_NAMES:
+        return f"the name {name} is taken by a bot, the bots are {','.join(BOT_NAMES)}"
+    return None
+
+
+class GameServer:
+    """
+    A class to host many tables of Liar's dice in one process with asyncio
+    Every connection plays a Game of its own against bots_per_table NPC players, Game.play reads the player's answers
+    from a StreamInput over the connection, so a table waiting on its player only suspends its own coroutine
+
+    Protocol, one line per message:
+        client: JOIN <name>      server: ERROR <reason> and closes for an empty name, a comma or a bot's name
+    After a valid JOIN the connection plays the console game - the server sends the text of the game and its
+    prompts, which end without a line break, and the client answers every prompt with a line. The name, number of
+    bots and wild ones prompts of the first game are answered by the server from the JOIN and its options and sent
+    along with the answers. A client that doesn't answer within the timeout gets TIMEOUT and its table is closed.
+    The connection is closed once the client answers n to playing another game.
+
+    Attributes
+    ----------
+    host, port
+        The address the server listens on
+    bots_per_table
+        The number of NPC players seated at every table
+    wild_ones
+        Marks if the tables play with wild ones
+    turn_timeout
+        Seconds a player has to answer a prompt before the server closes their table
+    pacing
+        The Pacing policy of the tables, the bots and the reveals pause without blocking the loop
+    seed
+        Seed of the tables, table n plays its first game from seed + n * SEEDS_PER_TABLE, None for unseeded tables
+    tables_started, tables_finished
+        Counters of the tables opened and the tables whose player quit after a finished game
+
+    Methods
+    ---------
+    start
+        Start listening for connections
+    serve_forever
+        Start the server and serve until cancelled
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=DEFAULT_PORT,
+        bots_per_table=3,
+        wild_ones=False,
+        turn_timeout=DEFAULT_TURN_TIMEOUT,
+        pacing="none",
+        seed=None,
+    ):
+        if not 1 <= bots_per_table <= 5:
+            raise ValueError("A table seats between 1 and 5 bots, like the console game")
+        self.host = host
+        self.port = port
+        self.bots_per_table = bots_per_table
+        self.wild_ones = wild_ones
+        self.turn_timeout = turn_timeout
+        self.pacing = Pacing(pacing)
+        self.seed = seed
+        self.tables_started = 0
+        self.tables_finished = 0
+        self._server = None
+
+    async def start(self):
+        """Start listening, the returned asyncio Server is also kept on the GameServer"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        return self._server
+
+    async def serve_forever(self):
+        """Start the server if needed and serve connections until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(self, reader, writer):
+        """Read the JOIN line of a new connection and play its games until the player quits"""
+        try:
+            line = await asyncio.wait_for(reader.readline(), JOIN_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+        words = line.decode(errors="replace").strip().split(maxsplit=1)
+        if not words or words[0] != "JOIN":
+            error = "the first line must be JOIN <name>"
+        else:
+            error = join_error(words[1] if len(words) == 2 else "")
+        if error is not None:
+            writer.write(f"ERROR {error}\n".encode())
+            writer.close()
+            return
+        await self._play_table(words[1], reader, writer)
+
+    async def _play_table(self, name, reader, writer):
+        """Play the Game of a joined player over their connection, then close it"""
+        answers = (name, str(self.bots_per_table), "y" if self.wild_ones else "n")
+        provider = StreamInput(reader, writer, answers, self.turn_timeout)
+        seed = None if self.seed is None else self.seed + self.tables_started * SEEDS_PER_TABLE
+        game = Game(BOT_NAMES, seed, self.pacing, input_provider=provider)
+        self.tables_started += 1
+        try:
+            await game.play()
+            self.tables_finished += 1
+            await writer.drain()
+        except asyncio.TimeoutError:
+            writer.write(b"TIMEOUT\n")
+        except (EOFError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Host tables of Liar's dice over a line-based TCP protocol")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument("--bots", type=int, default=3, help="NPC players seated at every table")
+    parser.add_argument("--wild", action="store_true", help="play with wild ones")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TURN_TIMEOUT,
+        help="seconds a player has to answer before the server closes their table",
+    )
+    parser.add_argument(
+        "--pacing",
+        choices=sorted(PACING_POLICIES),
+        default="none",
+        help="pauses of the bots and the reveals, they don't block the other tables",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="seed of the tables")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = GameServer(args.host, args.port, args.bots, args.wild, args.timeout, args.pacing, args.seed)
+
+    async def serve():
+        await server.start()
+        print(f"Listening on {args.host}:{args.port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    print(f"Tables started: {server.tables_started}, tables finished: {server.tables_finished}")
+
+
+if __name__ == "__main__":
+    main()
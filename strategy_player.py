@@ -0,0 +1,142 @@
+import numpy as np
+from bids import bet_from_bid, bid_from_bet, legal_bids
+from cfr import CALL, DEFAULT_STRATEGY, bid_state
+from hand import hand_index
+from npc_player import NPCPlayer
+from policy_table import DEFAULT_POLICY_TABLE, open_policy_table
+
+# strategy tables loaded per file, shared by every StrategyNPCPlayer of the process
+_STRATEGIES = {}
+
+
+class StrategyTable:
+    """
+    A class to hold the average strategies exported by the CFR solver
+
+    Attributes
+    ----------
+    wild_ones
+        Marks if the strategies were solved with wild ones
+    max_dice
+        The largest number of dice of either player covered by the strategies
+    strategies
+        Dict of (own dice, opponent dice) -> array [hand, state, action] of action probabilities
+
+    Methods
+    ---------
+    policy
+        Return the action probabilities of an information set, None if it is not covered
+    """
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.wild_ones = bool(data["wild_ones"])
+            self.max_dice = int(data["max_dice"])
+            self.strategies = {}
+            for name in data.files:
+                if name.startswith("strategy_"):
+                    own_dice, opponent_dice = name[len("strategy_") :].split("_")
+                    self.strategies[int(own_dice), int(opponent_dice)] = data[name]
+
+    def policy(self, counts, opponent_dice, bid, is_wild):
+        """Return the action probabilities for a hand facing bid against opponent_dice dice, None if not covered"""
+        if is_wild != self.wild_ones:
+            return None
+        own_dice = sum(counts)
+        strategy = self.strategies.get((own_dice, opponent_dice))
+        if strategy is None:
+            return None
+        return strategy[hand_index(counts), bid_state(bid, own_dice + opponent_dice)]
+
+
+def load_strategy(path=DEFAULT_STRATEGY):
+    """Return the StrategyTable of a file exported by the CFR solver, loaded once per process"""
+    strategy = _STRATEGIES.get(path)
+    if strategy is None:
+        try:
+            strategy = StrategyTable(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"No strategy table at {path}, build one with: python cfr.py --output {path}"
+            ) from None
+        _STRATEGIES[path] = strategy
+    return strategy
+
+
+class StrategyNPCPlayer(NPCPlayer):
+    """
+    A class used to represent an NPC player that plays the strategy solved by the CFR solver
+    The strategy covers two player rounds with few dice, in any other round it plays like an NPCPlayer
+
+    Attributes
+    ----------
+    strategy
+        The StrategyTable the player reads its action probabilities from
+
+    Methods
+    ---------
+    override make_decision
+        Call with the probability the strategy gives to calling the last bet
+    override choose_bet
+        Draw a raise with the probabilities the strategy gives to the raises
+    """
+
+    __slots__ = ("strategy",)
+
+    def __init__(self, name, table=None, input_provider=None, strategy_path=DEFAULT_STRATEGY):
+        super().__init__(name, table, input_provider)
+        self.strategy = self._load_strategy(strategy_path)
+
+    def _load_strategy(self, path):
+        """Return the strategy table stored at path"""
+        return load_strategy(path)
+
+    def _policy(self, bet, is_wild):
+        """Return the action probabilities of the current round, None if the strategy doesn't cover it"""
+        if self.table.num_players != 2:
+            return None
+        opponent_dice = self.table.total_die_count - len(self.hand)
+        return self.strategy.policy(self.hand.counts, opponent_dice, bid_from_bet(bet), is_wild)
+
+    def make_decision(self, **kwargs):
+        """Call the last bet with the probability the strategy gives it"""
+        policy = self._policy(kwargs["game_prev_bet"], kwargs["is_wild"])
+        if policy is None:
+            return super().make_decision(**kwargs)
+        if self.table.rng.random() < policy[CALL]:
+            return "call"
+        return "bet"
+
+    def choose_bet(self, **kwargs):
+        """Draw one of the raises of the last bet in proportion to the probabilities the strategy gives them"""
+        policy = self._policy(kwargs["prev_bet"], kwargs["is_wild"])
+        if policy is None or policy[CALL + 1 :].sum() <= 0:
+            return super().choose_bet(**kwargs)
+        bids = legal_bids(self.table.total_die_count)
+        bid = self.table.rng.choices(bids, weights=policy[CALL + 1 :].tolist())[0]
+        return bet_from_bid(bid)
+
+
+class MappedStrategyNPCPlayer(StrategyNPCPlayer):
+    """
+    A class used to represent an NPC player that plays the CFR strategy from a memory-mapped policy table
+    Opening the table only reads its directory, so start-up time doesn't grow with the size of the table
+
+    Attributes
+    ----------
+    The attributes for the class is inherited from the StrategyNPCPlayer class
+
+    Methods
+    ---------
+    override _load_strategy
+        Open the policy table file with numpy.memmap
+    """
+
+    __slots__ = ()
+
+    def __init__(self, name, table=None, input_provider=None, strategy_path=DEFAULT_POLICY_TABLE):
+        super().__init__(name, table, input_provider, strategy_path)
+
+    def _load_strategy(self, path):
+        """Return the MappedPolicyTable of the file at path"""
+        return open_policy_table(path)
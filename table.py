@@ -0,0 +1,69 @@
+import random
+from pacing import Pacing
+
+FACES = (1, 2, 3, 4, 5, 6)
+
+
+class Table:
+    """
+    A class used to hold the state shared by all players sitting at one table of 'liars' dice' game
+    Every game gets its own table, so several games can run in one process without affecting each other
+
+    Attributes
+    ----------
+    total_die_count
+        The number of dice on the table, across all players' hands
+    num_players
+        The number of players at the table still holding dice
+    seed
+        The seed of the table's random generator, the same seed replays the same game
+    rng
+        The random.Random used for every dice roll and random choice made at the table
+    pacing
+        The Pacing deciding how long the game and the players pause when printing to the console
+    instrumentation
+        The Instrumentation recording timings and counters of the game, None when turned off
+    game_log
+        The GameLogWriter recording the bids and calls of the games at the table, None when turned off
+    engine
+        The Engine running the game at the table, None before one starts - search bots read the turn order
+        and the dice of every player from it
+
+    Methods
+    ---------
+    add_dice
+        Add the dice of a player joining the table
+    remove_die
+        Remove a die lost by one of the players
+    remove_player
+        Remove a player who lost their last die
+    roll
+        Roll a number of dice in a single call of the generator
+    """
+
+    def __init__(self, seed=None, pacing=None, instrumentation=None, game_log=None):
+        self.total_die_count = 0
+        self.num_players = 0
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.pacing = pacing if pacing is not None else Pacing()
+        self.instrumentation = instrumentation
+        self.game_log = game_log
+        self.engine = None
+
+    def add_dice(self, num_of_dice):
+        """Add the dice of a player sitting down at the table"""
+        self.total_die_count += num_of_dice
+        self.num_players += 1
+
+    def remove_die(self):
+        """Remove a die lost by one of the players from the table"""
+        self.total_die_count -= 1
+
+    def remove_player(self):
+        """Remove a player who lost their last die from the table"""
+        self.num_players -= 1
+
+    def roll(self, num_of_dice):
+        """Return a list of num_of_dice rolled dice, drawn in one call of the generator"""
+        return self.rng.choices(FACES, k=num_of_dice)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from batch import DICE_PER_PLAYER, BatchSimulator
+from bids import bid_count, bid_value, encode_bid, is_raise
+from engine import Engine
+from npc_player import NPCPlayer, npc_bet, npc_decision
+from table import Table
+
+
+def played_simulator(wild_ones, steps, num_tables=400, num_players=4):
+    """Return a seeded simulator after a few steps, so its tables hold bets and lost dice"""
+    simulator = BatchSimulator(num_tables, num_players, wild_ones, np.random.default_rng(7))
+    for _ in range(steps):
+        simulator.step()
+    return simulator
+
+
+def hand_counts(simulator, table, seat):
+    """Return the face counts of a hand as the tuple an NPCPlayer's hand holds"""
+    return tuple(simulator.face_counts[table, seat, 1:].tolist())
+
+
+@pytest.mark.parametrize("wild_ones", [False, True])
+def test_batch_counts_called_dice_like_the_engine(wild_ones):
+    simulator = played_simulator(wild_ones, 6)
+    tables = np.nonzero((simulator.bet_count > 0) & ~simulator.done)[0]
+    expected = []
+    for table in tables:
+        seated = Table(0)
+        players = [NPCPlayer(f"Bot {seat}", seated) for seat in range(simulator.num_players)]
+        for seat, player in enumerate(players):
+            dice = simulator.dice_counts[table, seat]
+            player.set_hand(simulator.hands[table, seat, :dice].tolist())
+        dice_total = Engine(players, wild_ones).count_dice(simulator.bet_value[table])
+        called_correctly = dice_total < simulator.bet_count[table]
+        expected.append(simulator.previous[table] if called_correctly else simulator.current[table])
+    assert simulator._resolve_calls(tables).tolist() == expected
+
+
+@pytest.mark.parametrize("wild_ones", [False, True])
+def test_batch_decides_and_bets_like_the_npc(wild_ones):
+    simulator = played_simulator(wild_ones, 5)
+    tables = np.nonzero(~simulator.done)[0]
+    situations = []
+    for table in tables:
+        seat = simulator.current[table]
+        situations.append(
+            (
+                hand_counts(simulator, table, seat),
+                int(simulator.bet_count[table]),
+                int(simulator.bet_value[table]),
+                int(simulator.dice_counts[table].sum()),
+            )
+        )
+    rounds = simulator.rounds.copy()
+    simulator.step()
+    for table, (counts, dice_count, dice_value, total_dice) in zip(tables, situations):
+        called = simulator.rounds[table] > rounds[table]
+        if dice_count == 0:
+            assert not called
+            continue
+        assert called == (npc_decision(counts, dice_count, dice_value, total_dice, wild_ones) == "call")
+        if called:
+            continue
+        prev_bid = encode_bid(dice_count, dice_value)
+        bid = encode_bid(int(simulator.bet_count[table]), int(simulator.bet_value[table]))
+        assert is_raise(bid, prev_bid, total_dice)
+        preferred = npc_bet(counts, prev_bid, total_dice, wild_ones)
+        if preferred is not None:
+            assert (bid_count(bid), bid_value(bid)) == (bid_count(preferred), bid_value(preferred))
+
+
+def test_batch_runs_every_table_to_a_winner():
+    simulator = BatchSimulator(300, 5, rng=np.random.default_rng(3))
+    result = simulator.run()
+    winners = simulator.dice_counts[np.arange(300), result.winners]
+    assert ((simulator.dice_counts > 0).sum(axis=1) == 1).all()
+    # every round takes one die off the table
+    assert (result.rounds == 5 * DICE_PER_PLAYER - winners).all()
+    assert (result.bets >= result.rounds).all()
@@ -0,0 +1,35 @@
+import random
+import numpy as np
+import pytest
+from bayesian_player import BayesianNPCPlayer, posterior
+from bids import encode_bid
+from npc_player import NPCPlayer
+from table import Table
+
+
+def matching_from_scratch(player, face, is_wild):
+    """Convolve the posteriors of every opponent that bid, as the player did on every decision before"""
+    matching = np.ones(1)
+    for bidder, seen in player.bids_seen.items():
+        matching = np.convolve(matching, posterior(bidder.num_of_dice, face, is_wild, seen))
+    return matching
+
+
+@pytest.mark.parametrize("is_wild", [False, True])
+def test_kept_distributions_follow_every_bid(is_wild):
+    rng = random.Random(4)
+    table = Table(4)
+    bayes = BayesianNPCPlayer("Bayes", table)
+    opponents = [NPCPlayer(f"Bot {seat}", table) for seat in range(5)]
+    for bid_number in range(200):
+        if bid_number % 40 == 0:
+            bayes.observe_new_round()
+        bidder = rng.choice(opponents[: rng.randint(1, 5)])
+        bayes.observe_bid(bidder, encode_bid(rng.randint(1, 9), rng.randint(1, 6)), is_wild)
+        face = rng.randint(1, 6)
+        assert np.allclose(bayes._known_matching(face, is_wild), matching_from_scratch(bayes, face, is_wild))
+    fork = bayes.fork(Table(5))
+    fork.observe_bid(opponents[0], encode_bid(3, 2), is_wild)
+    for face in range(1, 7):
+        assert np.allclose(bayes._known_matching(face, is_wild), matching_from_scratch(bayes, face, is_wild))
+        assert np.allclose(fork._known_matching(face, is_wild), matching_from_scratch(fork, face, is_wild))
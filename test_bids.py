@@ -0,0 +1,59 @@
+import itertools
+import pytest
+from bids import NO_BID, bet_from_bid, bid_from_bet, encode_bid, is_raise, legal_bids, legal_raises
+from npc_player import RAISE_TABLE_CACHE_SIZE, npc_raise_table
+
+
+def original_bet_is_valid(new_bet, prev_bet, total_dice):
+    """The raise rule of Player._bet_is_valid before bids were encoded as integers"""
+    if not 1 <= new_bet["dice_value"] <= 6 or not 1 <= new_bet["dice_count"] <= total_dice:
+        return False
+    if (
+        new_bet["dice_count"] <= prev_bet["dice_count"]
+        and not new_bet["dice_value"] > prev_bet["dice_value"]
+    ) or (new_bet["dice_value"] < prev_bet["dice_value"]):
+        return False
+    return True
+
+
+@pytest.mark.parametrize("total_dice", [2, 7, 12])
+def test_is_raise_follows_the_original_rule(total_dice):
+    counts = range(0, total_dice + 2)
+    values = range(0, 8)
+    previous = [(0, 0)] + [(count, value) for count in range(1, total_dice + 1) for value in range(1, 7)]
+    for prev_count, prev_value in previous:
+        prev_bet = {"dice_count": prev_count, "dice_value": prev_value}
+        prev_bid = encode_bid(prev_count, prev_value)
+        for count, value in itertools.product(counts, values):
+            new_bet = {"dice_count": count, "dice_value": value}
+            expected = original_bet_is_valid(new_bet, prev_bet, total_dice)
+            assert is_raise(encode_bid(count, value), prev_bid, total_dice) == expected, (new_bet, prev_bet)
+
+
+def test_bids_round_trip_up_to_the_widest_count():
+    for count, value in ((1, 1), (255, 6), (256, 3), (65535, 6)):
+        bet = {"dice_count": count, "dice_value": value}
+        assert bet_from_bid(bid_from_bet(bet)) == bet
+    with pytest.raises(ValueError):
+        encode_bid(65536, 1)
+
+
+def test_legal_raises_are_the_legal_bids_above_the_bid():
+    for total_dice in (1, 5, 30):
+        bids = legal_bids(total_dice)
+        assert len(bids) == 6 * total_dice
+        for prev_bid in (NO_BID,) + bids:
+            assert legal_raises(prev_bid, total_dice) == tuple(
+                bid for bid in bids if is_raise(bid, prev_bid, total_dice)
+            )
+
+
+def test_raise_checks_on_large_tables_build_no_tables():
+    legal_bids.cache_clear()
+    for total_dice in range(1000, 1250):
+        assert is_raise(encode_bid(total_dice, 2), encode_bid(total_dice, 1), total_dice)
+        assert not is_raise(encode_bid(total_dice + 1, 2), encode_bid(total_dice, 1), total_dice)
+    assert legal_bids.cache_info().currsize == 0
+    for total_dice in range(1000, 1250):
+        npc_raise_table(encode_bid(total_dice // 2, 3), total_dice)
+    assert npc_raise_table.cache_info().currsize <= RAISE_TABLE_CACHE_SIZE
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from bids import bid_count, bid_from_bet, bid_value, legal_bids
+from cfr import CFRSolver, RoundGame
+from hand import Hand, all_hands
+from policy_table import convert
+from strategy_player import MappedStrategyNPCPlayer, StrategyTable
+from table import Table
+
+
+@pytest.mark.parametrize("wild_ones", [False, True])
+def test_round_truth_counts_dice_like_the_engine(wild_ones):
+    game = RoundGame((2, 1), wild_ones)
+    bids = legal_bids(3)
+    for first, first_hand in enumerate(all_hands(2)):
+        for second, second_hand in enumerate(all_hands(1)):
+            for state, bid in enumerate(bids, start=1):
+                face, count = bid_value(bid), bid_count(bid)
+                matching = 0
+                for hand in (Hand(first_hand), Hand(second_hand)):
+                    matching += hand.count(face) + (hand.count(1) if wild_ones else 0)
+                assert game.truth[state, first, second] == (matching >= count)
+
+
+@pytest.mark.parametrize("wild_ones", [False, True])
+def test_exported_strategy_plays_from_the_policy_table(tmp_path, wild_ones):
+    solver = CFRSolver(max_dice=2, wild_ones=wild_ones)
+    for _ in range(20):
+        solver.iterate()
+    strategy_path = str(tmp_path / "strategy.npz")
+    policy_path = str(tmp_path / "policy.bin")
+    solver.export(strategy_path)
+    convert(strategy_path, policy_path)
+
+    strategy = StrategyTable(strategy_path)
+    table = Table(9)
+    player = MappedStrategyNPCPlayer("Mapped", table, strategy_path=policy_path)
+    opponent = MappedStrategyNPCPlayer("Other", table, strategy_path=policy_path)
+    mapped = player.strategy
+    assert mapped.wild_ones == wild_ones and mapped.max_dice == 2
+    for key, arrays in strategy.strategies.items():
+        own_dice, opponent_dice = key
+        num_states = arrays.shape[1]
+        for hand in all_hands(own_dice):
+            for state, bid in enumerate((0,) + legal_bids(own_dice + opponent_dice)):
+                expected = arrays[all_hands(own_dice).index(hand), state]
+                assert np.array_equal(mapped.policy(hand, opponent_dice, bid, wild_ones), expected)
+                assert expected.shape == (num_states,)
+
+    # two players down to two dice each play their rounds from the table
+    for seat in (player, opponent):
+        for _ in range(3):
+            seat.lose_die()
+    bet = player.choose_bet(prev_bet={"dice_count": 0, "dice_value": 0}, is_wild=wild_ones)
+    policy = strategy.policy(player.hand.counts, 2, 0, wild_ones)
+    assert policy[1 + legal_bids(4).index(bid_from_bet(bet))] > 0
@@ -0,0 +1,35 @@
+from decision_cache import DecisionCache
+from npc_player import BET_CACHE, DECISION_CACHE, NPCPlayer, decision_cache_counters
+from test_engine import outcome, seat_npcs
+from tournament import play_chunk, seat_bots
+
+
+def test_decision_cache_counts_hits_misses_and_evictions():
+    calls = []
+    cache = DecisionCache(lambda *situation: calls.append(situation) or sum(situation), maxsize=2)
+    for situation in [(1, 2), (1, 2), (3, 4), (5, 6), (1, 2), (5, 6)]:
+        assert cache.lookup(*situation) == sum(situation)
+    # (1, 2) was evicted by (5, 6) and had to be decided again
+    assert calls == [(1, 2), (3, 4), (5, 6), (1, 2)]
+    assert cache.counters() == {"hits": 2, "misses": 4, "evictions": 2}
+    assert len(cache) == 2
+    cache.clear()
+    assert cache.counters() == {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def test_cached_npcs_play_like_uncached_ones(monkeypatch):
+    cached = [outcome(seat_npcs(seed, 4).play()) for seed in range(10)]
+    monkeypatch.setattr(NPCPlayer, "use_decision_cache", False)
+    assert [outcome(seat_npcs(seed, 4).play()) for seed in range(10)] == cached
+
+
+def test_tournament_chunks_count_only_their_own_lookups():
+    DECISION_CACHE.clear()
+    BET_CACHE.clear()
+    seats = seat_bots(["npc", "npc", "npc", "npc"])
+    _, first = play_chunk(seats, False, 5, 0, 20, instrument=True)
+    _, second = play_chunk(seats, False, 5, 20, 20, instrument=True)
+    for name, value in decision_cache_counters().items():
+        assert first.counters[name] + second.counters[name] == value
+    # the second chunk finds the situations the first one cached
+    assert second.counters["decision_cache_hits"] > first.counters["decision_cache_hits"] > 0
@@ -0,0 +1,174 @@
+import pytest
+from bayesian_player import BayesianNPCPlayer
+from bids import encode_bid
+from engine import Engine, PlayerRing
+from ismcts_player import ISMCTSNPCPlayer
+from npc_player import NPCPlayer
+from table import Table
+
+
+def seat_npcs(seed, num_players, bayesian=False):
+    """Return an engine with a seeded table of NPCs, every other one Bayesian if bayesian is set"""
+    table = Table(seed)
+    players = [
+        (BayesianNPCPlayer if bayesian and seat % 2 else NPCPlayer)(f"Bot {seat}", table)
+        for seat in range(num_players)
+    ]
+    return Engine(players, wild_ones=bayesian)
+
+
+def outcome(result):
+    """Return what a GameResult tells about a game as comparable values"""
+    return (
+        result.winner.get_name(),
+        result.rounds,
+        result.bets,
+        result.correct_calls,
+        [player.get_name() for player in result.eliminated],
+    )
+
+
+def move(engine):
+    """Let the current player of a headless game act once"""
+    player = engine.current_player
+    if engine.can_call() and player.make_decision(game_prev_bet=engine.bet, is_wild=engine.wild_ones) == "call":
+        engine.step("call")
+    else:
+        engine.step(player.choose_bet(prev_bet=engine.bet, is_wild=engine.wild_ones))
+
+
+@pytest.mark.parametrize("num_players", [2, 4, 6])
+def test_seeded_games_replay(num_players):
+    for seed in range(20):
+        first = seat_npcs(seed, num_players).play()
+        second = seat_npcs(seed, num_players).play()
+        assert outcome(first) == outcome(second)
+
+
+def test_ring_passes_the_turn_around_removed_seats():
+    ring = PlayerRing("abcdef")
+    ring.remove(1)
+    ring.remove(5)
+    assert ring.size == 4
+    assert ring.players == list("acde")
+    seat, order = 0, []
+    for _ in range(8):
+        seat = ring.next_seat[seat]
+        order.append(ring.seats[seat])
+    assert order == list("cdeacdea")
+    # a removed seat still passes the turn on to the seat that followed it
+    assert ring.next_seat[1] == 2
+    assert ring.previous_seat[0] == 4
+
+
+def test_ring_relinks_the_marked_seats():
+    ring = PlayerRing("abcdef")
+    ring.remove(0)
+    ring.remove(3)
+    ring.relink([True, False, True, True, False, True])
+    assert ring.size == 4
+    assert ring.players == list("acdf")
+    assert [ring.next_seat[seat] for seat in range(6)] == [2, 2, 3, 5, 5, 0]
+    assert [ring.previous_seat[seat] for seat in range(6)] == [5, 0, 0, 2, 3, 3]
+
+
+def following(players, player):
+    """Return the player seated after player among players, in seat order"""
+    return players[(players.index(player) + 1) % len(players)]
+
+
+def test_turns_pass_in_seat_order_and_skip_knocked_out_players():
+    table = Table(2)
+    seats = [NPCPlayer(f"Bot {seat}", table) for seat in range(6)]
+    engine = Engine(seats)
+    engine.set_starting_player()
+    knocked_out = []
+    while not engine.is_over():
+        player = engine.current_player
+        left = engine.players
+        assert player in left and player not in knocked_out
+        if engine.can_call() and player.make_decision(game_prev_bet=engine.bet, is_wild=False) == "call":
+            bidder = engine.previous_player
+            round_result = engine.step("call")
+            assert round_result.caller is player and round_result.bidder is bidder
+            knocked_out += round_result.eliminated
+            assert engine.players == [seat for seat in seats if seat not in knocked_out]
+            if not engine.is_over():
+                # the caller starts the next round, or the player after them once they are out
+                expected = player if player not in knocked_out else following(left, player)
+                assert engine.current_player is expected
+        else:
+            engine.step(player.choose_bet(prev_bet=engine.bet, is_wild=False))
+            assert engine.previous_player is player
+            assert engine.current_player is following(left, player)
+    assert len(knocked_out) == len(seats) - 1
+    assert engine.result.eliminated == knocked_out
+    assert engine.result.winner not in knocked_out
+
+
+def test_only_observing_players_hear_the_bets():
+    table = Table(4)
+    players = [NPCPlayer("Bot", table), BayesianNPCPlayer("Bayes", table), NPCPlayer("Other", table)]
+    engine = Engine(players)
+    assert engine._bid_observers == [players[1]]
+    engine.set_starting_player(players[0])
+    engine.step(encode_bid(2, 3))
+    assert players[1].bids_seen[players[0]][2] == 1
+
+
+def test_restoring_a_snapshot_replays_the_game():
+    for seed in range(30):
+        reference = outcome(seat_npcs(seed, 5, bayesian=True).play())
+        engine = seat_npcs(seed, 5, bayesian=True)
+        engine.set_starting_player()
+        snapshots = []
+        for turn in range(60):
+            if engine.is_over():
+                break
+            if turn % 7 == 0:
+                snapshots.append(engine.snapshot())
+            move(engine)
+        state = snapshots[-1]
+        assert outcome(engine.fork(state).play()) == reference
+        engine.restore(state)
+        assert outcome(engine.play()) == reference
+        engine.restore(snapshots[0])
+        assert outcome(engine.play()) == reference
+
+
+def test_forks_learn_apart_from_the_original():
+    table = Table(3)
+    searcher = ISMCTSNPCPlayer("Search", table, iterations=200)
+    bayes = BayesianNPCPlayer("Bayes", table)
+    engine = Engine([searcher, NPCPlayer("Bot", table), bayes])
+    engine.set_starting_player(searcher)
+    for _ in range(3):
+        move(engine)
+    tree_size = len(searcher.tree)
+    visits = sum(node[0] for node in searcher.tree.values())
+    bids_seen = dict(bayes.bids_seen)
+    fork = engine.fork()
+    while not fork.is_over():
+        move(fork)
+    assert len(searcher.tree) == tree_size
+    assert sum(node[0] for node in searcher.tree.values()) == visits
+    assert bayes.bids_seen == bids_seen
+
+
+@pytest.mark.parametrize("wild_ones", [False, True])
+def test_restoring_a_snapshot_drops_the_search_of_a_searcher(wild_ones):
+    def seat(seed):
+        table = Table(seed)
+        searcher = ISMCTSNPCPlayer("Search", table, iterations=100)
+        engine = Engine([searcher, NPCPlayer("Bot", table), BayesianNPCPlayer("Bayes", table)], wild_ones)
+        engine.set_starting_player(searcher)
+        return engine
+
+    for seed in range(3):
+        reference = outcome(seat(seed).play())
+        engine = seat(seed)
+        state = engine.snapshot()
+        move(engine)
+        assert engine.current_player.get_name() != "Search"
+        engine.restore(state)
+        assert outcome(engine.play()) == reference
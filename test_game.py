@@ -0,0 +1,39 @@
+import pytest
+from bayesian_player import BayesianNPCPlayer
+from game import Game
+from input_provider import ScriptedInput
+from ismcts_player import ISMCTSNPCPlayer
+from main import BOT_NAMES
+from npc_player import NPCPlayer
+from pacing import Pacing
+from strategy_player import MappedStrategyNPCPlayer, StrategyNPCPlayer
+from table import Table
+
+
+def test_scripted_game_collects_its_output():
+    def answer(prompt):
+        if "[b]" in prompt:
+            return "c"
+        if "Value" in prompt:
+            return "6"
+        if "Number" in prompt:
+            return str(game.engine.bet["dice_count"] + 1 if game.engine.bet["dice_value"] == 6 else 1)
+        return "n"
+
+    provider = ScriptedInput(["Alice", "3", "y"], fallback=answer)
+    game = Game(list(BOT_NAMES), seed=5, pacing=Pacing("none"), input_provider=provider)
+    result = game.start_game()
+    output = "".join(provider.output)
+    assert f"{result.winner.get_name()} is the winner!" in output
+    assert " bets that there is " in output
+    assert "Alice's hand is:" in output
+
+
+@pytest.mark.parametrize(
+    "player_class",
+    [NPCPlayer, BayesianNPCPlayer, ISMCTSNPCPlayer, StrategyNPCPlayer, MappedStrategyNPCPlayer],
+)
+def test_bots_write_to_their_input_provider(player_class):
+    provider = ScriptedInput([])
+    player = player_class("Bot", Table(1), provider)
+    assert player.input is provider
@@ -0,0 +1,55 @@
+import pytest
+from bids import encode_bid
+from engine import Engine
+from game_log import END, GameLogWriter, read_games, read_records
+from npc_player import NPCPlayer
+from table import Table
+
+
+def test_game_log_reads_back_large_tables(tmp_path):
+    path = tmp_path / "games.ldgl"
+    results = []
+    with GameLogWriter(path) as log:
+        for seed in range(3):
+            table = Table(seed, game_log=log)
+            engine = Engine([NPCPlayer(f"Bot {seat}", table) for seat in range(60)])
+            results.append(engine.play())
+    games = list(read_games(path))
+    assert [game.number for game in games] == [0, 1, 2]
+    # games split across the chunks read the same
+    assert [vars(game) for game in read_games(path, chunk_records=100)] == [vars(game) for game in games]
+    for game, result in zip(games, results):
+        assert game.players[game.winner] == result.winner.get_name()
+        assert game.rounds == result.rounds
+        assert sum(event[0] == "bid" for event in game.events) == result.bets
+
+
+def test_game_log_keeps_counts_above_a_byte(tmp_path):
+    path = tmp_path / "games.ldgl"
+    table = Table(1)
+    players = [NPCPlayer(f"Bot {seat}", table) for seat in range(60)]
+    with GameLogWriter(path) as log:
+        log.start_game(players, 1, False, players[0])
+        log.bid(players[0], encode_bid(300, 4))
+        log.call(players[1], 290, players[0])
+        log.end_game(players[1], 1)
+    game = next(read_games(path))
+    assert game.events[1:] == [("bid", 0, 300, 4), ("call", 1, 290, 0)]
+
+
+def test_game_log_leaves_out_a_game_that_did_not_end(tmp_path):
+    path = tmp_path / "games.ldgl"
+    with pytest.raises(RuntimeError):
+        with GameLogWriter(path) as log:
+            table = Table(0, game_log=log)
+            Engine([NPCPlayer(f"Bot {seat}", table) for seat in range(4)]).play()
+            table = Table(1)
+            players = [NPCPlayer(f"Bot {seat}", table) for seat in range(4)]
+            log.start_game(players, 1, False, players[0])
+            log.flush()
+            log.bid(players[0], encode_bid(2, 3))
+            raise RuntimeError("the game stopped")
+    # the log ends with the END record of the finished game, so games appended later read back whole
+    records = list(read_records(path))
+    assert len(records) == 1 and records[0]["kind"][-1] == END
+    assert len(list(read_games(path))) == 1
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+from ismcts_player import determinize
+
+
+@pytest.mark.parametrize("is_wild", [False, True])
+def test_determinized_worlds_count_dice_like_the_engine(is_wild):
+    hand = (2, 0, 1, 0, 0, 2)
+    dice = [5, 4, 3]
+    worlds = determinize(np.random.default_rng(7), hand, dice, is_wild, num_worlds=50)
+    for table_matching, expected in worlds:
+        # like Engine.count_dice, in wild ones mode a one counts for every face, so twice for a bid on ones
+        ones = table_matching[1] // 2 if is_wild else table_matching[1]
+        assert table_matching[1] == (2 * ones if is_wild else ones)
+        other_faces = [table_matching[face] - (ones if is_wild else 0) for face in range(2, 7)]
+        assert ones + sum(other_faces) == sum(dice)
+        own_ones = 2 * hand[0] if is_wild else hand[0]
+        assert expected[0][1] == pytest.approx(own_ones + 7 * (1 / 3 if is_wild else 1 / 6))
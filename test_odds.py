@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import pytest
+import odds
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize("is_wild", [False, True])
+def test_exact_survival_tables_match_scipy(is_wild):
+    try:
+        for hidden_dice in (0, 1, 7, 30):
+            odds.set_backend("exact")
+            exact = odds.survival_table(hidden_dice, is_wild)
+            odds.set_backend("scipy")
+            assert exact == pytest.approx(odds.survival_table(hidden_dice, is_wild), abs=1e-12)
+    finally:
+        odds.set_backend("exact")
+
+
+def test_npc_player_imports_without_numpy_or_scipy():
+    code = (
+        "import sys, npc_player, main\n"
+        "loaded = [name for name in ('numpy', 'scipy') if name in sys.modules]\n"
+        "assert not loaded, loaded"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=REPO, check=True)
@@ -0,0 +1,38 @@
+import itertools
+import numpy as np
+import pytest
+from bids import NO_BID, bid_count, bid_value, encode_bid, is_raise
+from odds_array import best_raise, bid_odds
+
+
+@pytest.mark.parametrize("own", [(2, 0, 0, 1, 0, 0), (0, 1, 0, 0, 0, 1), (1, 0, 0, 0, 0, 0)])
+@pytest.mark.parametrize("is_wild", [False, True])
+def test_bid_odds_match_enumeration(own, is_wild):
+    for hidden_dice in range(5):
+        total_dice = sum(own) + hidden_dice
+        expected = np.zeros((6, total_dice + 1))
+        for roll in itertools.product(range(1, 7), repeat=hidden_dice):
+            counts = list(own)
+            for face in roll:
+                counts[face - 1] += 1
+            for face in range(1, 7):
+                # counted like Engine.count_dice, in wild ones mode a one counts twice for a bid on ones
+                matching = counts[face - 1] + (counts[0] if is_wild else 0)
+                expected[face - 1, : matching + 1] += 1
+        expected /= 6**hidden_dice
+        assert np.allclose(bid_odds(own, total_dice, is_wild), expected)
+
+
+def test_best_raise_is_legal_and_most_likely():
+    odds = bid_odds((2, 0, 0, 1, 0, 0), 10, True)
+    for prev_bid in (NO_BID, encode_bid(3, 4), encode_bid(9, 6)):
+        bid = best_raise(odds, prev_bid)
+        assert is_raise(bid, prev_bid, 10)
+        legal = [
+            odds[face - 1, count]
+            for face in range(1, 7)
+            for count in range(1, 11)
+            if is_raise(encode_bid(count, face), prev_bid, 10)
+        ]
+        assert odds[bid_value(bid) - 1, bid_count(bid)] == max(legal)
+    assert best_raise(odds, encode_bid(10, 6)) is None
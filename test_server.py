@@ -0,0 +1,52 @@
+import asyncio
+import random
+import pytest
+from benchmarks.load_test import fake_player
+from main import BOT_NAMES
+from server import GameServer
+
+
+async def serve(coroutine_of_port, **options):
+    """Start a GameServer on a free port, await coroutine_of_port(port) against it and return its result"""
+    server = GameServer(port=0, **options)
+    listening = await server.start()
+    try:
+        return server, await coroutine_of_port(listening.sockets[0].getsockname()[1])
+    finally:
+        listening.close()
+        await listening.wait_closed()
+
+
+async def send_join(port, line):
+    """Send a JOIN line and return everything the server sends until it closes the connection"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(line.encode() + b"\n")
+    received = await reader.read()
+    writer.close()
+    return received.decode()
+
+
+def test_server_plays_games_to_the_end():
+    async def play(port):
+        latencies = []
+        return await asyncio.gather(
+            *(fake_player("127.0.0.1", port, f"Player {n}", random.Random(n), latencies) for n in range(5))
+        )
+
+    server, finished = asyncio.run(serve(play, seed=3, wild_ones=True))
+    assert finished == [True] * 5
+    assert server.tables_started == server.tables_finished == 5
+
+
+@pytest.mark.parametrize("line", ["JOIN", "JOIN  ", "JOIN Ann,Bob", f"JOIN {BOT_NAMES[0]}", "HELLO Ann"])
+def test_server_refuses_names_the_game_can_not_seat(line):
+    server, received = asyncio.run(serve(lambda port: send_join(port, line)))
+    assert received.startswith("ERROR ") and received.count("\n") == 1
+    assert server.tables_started == 0
+
+
+def test_server_closes_the_table_of_a_player_who_does_not_answer():
+    server, received = asyncio.run(serve(lambda port: send_join(port, "JOIN Ann"), turn_timeout=0.05))
+    assert received.endswith("TIMEOUT\n")
+    assert "Enter your name: Ann\n" in received
+    assert server.tables_started == 1 and server.tables_finished == 0
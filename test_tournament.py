@@ -0,0 +1,34 @@
+from engine import Engine
+from npc_player import NPCPlayer
+from table import Table
+from tournament import TournamentStats, run_tournament, seat_bots
+
+SEATS = seat_bots(["npc", "npc", "npc"])
+
+
+def tournament_stats(**options):
+    """Return the TournamentStats of a seeded tournament of 30 games"""
+    stats = TournamentStats([name for name, _ in SEATS])
+    for record in run_tournament(SEATS, 30, seed=11, **options):
+        stats.add(record)
+    return stats
+
+
+def test_pool_aggregates_the_same_stats_as_one_process():
+    in_process = tournament_stats(workers=0, chunk_size=30)
+    pooled = tournament_stats(workers=2, chunk_size=7)
+    assert vars(pooled) == vars(in_process)
+    assert in_process.games == sum(in_process.wins.values()) == 30
+    assert in_process.correct_calls + in_process.wrong_calls == in_process.rounds
+
+
+def test_tournament_games_replay_from_their_seed():
+    records = list(run_tournament(SEATS, 5, workers=0, seed=11))
+    table = Table("11-3")
+    result = Engine([NPCPlayer(name, table) for name, _ in SEATS]).play()
+    assert (records[3].winner, records[3].rounds, records[3].bets, records[3].correct_calls) == (
+        result.winner.get_name(),
+        result.rounds,
+        result.bets,
+        result.correct_calls,
+    )
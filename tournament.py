@@ -0,0 +1,274 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from bayesian_player import BayesianNPCPlayer
+from engine import Engine
+from game_log import GameLogWriter
+from instrumentation import Instrumentation, run_profiled
+from ismcts_player import ISMCTSNPCPlayer
+from main import BOT_NAMES
+from npc_player import NPCPlayer, decision_cache_counters
+from strategy_player import MappedStrategyNPCPlayer, StrategyNPCPlayer
+from table import Table
+
+# the kinds of bots that can take a seat in a tournament
+BOT_TYPES = {
+    "npc": NPCPlayer,
+    "bayes": BayesianNPCPlayer,
+    "cfr": StrategyNPCPlayer,
+    "cfr-mmap": MappedStrategyNPCPlayer,
+    "ismcts": ISMCTSNPCPlayer,
+}
+
+
+class GameRecord:
+    """
+    A class to hold the outcome of one tournament game, small enough to be sent back from the worker processes
+
+    Attributes
+    ----------
+    winner
+        The name of the winning bot
+    rounds
+        The number of rounds played
+    bets
+        The number of bets made
+    correct_calls
+        The number of calls that caught a bluff, the bidder lost a die
+    wrong_calls
+        The number of calls that were wrong, the caller lost a die
+    """
+
+    def __init__(self, winner, rounds, bets, correct_calls):
+        self.winner = winner
+        self.rounds = rounds
+        self.bets = bets
+        self.correct_calls = correct_calls
+        self.wrong_calls = rounds - correct_calls
+
+
+class TournamentStats:
+    """
+    A class to aggregate the GameRecords of a tournament as they arrive
+
+    Attributes
+    ----------
+    games
+        The number of games recorded
+    wins
+        Dict of the number of games won by each bot
+    rounds
+        The total number of rounds over all games
+    bets
+        The total number of bets over all games
+    correct_calls
+        The total number of dice lost by bidders whose bluff was called
+    wrong_calls
+        The total number of dice lost by callers who were wrong
+
+    Methods
+    ---------
+    add
+        Add the record of a finished game
+    report
+        Return a printable summary of the tournament
+    """
+
+    def __init__(self, bot_names):
+        self.games = 0
+        self.wins = {name: 0 for name in bot_names}
+        self.rounds = 0
+        self.bets = 0
+        self.correct_calls = 0
+        self.wrong_calls = 0
+
+    def add(self, record):
+        """Add the record of a finished game to the totals"""
+        self.games += 1
+        self.wins[record.winner] += 1
+        self.rounds += record.rounds
+        self.bets += record.bets
+        self.correct_calls += record.correct_calls
+        self.wrong_calls += record.wrong_calls
+
+    def report(self):
+        """Return the win rate of each bot, the mean game length and the dice lost per call type"""
+        games = max(self.games, 1)
+        lines = [f"Games played: {self.games}"]
+        for name, wins in sorted(self.wins.items(), key=lambda item: -item[1]):
+            lines.append(f"  {name:<24}{wins / games:7.2%} ({wins} wins)")
+        lines.append(f"Mean game length: {self.rounds / games:.2f} rounds, {self.bets / games:.2f} bets")
+        lines.append(
+            f"Dice lost per game: {self.correct_calls / games:.2f} by called bluffs, "
+            f"{self.wrong_calls / games:.2f} by wrong calls"
+        )
+        return "\n".join(lines)
+
+
+def seat_bots(bot_types):
+    """Return the (name, bot type) of every seat, naming the bots after the NPCs of the interactive game"""
+    if not 2 <= len(bot_types) <= len(BOT_NAMES):
+        raise ValueError(f"A tournament table seats between 2 and {len(BOT_NAMES)} bots")
+    for bot_type in bot_types:
+        if bot_type not in BOT_TYPES:
+            raise ValueError(f"Unknown bot type {bot_type!r}, choose from {sorted(BOT_TYPES)}")
+    return [(f"{name} ({bot_type})", bot_type) for name, bot_type in zip(BOT_NAMES, bot_types)]
+
+
+def play_chunk(seats, wild_ones, seed, first_game, num_games, instrument=False, log_path=None):
+    """Play a chunk of headless games and return their GameRecords, with an Instrumentation if instrument is set
+
+    With a log_path every game is appended to that game log, the writer only writes whole games so the
+    workers can share one file
+    """
+    records = []
+    instrumentation = Instrumentation() if instrument else None
+    cache_counters = decision_cache_counters()
+    game_log = GameLogWriter(log_path) if log_path is not None else None
+    try:
+        for game_index in range(first_game, first_game + num_games):
+            # every game gets its own seeded table, so any game can be replayed on its own
+            table = Table(f"{seed}-{game_index}", instrumentation=instrumentation, game_log=game_log)
+            players = [BOT_TYPES[bot_type](name, table) for name, bot_type in seats]
+            result = Engine(players, wild_ones).play()
+            records.append(
+                GameRecord(result.winner.get_name(), result.rounds, result.bets, result.correct_calls)
+            )
+    finally:
+        if game_log is not None:
+            game_log.close()
+    if instrumentation is not None:
+        # the NPC caches live as long as the worker process, count only what this chunk added
+        for name, value in decision_cache_counters().items():
+            instrumentation.count(name, value - cache_counters[name])
+    return records, instrumentation
+
+
+def run_tournament(
+    seats,
+    num_games,
+    wild_ones=False,
+    workers=None,
+    chunk_size=100,
+    seed=None,
+    instrumentation=None,
+    log_path=None,
+):
+    """Play num_games across a process pool, yielding the GameRecords chunk by chunk as they finish
+
+    With workers=0 the games are played in this process, which is what a profiler needs to see them.
+    The timings and counters of every chunk are merged into instrumentation when one is given.
+    Every game is appended to the game log at log_path when one is given.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+    if workers is None:
+        workers = os.cpu_count()
+    instrument = instrumentation is not None
+    chunks = [
+        (first_game, min(chunk_size, num_games - first_game))
+        for first_game in range(0, num_games, chunk_size)
+    ]
+    if workers == 0:
+        for first_game, games in chunks:
+            records, chunk_instrumentation = play_chunk(
+                seats, wild_ones, seed, first_game, games, instrument, log_path
+            )
+            if instrument:
+                instrumentation.merge(chunk_instrumentation)
+            yield from records
+        return
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # keep only a couple of chunks per worker in flight instead of submitting everything at once
+        while chunks or pending:
+            while chunks and len(pending) < 2 * workers:
+                first_game, games = chunks.pop(0)
+                pending.add(
+                    executor.submit(
+                        play_chunk,
+                        seats,
+                        wild_ones,
+                        seed,
+                        first_game,
+                        games,
+                        instrument,
+                        log_path,
+                    )
+                )
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                records, chunk_instrumentation = future.result()
+                if instrument:
+                    instrumentation.merge(chunk_instrumentation)
+                yield from records
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play a tournament of NPC-only Liar's dice games")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument(
+        "--bots",
+        default="npc,npc,npc,npc",
+        help=f"comma separated bot type of every seat, types: {', '.join(sorted(BOT_TYPES))}",
+    )
+    parser.add_argument("--wild", action="store_true", help="play with wild ones")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes, defaults to the CPU count, 0 plays in this process",
+    )
+    parser.add_argument("--chunk-size", type=int, default=100, help="games per submitted chunk")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the tournament")
+    parser.add_argument(
+        "--instrument", action="store_true", help="print the time spent per phase of the games"
+    )
+    parser.add_argument("--log", default=None, help="append every game to this binary game log")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="play in this process under cProfile and print the sorted stats",
+    )
+    return parser.parse_args(argv)
+
+
+def play_tournament(args, seats, stats, instrumentation):
+    """Play the tournament described by the command line arguments, adding every game to stats"""
+    for record in run_tournament(
+        seats,
+        args.games,
+        args.wild,
+        args.workers,
+        args.chunk_size,
+        args.seed,
+        instrumentation,
+        args.log,
+    ):
+        stats.add(record)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    seats = seat_bots(args.bots.split(","))
+    stats = TournamentStats([name for name, _ in seats])
+    instrumentation = Instrumentation() if args.instrument else None
+    start = time.perf_counter()
+    if args.profile:
+        # the profiler only sees this process, so the games are not sent to a pool
+        args.workers = 0
+        run_profiled(play_tournament, args, seats, stats, instrumentation)
+    else:
+        play_tournament(args, seats, stats, instrumentation)
+    elapsed = time.perf_counter() - start
+    print(stats.report())
+    print(f"Played in {elapsed:.2f}s ({stats.games / elapsed:,.0f} games/sec)")
+    if instrumentation is not None:
+        print(instrumentation.report())
+    return stats
+
+
+if __name__ == "__main__":
+    main()
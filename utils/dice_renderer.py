@@ -0,0 +1,29 @@
+from utils.dice_graphics import DICE_FACES, DICE_HEIGHT
+
+# rendered frames per face counts of a hand, there are only a few hundred different hands of up to 5 dice
+_FRAMES = {}
+
+
+def render_hand(hand):
+    """Return the rows of dice graphics of a hand as one string, rendered once per distinct hand"""
+    frame = _FRAMES.get(hand.counts)
+    if frame is None:
+        dice_faces = [DICE_FACES[face] for face in hand.faces()]
+        rows = [
+            " " + " ".join(die[row_idx] for die in dice_faces) for row_idx in range(DICE_HEIGHT)
+        ]
+        frame = "\n".join(rows) + "\n"
+        _FRAMES[hand.counts] = frame
+    return frame
+
+
+def render_reveal(players):
+    """Return the hands of all players, as printed when a bet is called, as one string"""
+    parts = []
+    for player in players:
+        parts.append(f"{player.get_name()}'s hand is:\n")
+        if len(player.hand) < 1:
+            parts.append(f"Player {player.get_name()} has no die left\n")
+        else:
+            parts.append(render_hand(player.hand))
+    return "".join(parts)
@@ -0,0 +1,153 @@
+import numpy as np
+from batch import DICE_PER_PLAYER, TableBatch
+
+# action 0 calls the last bid, action a > 0 bids like bids.encode_bid orders them - face first, then count
+CALL = 0
+
+
+def encode_action(dice_count, dice_value, max_dice):
+    """Return the action of a bid at a table of at most max_dice dice, works on arrays as well"""
+    return (dice_value - 1) * max_dice + dice_count
+
+
+def decode_action(action, max_dice):
+    """Return the (dice count, dice value) of a bid action, works on arrays as well"""
+    return (action - 1) % max_dice + 1, (action - 1) // max_dice + 1
+
+
+class VectorEnv(TableBatch):
+    """
+    A class to play many tables of Liar's dice at once as a reinforcement learning environment
+    The API follows gymnasium's vector environments - reset() and step(actions) over all tables at once, with
+    one integer action per table for the player whose turn it is. Tables that finish a game are dealt a new one
+    in the same step, so every table always waits for an action. Nothing is printed and all work is array ops.
+
+    Attributes
+    ----------
+    num_actions
+        The number of actions - a call and every bid of a table with all dice in play
+    The other attributes for the class are inherited from the TableBatch class
+
+    Methods
+    ---------
+    override reset
+        Deal new games at every table and return the observations and an empty info dict
+    override step
+        Apply one action at every table and return observations, rewards, terminated, truncated and info
+    action_mask
+        Return the bool array of the legal actions at every table
+    sample_actions
+        Return a uniformly random legal action for every table
+    observe
+        Return the observations of the player to act at every table
+    """
+
+    def __init__(self, num_tables, num_players, wild_ones=False, rng=None):
+        # set up before TableBatch.__init__, which deals the first games through reset
+        max_dice = num_players * DICE_PER_PLAYER
+        self.num_actions = 6 * max_dice + 1
+        self._actions = np.arange(self.num_actions)
+        self._action_counts, self._action_values = decode_action(self._actions, max_dice)
+        self._action_counts[CALL] = 0
+        self._action_values[CALL] = 0
+        # the legal actions per (last bid action, dice on the table), so a mask is one lookup per table
+        self._masks = (self._actions[None, None, :] > self._actions[:, None, None]) & (
+            self._action_counts <= np.arange(max_dice + 1)[None, :, None]
+        )
+        self._masks[1:, :, CALL] = True
+        self._all_tables = np.arange(num_tables)
+        self._seats = np.arange(num_players)
+        super().__init__(num_tables, num_players, wild_ones, rng)
+
+    def reset(self, seed=None):
+        """Deal new games at every table, reseeding the generator if a seed is given, and return (observations, info)"""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        super().reset()
+        return self.observe(), {}
+
+    def action_mask(self):
+        """Return a bool array (tables x actions) of the legal actions - raises of the bid that fit the dice on
+        the table, and a call once a bid was made"""
+        return self._masks[self._bid_actions(), self.dice_counts.sum(axis=1)]
+
+    def sample_actions(self, rng=None):
+        """Return a uniformly random legal action for every table, counting the legal actions instead of masking"""
+        rng = rng if rng is not None else self.rng
+        total_dice = self.dice_counts.sum(axis=1)
+        has_bid = self.bet_count > 0
+        # raises of the count on the same face, then any count of the higher faces
+        same_face = np.where(has_bid, total_dice - self.bet_count, 0)
+        num_legal = has_bid + same_face + (6 - self.bet_value) * total_dice
+        picks = (rng.random(self.num_tables) * num_legal).astype(np.int64) - has_bid
+        higher = np.maximum(picks - same_face, 0)
+        dice_count = np.where(picks < same_face, self.bet_count + 1 + picks, higher % total_dice + 1)
+        dice_value = np.where(picks < same_face, self.bet_value, self.bet_value + 1 + higher // total_dice)
+        actions = encode_action(dice_count, dice_value, self._max_dice)
+        return np.where(picks < 0, CALL, actions)
+
+    def _bid_actions(self):
+        """Return the action of the last bid at every table, CALL where no bid was made this round"""
+        return np.where(
+            self.bet_count > 0, encode_action(self.bet_count, self.bet_value, self._max_dice), CALL
+        )
+
+    def _is_legal(self, actions):
+        """Return a bool array marking the legal actions, checked per table without building the mask"""
+        in_range = (actions >= 0) & (actions < self.num_actions)
+        actions = np.where(in_range, actions, CALL)
+        raises = (actions > self._bid_actions()) & (
+            self._action_counts[actions] <= self.dice_counts.sum(axis=1)
+        )
+        return in_range & np.where(actions == CALL, self.bet_count > 0, raises)
+
+    def observe(self):
+        """Return a dict of the arrays seen by the player to act at every table
+
+        hand - the player's count of each face 1-6, bid - the count and face of the last bid (0, 0 at the start
+        of a round), dice - the dice of every player starting with the one to act in turn order, seat - the seat
+        of the player to act, action_mask - the legal actions
+        """
+        seats = self.current
+        turn_order = (seats[:, None] + self._seats) % self.num_players
+        return {
+            "hand": self.face_counts[self._all_tables, seats, 1:],
+            "bid": np.stack((self.bet_count, self.bet_value), axis=1),
+            "dice": self.dice_counts[self._all_tables[:, None], turn_order],
+            "seat": seats.copy(),
+            "action_mask": self.action_mask(),
+        }
+
+    def step(self, actions):
+        """Apply the action of the player to act at every table
+
+        Return the observations, the rewards (tables x seats: -1 for losing a die, +1 for winning the game),
+        terminated (the tables whose game just ended and was dealt again), truncated (always False) and an info
+        dict holding the winning seat of every terminated table, -1 elsewhere
+        """
+        actions = np.asarray(actions)
+        legal = self._is_legal(actions)
+        if not legal.all():
+            illegal = np.nonzero(~legal)[0]
+            raise ValueError(
+                f"Illegal actions {actions[illegal[:10]].tolist()} at tables {illegal[:10].tolist()}"
+            )
+        rewards = np.zeros((self.num_tables, self.num_players), dtype=np.float32)
+        calls = actions == CALL
+        call_tables = np.nonzero(calls)[0]
+        losers = self._resolve_calls(call_tables)
+        rewards[call_tables, losers] -= 1
+        raise_tables = np.nonzero(~calls)[0]
+        seats = self.current[raise_tables]
+        self.bet_count[raise_tables] = self._action_counts[actions[raise_tables]]
+        self.bet_value[raise_tables] = self._action_values[actions[raise_tables]]
+        self.bets[raise_tables] += 1
+        self.previous[raise_tables] = seats
+        self.current[raise_tables] = self._next_seats(raise_tables, seats)
+        terminated = self.done.copy()
+        finished = np.nonzero(terminated)[0]
+        rewards[finished, self.winners[finished]] += 1
+        info = {"winners": self.winners.copy()}
+        self._deal(finished)
+        truncated = np.zeros(self.num_tables, dtype=bool)
+        return self.observe(), rewards, terminated, truncated, info